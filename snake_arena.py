@@ -0,0 +1,317 @@
+"""Модуль содержит арену для игры "Змейка" со множеством змеек.
+
+На одном поле находятся сотни и тысячи змеек и много еды. Все змейки
+делят одну сетку владельцев: в ячейке сетки хранится номер змейки,
+занимающей ячейку, увеличенный на 1 (0 - ячейка свободна). Поэтому
+столкновения за тик разрешаются за O(количество змеек), без перебора
+сегментов других змеек. Еда появляется в случайных свободных ячейках
+через общий индекс свободных ячеек FreeCells.
+
+Правила тика:
+    - все змейки поворачивают и одновременно сдвигают голову;
+    - голова, вошедшая в занятую ячейку (в том числе в хвост, который
+        освободится на этом тике), погибает - как и в одиночной игре;
+    - головы, вошедшие в одну ячейку, погибают вместе;
+    - змейка, съевшая еду, вырастает на один сегмент, а еда появляется
+        в другой свободной ячейке;
+    - тела погибших змеек убираются с поля, а сами змейки, если это
+        включено, появляются заново длиной в один сегмент.
+"""
+from array import array
+from collections import deque
+from random import getrandbits
+from typing import Iterable, Iterator, Mapping, Optional, Union
+
+from snake_engine import (
+    APPLE_EATEN, DENSE_CELLS_LIMIT, DOWN, GRID_HEIGHT, GRID_WIDTH, LEFT,
+    RIGHT, SEED_BITS, SELF_COLLISION, TURNS, UP, FreeCells, GameRandom
+)
+
+# События арены в дополнение к событиям snake_engine.
+SNAKE_COLLISION = 'snake_collision'
+HEAD_COLLISION = 'head_collision'
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+DEFAULT_SNAKES = 100
+DEFAULT_FOOD = 50
+# Коды содержимого ячейки в журнале изменений и в Arena.contents: пустая
+# ячейка, еда и змейка с номером N (код N + SNAKE_CODE_OFFSET).
+EMPTY = 0
+FOOD = 1
+SNAKE_CODE_OFFSET = 2
+
+Actions = Union[
+    Mapping[int, Optional[tuple[int, int]]],
+    Iterable[Optional[tuple[int, int]]]
+]
+
+
+class SparseOwners(dict):
+    """Сетка владельцев большого поля: хранит только занятые ячейки."""
+
+    def __missing__(self, cell: int) -> int:
+        """Возвращает 0 для свободной ячейки."""
+        return 0
+
+
+class ArenaSnake:
+    """Класс змейки на арене.
+
+    Атрибуты:
+        snake_id: Номер змейки - индекс в списке змеек арены.
+        body: Ячейки тела от головы к хвосту.
+        direction: Направление движения.
+        length: Длина, до которой змейка растёт.
+        max_length: Максимальная длина змейки за игру.
+        alive: Признак живой змейки.
+    """
+
+    __slots__ = (
+        'snake_id', 'body', 'direction', 'length', 'max_length', 'alive'
+    )
+
+    def __init__(
+        self,
+        snake_id: int,
+        position: int,
+        direction: tuple[int, int]
+    ) -> None:
+        self.snake_id = snake_id
+        self.body = deque((position,))
+        self.direction = direction
+        self.length = 1
+        self.max_length = 1
+        self.alive = True
+
+    def get_head_position(self) -> int:
+        """Возвращает ячейку головы змейки."""
+        return self.body[0]
+
+
+class Arena:
+    """Класс арены со множеством змеек и еды.
+
+    Атрибуты:
+        seed: Сид генератора случайных чисел арены.
+        rng: Генератор случайных чисел арены.
+        free_cells: Индекс свободных ячеек поля: его занимают тела змеек
+            и еда.
+        owners: Сетка владельцев ячеек. Для большого поля - словарь
+            только с занятыми ячейками.
+        food: Множество ячеек с едой.
+        snakes: Список змеек, номер змейки - её индекс.
+        respawn: Признак появления погибших змеек заново.
+        ticks: Количество прошедших тиков.
+        changes: Журнал изменений поля - словарь с кодами нового
+            содержимого изменившихся ячеек или None, если журнал не
+            ведётся. Очищается владельцем арены.
+    """
+
+    def __init__(
+        self,
+        snakes: int = DEFAULT_SNAKES,
+        food: int = DEFAULT_FOOD,
+        seed: Optional[int] = None,
+        width: int = GRID_WIDTH,
+        height: int = GRID_HEIGHT,
+        respawn: bool = True,
+        track_changes: bool = False
+    ) -> None:
+        self.seed = seed if seed is not None else getrandbits(SEED_BITS)
+        self.rng = GameRandom(self.seed)
+        self.free_cells = FreeCells.for_board(width, height)
+        self.owners = (
+            array('i', bytes(4 * self.free_cells.area))
+            if self.free_cells.area <= DENSE_CELLS_LIMIT else SparseOwners()
+        )
+        self.food = self.free_cells.cell_set()
+        self.snakes = []
+        self.respawn = respawn
+        self.ticks = 0
+        self.changes = {} if track_changes else None
+        for _ in range(snakes):
+            self.add_snake()
+        for _ in range(food):
+            self.add_food()
+
+    def set_owner(self, cell: int, owner: int) -> None:
+        """Записывает владельца ячейки и обновляет индекс свободных ячеек.
+
+        Параметры:
+            cell: Ячейка поля.
+            owner: Номер змейки, увеличенный на 1, или 0 для освобождения
+                ячейки.
+        """
+        if self.changes is not None:
+            self.changes[cell] = (
+                owner - 1 + SNAKE_CODE_OFFSET if owner else EMPTY
+            )
+        if owner:
+            self.owners[cell] = owner
+            self.free_cells.occupy(cell)
+            return
+        if isinstance(self.owners, SparseOwners):
+            del self.owners[cell]
+        else:
+            self.owners[cell] = 0
+        self.free_cells.release(cell)
+
+    def add_snake(self) -> Optional[ArenaSnake]:
+        """Добавляет змейку длиной в один сегмент в случайную ячейку.
+
+        Возвращает змейку или None, если на поле нет свободных ячеек.
+        """
+        return self.place_snake(ArenaSnake(len(self.snakes), 0, UP))
+
+    def place_snake(self, snake: ArenaSnake) -> Optional[ArenaSnake]:
+        """Размещает змейку длиной в один сегмент в случайной ячейке.
+
+        Параметры:
+            snake: Новая или погибшая змейка.
+
+        Возвращает змейку или None, если на поле нет свободных ячеек.
+        """
+        position = self.free_cells.choice(self.rng)
+        if position is None:
+            return None
+        snake.body = deque((position,))
+        snake.direction = self.rng.choice(DIRECTIONS)
+        snake.length = 1
+        snake.alive = True
+        if snake.snake_id == len(self.snakes):
+            self.snakes.append(snake)
+        self.set_owner(position, snake.snake_id + 1)
+        return snake
+
+    def add_food(self) -> Optional[int]:
+        """Кладёт еду в случайную свободную ячейку.
+
+        Возвращает ячейку еды или None, если на поле нет свободных ячеек.
+        """
+        position = self.free_cells.choice(self.rng)
+        if position is not None:
+            self.food.add(position)
+            self.free_cells.occupy(position)
+            if self.changes is not None:
+                self.changes[position] = FOOD
+        return position
+
+    def contents(self) -> dict[int, int]:
+        """Возвращает коды содержимого всех непустых ячеек поля."""
+        cells = dict.fromkeys(self.food, FOOD)
+        for snake in self.alive_snakes():
+            cells.update(dict.fromkeys(
+                snake.body, snake.snake_id + SNAKE_CODE_OFFSET
+            ))
+        return cells
+
+    def alive_snakes(self) -> Iterator[ArenaSnake]:
+        """Возвращает живых змеек."""
+        return (snake for snake in self.snakes if snake.alive)
+
+    def step(self, actions: Optional[Actions] = None) -> list[tuple]:
+        """Продвигает арену на один тик.
+
+        Параметры:
+            actions: Новые направления змеек: словарь с номерами змеек в
+                качестве ключей или последовательность по номерам. Если
+                направление не является допустимым поворотом, то змейка
+                продолжает движение в текущем направлении.
+
+        Возвращает список произошедших за тик событий: пары (событие,
+        номер змейки).
+        """
+        if actions is not None and not isinstance(actions, Mapping):
+            actions = dict(enumerate(actions))
+        neighbor = self.free_cells.neighbor
+        moves = []
+        claims = {}
+        for snake in self.alive_snakes():
+            action = actions.get(snake.snake_id) if actions else None
+            if action in TURNS[snake.direction]:
+                snake.direction = action
+            head = neighbor(snake.body[0], snake.direction)
+            moves.append((snake, head))
+            claims[head] = claims.get(head, 0) + 1
+        events = []
+        survivors, dead = self.check_heads(moves, claims, events)
+        for snake, head in survivors:
+            self.move_snake(snake, head, events)
+        for snake in dead:
+            self.remove_snake(snake)
+        if self.respawn:
+            for snake in dead:
+                self.place_snake(snake)
+        self.ticks += 1
+        return events
+
+    def check_heads(
+        self,
+        moves: list[tuple[ArenaSnake, int]],
+        claims: dict[int, int],
+        events: list
+    ) -> tuple[list[tuple[ArenaSnake, int]], list[ArenaSnake]]:
+        """Разделяет змеек на выживших и погибших за тик.
+
+        Все головы проверяются по сетке владельцев до тика, и только затем
+        змейки сдвигаются: иначе исход входа в освобождаемый хвост зависел
+        бы от порядка змеек.
+
+        Параметры:
+            moves: Пары (змейка, новая ячейка головы).
+            claims: Количество голов, входящих в каждую ячейку.
+            events: Список событий тика.
+
+        Возвращает пары (змейка, новая ячейка головы) выживших змеек и
+        список погибших змеек.
+        """
+        owners = self.owners
+        survivors = []
+        dead = []
+        for snake, head in moves:
+            owner = owners[head]
+            if claims[head] > 1:
+                events.append((HEAD_COLLISION, snake.snake_id))
+            elif owner:
+                events.append((
+                    SELF_COLLISION if owner == snake.snake_id + 1
+                    else SNAKE_COLLISION,
+                    snake.snake_id
+                ))
+            else:
+                survivors.append((snake, head))
+                continue
+            dead.append(snake)
+        return survivors, dead
+
+    def move_snake(self, snake: ArenaSnake, head: int, events: list) -> None:
+        """Сдвигает голову змейки в свободную ячейку.
+
+        Параметры:
+            snake: Змейка.
+            head: Новая ячейка головы.
+            events: Список событий тика.
+        """
+        if head in self.food:
+            self.food.discard(head)
+            self.free_cells.release(head)
+            snake.length += 1
+            snake.max_length = max(snake.max_length, snake.length)
+            events.append((APPLE_EATEN, snake.snake_id))
+            self.set_owner(head, snake.snake_id + 1)
+            self.add_food()
+        else:
+            self.set_owner(head, snake.snake_id + 1)
+        snake.body.appendleft(head)
+        if len(snake.body) > snake.length:
+            self.set_owner(snake.body.pop(), 0)
+
+    def remove_snake(self, snake: ArenaSnake) -> None:
+        """Убирает тело погибшей змейки с поля.
+
+        Параметры:
+            snake: Погибшая змейка.
+        """
+        for position in snake.body:
+            self.set_owner(position, 0)
+        snake.body.clear()
+        snake.alive = False
@@ -0,0 +1,922 @@
+"""Модуль содержит автопилот для игры "Змейка".
+
+Автопилот - политика (см. модуль `snake_tournament`), которая ведёт змейку
+к яблоку в обход тела и неправильного продукта. Пути ищутся алгоритмом A*
+и кэшируются: на следующих тиках путь только проверяется. Путь,
+перекрытый препятствием, чинится на месте: короткий обход от головы
+возвращается на кэшированный путь за препятствием.
+
+Каждый поиск за решение раскрывает не больше заданного константой
+количества ячеек, а сведения о теле змейки обновляются за O(1) на тик,
+поэтому время решения не зависит ни от размера поля, ни от длины змейки.
+Если яблоко дальше, чем успевает дойти поиск, змейка идёт по части пути
+до ближайшей к яблоку раскрытой ячейки и продолжает поиск оттуда на
+следующих тиках.
+
+На небольших полях змейка держится гамильтонова цикла: тело лежит на
+цикле по порядку от хвоста к голове, а путь к яблоку срезает цикл, только
+проходя по свободному участку цикла перед головой. Такие срезки не могут
+привести к столкновению, а когда змейка становится длинной и яблоко
+оказывается за пределами свободного участка, она просто идёт по циклу.
+
+На больших полях и если тело сошло с цикла, путь к яблоку ищется с учётом
+того, что сегменты тела освобождают ячейки по мере движения змейки, и
+принимается, только если после съедения яблока голова может догнать
+хвост. Иначе змейка следует за своим хвостом.
+"""
+from collections import OrderedDict, deque
+from heapq import heappop, heappush
+from typing import Iterator, Optional
+
+from snake_engine import DOWN, LEFT, RIGHT, TURNS, UP, FreeCells, GameState
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+# Наибольшее количество ячеек, которое раскрывает один поиск пути.
+MAX_SEARCH_NODES = 50_000
+# Количество ячеек, которое раскрывает поиск пути к яблоку за одно
+# решение. Если яблоко не найдено, змейка идёт к ближайшей к нему ячейке.
+PLAN_SEARCH_NODES = 128
+# Количество ячеек, которое раскрывает проверка того, что голова может
+# догнать хвост. Если столько ячеек раскрыто, а тело не найдено, то места
+# для змейки достаточно и хвост считается достижимым.
+TAIL_SEARCH_NODES = 256
+# Количество ячеек кэшированного пути за препятствием, на которые может
+# вернуться обход, и количество ячеек, которое раскрывает поиск обхода.
+REPAIR_LOOKAHEAD = 16
+REPAIR_SEARCH_NODES = 64
+# Наибольшее количество ячеек, которое считает заливка при выборе хода
+# без пути.
+FLOOD_LIMIT = 256
+# Наибольшая площадь поля, на котором змейка держится гамильтонова цикла.
+# На больших полях змейка редко вырастает настолько, чтобы тупики стали
+# опасны, а пути вперёд по циклу заметно длиннее кратчайших.
+CYCLE_AREA_LIMIT = 1 << 12
+# Расстояние по циклу, на котором змейка заранее ищет обход неправильного
+# продукта.
+WRONG_PRODUCT_LOOKAHEAD = 256
+# Количество тиков до повторного поиска пути к яблоку, если путь не
+# нашёлся: пока змейка следует за хвостом, поле меняется медленно.
+REPLAN_INTERVAL = 8
+# Количество свободных ячеек цикла, которое срезка оставляет перед хвостом.
+SHORTCUT_MARGIN = 2
+# Количество игр, для которых autopilot_policy хранит автопилоты.
+AUTOPILOT_CACHE_SIZE = 8
+
+
+class HamiltonianCycle:
+    """Класс гамильтонова цикла по игровому полю без переходов сквозь стены.
+
+    Цикл идёт змейкой по строкам поля, пропуская первый столбец, и
+    возвращается к началу по первому столбцу. Порядковый номер ячейки в
+    цикле и направление к следующей ячейке вычисляются по координатам,
+    поэтому цикл не хранит таблиц и подходит для полей любого размера.
+    Для поля с нечётной высотой строки и столбцы меняются ролями.
+
+    Атрибуты:
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        size: Количество ячеек в цикле.
+        transposed: Признак цикла по столбцам вместо строк.
+    """
+
+    __slots__ = ('width', 'height', 'size', 'transposed')
+
+    def __init__(self, width: int, height: int) -> None:
+        if width < 2 or height < 2 or width % 2 and height % 2:
+            raise ValueError(
+                f'На поле {width}x{height} нет гамильтонова цикла.'
+            )
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.transposed = height % 2 == 1
+
+    @classmethod
+    def for_board(
+        cls,
+        width: int,
+        height: int
+    ) -> Optional['HamiltonianCycle']:
+        """Возвращает цикл для поля или None, если цикла на поле нет.
+
+        Параметры:
+            width: Ширина игрового поля в ячейках.
+            height: Высота игрового поля в ячейках.
+        """
+        try:
+            return cls(width, height)
+        except ValueError:
+            return None
+
+    def axes(self, cell: int) -> tuple[int, int, int, int]:
+        """Возвращает координаты ячейки и размеры поля вдоль строк цикла.
+
+        Параметры:
+            cell: Ячейка игрового поля.
+        """
+        y, x = divmod(cell, self.width)
+        if self.transposed:
+            return y, x, self.height, self.width
+        return x, y, self.width, self.height
+
+    def index(self, cell: int) -> int:
+        """Возвращает порядковый номер ячейки в цикле.
+
+        Параметры:
+            cell: Ячейка игрового поля.
+        """
+        column, row, row_size, rows = self.axes(cell)
+        if column == 0:
+            return rows * (row_size - 1) + rows - 1 - row
+        if row % 2:
+            return row * (row_size - 1) + row_size - 1 - column
+        return row * (row_size - 1) + column - 1
+
+    def direction(self, cell: int) -> tuple[int, int]:
+        """Возвращает направление от ячейки к следующей ячейке цикла.
+
+        Параметры:
+            cell: Ячейка игрового поля.
+        """
+        column, row, row_size, rows = self.axes(cell)
+        if column == 0:
+            step = (1, 0) if row == 0 else (0, -1)
+        elif row % 2 == 0:
+            step = (0, 1) if column == row_size - 1 else (1, 0)
+        elif column == 1 and row != rows - 1:
+            step = (0, 1)
+        else:
+            step = (-1, 0)
+        return step[::-1] if self.transposed else step
+
+
+def torus_distance(free_cells: FreeCells, first: int, second: int) -> int:
+    """Возвращает длину кратчайшего пути между ячейками на пустом поле.
+
+    Параметры:
+        free_cells: Свободные ячейки игрового поля.
+        first: Первая ячейка.
+        second: Вторая ячейка.
+    """
+    width, height = free_cells.width, free_cells.height
+    first_y, first_x = divmod(first, width)
+    second_y, second_x = divmod(second, width)
+    dx = abs(first_x - second_x)
+    dy = abs(first_y - second_y)
+    return min(dx, width - dx) + min(dy, height - dy)
+
+
+def reaches_body(
+    free_cells: FreeCells,
+    start: int,
+    entered: dict[int, int],
+    tail: int,
+    release_offset: int,
+    obstacles: tuple[int, ...] = (),
+    max_nodes: int = TAIL_SEARCH_NODES
+) -> bool:
+    """Проверяет, что голова из ячейки может догнать хвост.
+
+    Голова догоняет хвост, если входит в ячейку тела не раньше, чем её
+    освободит сегмент: дальше она может идти по следу тела. Поэтому поиск
+    в ширину останавливается на первой такой ячейке, а не ищет путь до
+    самого хвоста.
+
+    Параметры:
+        free_cells: Свободные ячейки игрового поля.
+        start: Ячейка головы.
+        entered: Номера ходов, на которых голова вошла в ячейки тела.
+            Ячейки с номером меньше tail уже освобождены хвостом.
+        tail: Номер хода, на котором голова вошла в ячейку хвоста.
+        release_offset: Сдвиг, с которым номер хода входа в ячейку тела
+            даёт номер хода, начиная с которого в неё можно войти.
+        obstacles: Ячейки, в которые нельзя входить.
+        max_nodes: Наибольшее количество раскрытых ячеек. Если столько
+            ячеек раскрыто, то места для змейки достаточно.
+    """
+    width, height = free_cells.width, free_cells.height
+    walls = free_cells.walls
+    seen = {start, *obstacles}
+    layer = [start]
+    cost = count = 0
+    while layer:
+        cost += 1
+        limit = cost - release_offset
+        next_layer = []
+        for cell in layer:
+            count += 1
+            if count > max_nodes:
+                return True
+            y, x = divmod(cell, width)
+            for dx, dy in DIRECTIONS:
+                next_cell = (y + dy) % height * width + (x + dx) % width
+                if next_cell in seen or walls is not None and walls[next_cell]:
+                    continue
+                entered_at = entered.get(next_cell, tail - 1)
+                if entered_at < tail:
+                    seen.add(next_cell)
+                    next_layer.append(next_cell)
+                elif entered_at <= limit:
+                    return True
+        layer = next_layer
+    return False
+
+
+class CycleOffsets:
+    """Класс расстояний по гамильтонову циклу от заданной ячейки.
+
+    Экземпляр индексируется ячейкой и возвращает, на сколько ячеек цикла
+    она отстоит вперёд от начальной.
+
+    Атрибуты:
+        cycle: Гамильтонов цикл.
+        origin: Порядковый номер начальной ячейки в цикле.
+    """
+
+    __slots__ = ('cycle', 'origin')
+
+    def __init__(self, cycle: HamiltonianCycle, start: int) -> None:
+        self.cycle = cycle
+        self.origin = cycle.index(start)
+
+    def __getitem__(self, cell: int) -> int:
+        """Возвращает расстояние по циклу от начальной ячейки до cell."""
+        return (self.cycle.index(cell) - self.origin) % self.cycle.size
+
+
+def trace_path(
+    parents: dict[int, tuple[tuple[int, int], int]],
+    start: int,
+    cell: int
+) -> list[tuple[tuple[int, int], int]]:
+    """Восстанавливает путь поиска от начальной ячейки до заданной.
+
+    Параметры:
+        parents: Направление и предыдущая ячейка для раскрытых ячеек.
+        start: Начальная ячейка поиска.
+        cell: Конечная ячейка пути.
+    """
+    path = []
+    while cell != start:
+        direction, previous = parents[cell]
+        path.append((direction, cell))
+        cell = previous
+    path.reverse()
+    return path
+
+
+def find_path(
+    free_cells: FreeCells,
+    start: int,
+    goal: int,
+    released: dict[int, int],
+    obstacles: tuple[int, ...] = (),
+    cycle: Optional[HamiltonianCycle] = None,
+    max_nodes: int = MAX_SEARCH_NODES,
+    partial: bool = False,
+    release_offset: int = 0
+) -> Optional[list[tuple[tuple[int, int], int]]]:
+    """Ищет путь между ячейками алгоритмом A*.
+
+    Стены уровня - препятствия. Ячейка тела считается препятствием, если
+    голова дойдёт до неё раньше, чем её освободит сегмент тела.
+
+    Параметры:
+        free_cells: Свободные ячейки игрового поля.
+        start: Начальная ячейка.
+        goal: Конечная ячейка.
+        released: Номера ходов, начиная с которых можно войти в ячейки
+            тела, без сдвига release_offset.
+        obstacles: Ячейки, в которые нельзя входить.
+        cycle: Гамильтонов цикл. Если передан, то каждый ход пути идёт
+            вперёд по циклу и не дальше goal.
+        max_nodes: Наибольшее количество раскрытых ячеек.
+        partial: Если goal не найдена за max_nodes раскрытых ячеек, то
+            вернуть путь до раскрытой ячейки, ближайшей к goal.
+        release_offset: Сдвиг, прибавляемый к номерам ходов released.
+
+    Возвращает список пар (направление, ячейка) от первого хода до goal
+    (или до ближайшей к ней ячейки) или None, если goal недостижима или
+    не найдена за max_nodes раскрытых ячеек без partial.
+    """
+    # Соседние ячейки и оценка расстояния вычисляются на месте: поиск
+    # раскрывает ячейки в самом частом цикле автопилота.
+    width, height = free_cells.width, free_cells.height
+    goal_y, goal_x = divmod(goal, width)
+    walls = free_cells.walls
+    if cycle is not None:
+        offsets = CycleOffsets(cycle, start)
+    costs = {start: 0}
+    parents = {}
+    queue = [(torus_distance(free_cells, start, goal), 0, start)]
+    closest = None
+    for _ in range(max_nodes):
+        if not queue:
+            return None
+        estimate, negative_cost, cell = heappop(queue)
+        if cell == goal:
+            return trace_path(parents, start, cell)
+        if partial and cell != start:
+            # Близость к goal по циклу - оставшееся расстояние по циклу:
+            # путь по циклу не может срезать его.
+            distance = (
+                offsets[goal] - offsets[cell] if cycle is not None
+                else estimate + negative_cost
+            )
+            if closest is None or distance < closest[0]:
+                closest = (distance, cell)
+        cost = costs[cell] + 1
+        limit = cost - release_offset
+        y, x = divmod(cell, width)
+        for direction in DIRECTIONS:
+            next_x = (x + direction[0]) % width
+            next_y = (y + direction[1]) % height
+            next_cell = next_y * width + next_x
+            if (
+                next_cell in costs
+                or next_cell in obstacles
+                or walls is not None and walls[next_cell]
+                or released.get(next_cell, limit) > limit
+                or cycle is not None and not (
+                    offsets[cell] < offsets[next_cell] <= offsets[goal]
+                )
+            ):
+                continue
+            costs[next_cell] = cost
+            parents[next_cell] = (direction, cell)
+            dx = abs(next_x - goal_x)
+            dy = abs(next_y - goal_y)
+            heappush(queue, (
+                cost + min(dx, width - dx) + min(dy, height - dy),
+                -cost,
+                next_cell
+            ))
+    if closest is None:
+        return None
+    return trace_path(parents, start, closest[1])
+
+
+class Autopilot:
+    """Класс автопилота. Экземпляр вызывается как политика.
+
+    Атрибуты:
+        path: Кэшированный путь: пары (направление, ячейка) в обратном
+            порядке, следующий ход - последний элемент.
+        target: Ячейка яблока, для которой найден путь.
+        on_cycle: Признак пути, идущего вперёд по гамильтонову циклу.
+        unreachable: Ячейка яблока, к которой нет пути вперёд по циклу, и
+            расстояние до неё по циклу. Путь ищется снова, когда голова
+            обходит цикл и проходит мимо яблока.
+        expected: Тик и ячейка головы, при которых путь действителен.
+        replan_tick: Тик, до которого не ищется путь к яблоку, если путь
+            к нему не нашёлся.
+        board: Размеры и карта стен поля, для которого построен цикл.
+        cycle: Гамильтонов цикл по полю или None. На поле со стенами
+            цикла нет: он проходил бы сквозь стены.
+        steps: Расстояния по циклу, пройденные головой за последние ходы.
+        span: Сумма расстояний в steps - длина участка цикла от хвоста до
+            головы, если тело лежит на цикле по порядку.
+        moved: Тик и ячейка головы, при которых steps описывает тело.
+        entered: Номера ходов, на которых голова вошла в ячейки тела.
+        segments: Пары (ячейка, номер хода входа) от головы к хвосту.
+        clock: Номер хода, на котором голова вошла в текущую ячейку.
+        synced: Тик и ячейка головы, при которых entered описывает тело.
+    """
+
+    def __init__(self) -> None:
+        self.path = []
+        self.target = None
+        self.on_cycle = False
+        self.unreachable = None
+        self.expected = None
+        self.replan_tick = 0
+        self.board = None
+        self.cycle = None
+        self.steps = deque()
+        self.span = 0
+        self.moved = None
+        self.entered = {}
+        self.segments = deque()
+        self.clock = 0
+        self.synced = None
+
+    def __call__(self, game: GameState) -> Optional[tuple[int, int]]:
+        """Возвращает направление движения змейки на следующем тике.
+
+        Параметры:
+            game: Состояние игры.
+        """
+        snake = game.snake
+        free_cells = snake.free_cells
+        board = (free_cells.width, free_cells.height, free_cells.walls)
+        if self.board != board:
+            self.board = board
+            self.cycle = HamiltonianCycle.for_board(*board[:2]) if (
+                free_cells.area <= CYCLE_AREA_LIMIT
+                and free_cells.walls is None
+            ) else None
+        self.track_segments(game)
+        direction = None
+        if self.cycle is not None:
+            self.track_body(game)
+            if (
+                len(self.steps) == snake.size - 1
+                and self.span < self.cycle.size
+            ):
+                direction = self.follow_cycle(game)
+        if direction is None:
+            direction = self.follow_path(game, on_cycle=False)
+        if direction is None and (
+            self.target != game.apple.position
+            or game.ticks >= self.replan_tick
+        ):
+            self.plan(game)
+            direction = self.follow_path(game, on_cycle=False)
+            if direction is None:
+                self.replan_tick = game.ticks + REPLAN_INTERVAL
+        if direction is None:
+            direction = self.chase_tail(game)
+        if direction is None:
+            direction = self.survive(game)
+        if self.cycle is not None and direction is not None:
+            self.track_move(game, direction)
+        return direction
+
+    def track_segments(self, game: GameState) -> None:
+        """Обновляет номера ходов, на которых голова вошла в ячейки тела.
+
+        После хода змейки добавляется ячейка головы и убираются
+        освободившиеся ячейки хвоста - за O(1) в среднем. Если змейкой
+        двигал кто-то другой, то номера строятся по телу заново.
+
+        Параметры:
+            game: Состояние игры.
+        """
+        snake = game.snake
+        head = snake.get_head_position()
+        if self.synced == (game.ticks, head):
+            return
+        entered = self.entered
+        segments = self.segments
+        if self.synced is not None and self.synced[0] == game.ticks - 1 and (
+            snake.size == 1
+            or snake.free_cells.neighbor(self.synced[1], snake.direction)
+            == head
+        ):
+            self.clock += 1
+            entered[head] = self.clock
+            segments.appendleft((head, self.clock))
+            while len(segments) > snake.size:
+                cell, clock = segments.pop()
+                if entered.get(cell) == clock:
+                    del entered[cell]
+        else:
+            entered.clear()
+            segments.clear()
+            for index, cell in enumerate(snake.positions):
+                entered[cell] = self.clock - index
+                segments.append((cell, self.clock - index))
+        self.synced = (game.ticks, head)
+
+    def release_offset(self, game: GameState) -> int:
+        """Возвращает сдвиг номеров ходов entered для поиска пути.
+
+        Сегмент с индексом i от головы вошёл в ячейку на ходу clock - i и
+        покидает её на ходу size - i (позже на length - size ходов, пока
+        змейка растёт), а голова может войти в ячейку на следующем ходу.
+
+        Параметры:
+            game: Состояние игры.
+        """
+        return game.snake.length + 1 - self.clock
+
+    def track_body(self, game: GameState) -> None:
+        """Согласует пройденные по циклу расстояния с телом змейки.
+
+        Тело лежит на цикле по порядку от хвоста к голове, если сумма
+        расстояний по циклу между соседними сегментами меньше длины
+        цикла. Расстояния хранятся только для последних size - 1 ходов и
+        сбрасываются, если змейкой двигал кто-то другой.
+
+        Параметры:
+            game: Состояние игры.
+        """
+        snake = game.snake
+        if self.moved != (game.ticks, snake.get_head_position()):
+            self.steps.clear()
+            self.span = 0
+        while len(self.steps) >= snake.size:
+            self.span -= self.steps.popleft()
+
+    def track_move(
+        self,
+        game: GameState,
+        direction: tuple[int, int]
+    ) -> None:
+        """Запоминает расстояние по циклу, которое пройдёт голова.
+
+        Параметры:
+            game: Состояние игры.
+            direction: Выбранное направление движения.
+        """
+        head = game.snake.get_head_position()
+        cell = game.snake.free_cells.neighbor(head, direction)
+        distance = (
+            self.cycle.index(cell) - self.cycle.index(head)
+        ) % self.cycle.size
+        self.steps.append(distance)
+        self.span += distance
+        self.moved = (game.ticks + 1, cell)
+
+    def safe_moves(self, game: GameState) -> Iterator[tuple[tuple, int]]:
+        """Возвращает допустимые ходы в свободные ячейки.
+
+        Ходы в тело, в неправильный продукт и в стены уровня недопустимы.
+
+        Параметры:
+            game: Состояние игры.
+
+        Возвращает пары (направление, ячейка).
+        """
+        snake = game.snake
+        head = snake.get_head_position()
+        walls = snake.free_cells.walls
+        for direction in (snake.direction, *TURNS[snake.direction]):
+            cell = snake.free_cells.neighbor(head, direction)
+            if (
+                cell not in snake.occupied
+                and cell != game.wrong_product.position
+                and not (walls is not None and walls[cell])
+            ):
+                yield direction, cell
+
+    @staticmethod
+    def obstacles(game: GameState) -> tuple[int, int]:
+        """Возвращает ячейки, в которые нельзя входить при поиске пути.
+
+        Это неправильный продукт и ячейка позади головы: развернуться на
+        месте змейка не может, даже когда состоит из одной головы.
+
+        Параметры:
+            game: Состояние игры.
+        """
+        snake = game.snake
+        behind = (-snake.direction[0], -snake.direction[1])
+        return (
+            game.wrong_product.position,
+            snake.free_cells.neighbor(snake.get_head_position(), behind)
+        )
+
+    def follow_path(
+        self,
+        game: GameState,
+        on_cycle: bool
+    ) -> Optional[tuple[int, int]]:
+        """Делает следующий ход кэшированного пути, если путь действителен.
+
+        Параметры:
+            game: Состояние игры.
+            on_cycle: Признак пути, идущего вперёд по гамильтонову циклу.
+        """
+        snake = game.snake
+        if (
+            not self.path
+            or self.on_cycle != on_cycle
+            or self.target != game.apple.position
+            or self.expected != (game.ticks, snake.get_head_position())
+        ):
+            self.path.clear()
+            return None
+        if self.blocked(game, self.path[-1][1]) and (
+            on_cycle or not self.repair(game)
+        ):
+            self.path.clear()
+            return None
+        direction, cell = self.path.pop()
+        self.expected = (game.ticks + 1, cell)
+        return direction
+
+    @staticmethod
+    def blocked(game: GameState, cell: int) -> bool:
+        """Проверяет, что в ячейку сейчас нельзя войти.
+
+        Параметры:
+            game: Состояние игры.
+            cell: Ячейка игрового поля.
+        """
+        walls = game.snake.free_cells.walls
+        return (
+            cell in game.snake.occupied
+            or cell == game.wrong_product.position
+            or walls is not None and bool(walls[cell])
+        )
+
+    def repair(self, game: GameState) -> bool:
+        """Чинит кэшированный путь, следующая ячейка которого перекрыта.
+
+        Ищется короткий обход от головы до первой свободной ячейки пути за
+        препятствием, и начало пути заменяется обходом. Остаток пути
+        остаётся прежним: голова доходит до него не раньше, чем по
+        исходному пути, поэтому тело успевает освободить его ячейки.
+
+        Параметры:
+            game: Состояние игры.
+
+        Возвращает True, если путь починен.
+        """
+        snake = game.snake
+        path = self.path
+        # Путь хранится в обратном порядке: ячейки за перекрытой - в начале
+        # списка.
+        index = next((
+            index for index in range(
+                len(path) - 2, len(path) - 2 - REPAIR_LOOKAHEAD, -1
+            )
+            if index >= 0 and not self.blocked(game, path[index][1])
+        ), None)
+        if index is None:
+            return False
+        detour = find_path(
+            snake.free_cells, snake.get_head_position(), path[index][1],
+            self.entered, self.obstacles(game),
+            max_nodes=REPAIR_SEARCH_NODES,
+            release_offset=self.release_offset(game)
+        )
+        if not detour:
+            return False
+        self.path = path[:index] + detour[::-1]
+        return True
+
+    def plan(self, game: GameState, on_cycle: bool = False) -> None:
+        """Ищет путь к яблоку и кэширует его.
+
+        Путь вперёд по гамильтонову циклу проходит только по свободному
+        участку цикла перед головой. Путь без цикла принимается, только
+        если после него голова может догнать хвост, иначе кэшированный
+        путь остаётся пустым.
+
+        Параметры:
+            game: Состояние игры.
+            on_cycle: Признак поиска пути вперёд по гамильтонову циклу.
+        """
+        snake = game.snake
+        head = snake.get_head_position()
+        if on_cycle:
+            path = find_path(
+                snake.free_cells, head, game.apple.position, {},
+                self.obstacles(game), self.cycle,
+                max_nodes=PLAN_SEARCH_NODES, partial=True
+            )
+        else:
+            path = find_path(
+                snake.free_cells, head, game.apple.position, self.entered,
+                self.obstacles(game), max_nodes=PLAN_SEARCH_NODES,
+                partial=True, release_offset=self.release_offset(game)
+            )
+            if path and not self.tail_reachable(
+                game, path, int(path[-1][1] == game.apple.position)
+            ):
+                path = None
+        self.path = path[::-1] if path else []
+        self.on_cycle = on_cycle
+        self.target = game.apple.position
+        self.expected = (game.ticks, head)
+
+    def tail_reachable(
+        self,
+        game: GameState,
+        path: list[tuple[tuple[int, int], int]],
+        eaten: int = 0
+    ) -> bool:
+        """Проверяет, что после прохода пути голова может догнать хвост.
+
+        Ячейки пути на время проверки записываются в entered как ячейки,
+        в которые голова войдёт на следующих ходах, поэтому проверка не
+        копирует тело змейки.
+
+        Параметры:
+            game: Состояние игры.
+            path: Путь в виде пар (направление, ячейка).
+            eaten: Количество яблок, съеденных в конце пути.
+        """
+        snake = game.snake
+        size = min(snake.size + len(path), snake.length)
+        if size < 2:
+            return True
+        entered = self.entered
+        saved = [(cell, entered.get(cell)) for _, cell in path]
+        for step, (_, cell) in enumerate(path, 1):
+            entered[cell] = self.clock + step
+        reachable = reaches_body(
+            snake.free_cells,
+            path[-1][1] if path else snake.get_head_position(),
+            entered,
+            self.clock + len(path) - size + 1,
+            self.release_offset(game) + eaten - len(path),
+            (game.wrong_product.position,)
+        )
+        for cell, clock in reversed(saved):
+            if clock is None:
+                del entered[cell]
+            else:
+                entered[cell] = clock
+        return reachable
+
+    def chase_tail(self, game: GameState) -> Optional[tuple[int, int]]:
+        """Выбирает ход, после которого голова может догнать хвост.
+
+        Если на поле есть гамильтонов цикл, из таких ходов выбирается
+        ближайший вперёд по циклу, чтобы тело снова легло на цикл по
+        порядку. Иначе выбирается самый далёкий от хвоста ход, чтобы
+        змейка не сворачивалась вокруг хвоста и оставляла себе место.
+
+        Параметры:
+            game: Состояние игры.
+        """
+        snake = game.snake
+        if self.cycle is not None:
+            offsets = CycleOffsets(self.cycle, snake.get_head_position())
+        tail = snake.get_tail_position()
+        # Ходы проверяются от лучшего к худшему, и проверка останавливается
+        # на первом ходе, после которого голова догоняет хвост.
+        moves = sorted(
+            self.safe_moves(game),
+            key=lambda move: (
+                offsets[move[1]] if self.cycle is not None
+                else -torus_distance(snake.free_cells, move[1], tail)
+            )
+        )
+        return next((
+            direction for direction, cell in moves
+            if self.tail_reachable(game, [(direction, cell)])
+        ), None)
+
+    def follow_cycle(self, game: GameState) -> Optional[tuple[int, int]]:
+        """Выбирает ход по гамильтонову циклу, когда тело лежит на нём.
+
+        Тело лежит на цикле по порядку от хвоста к голове, поэтому ход в
+        любую ячейку свободного участка цикла перед головой сохраняет этот
+        порядок, пока оставляет запас перед хвостом. Если яблоко лежит в
+        пределах запаса, змейка срезает путь к нему кратчайшим путём
+        вперёд по циклу. Иначе она идёт по циклу, обходя неправильный
+        продукт ближайшей безопасной срезкой, и тело снова собирается в
+        непрерывный участок цикла.
+
+        Параметры:
+            game: Состояние игры.
+
+        Возвращает направление или None, если безопасного хода по циклу
+        нет.
+        """
+        direction = self.follow_path(game, on_cycle=True)
+        if direction is not None:
+            return direction
+        snake = game.snake
+        offsets = CycleOffsets(self.cycle, snake.get_head_position())
+        limit = (
+            (offsets[snake.get_tail_position()] or self.cycle.size)
+            - (snake.length - snake.size) - SHORTCUT_MARGIN
+        )
+        to_apple = offsets[game.apple.position]
+        if self.unreachable is not None and (
+            self.unreachable[0] != game.apple.position
+            or self.unreachable[1] < to_apple
+        ):
+            self.unreachable = None
+        if self.unreachable is not None:
+            self.unreachable = (game.apple.position, to_apple)
+        elif to_apple < limit:
+            self.plan(game, on_cycle=True)
+            direction = self.follow_path(game, on_cycle=True)
+            if direction is not None:
+                return direction
+            self.unreachable = (game.apple.position, to_apple)
+        candidates = sorted(
+            (offsets[cell], direction, cell)
+            for direction, cell in self.safe_moves(game)
+            if offsets[cell] == 1 or offsets[cell] < limit
+        )
+        for _, direction, cell in candidates:
+            detour = self.detour(game, offsets, limit, cell)
+            if detour is not None:
+                self.path = detour[::-1]
+                self.on_cycle = True
+                self.target = game.apple.position
+                self.expected = (game.ticks + 1, cell)
+                return direction
+        return candidates[0][1] if candidates else None
+
+    def detour(
+        self,
+        game: GameState,
+        offsets: CycleOffsets,
+        limit: int,
+        cell: int
+    ) -> Optional[list[tuple[tuple[int, int], int]]]:
+        """Ищет обход неправильного продукта из ячейки вперёд по циклу.
+
+        Неправильный продукт лежит на цикле, и если свободный участок
+        цикла перед головой короткий, то перед продуктом можно оказаться в
+        тупике. Поэтому, когда продукт близко впереди, из ячейки ищется
+        путь вперёд по циклу к следующей за продуктом ячейке.
+
+        Параметры:
+            game: Состояние игры.
+            offsets: Расстояния по циклу от головы.
+            limit: Наибольшее безопасное расстояние хода по циклу.
+            cell: Ячейка, в которую ходит голова.
+
+        Возвращает путь обхода, пустой список, если обход не нужен, или
+        None, если обхода нет.
+        """
+        wrong_product = game.wrong_product.position
+        free_cells = game.snake.free_cells
+        after = free_cells.neighbor(
+            wrong_product, self.cycle.direction(wrong_product)
+        )
+        if cell == after or not (
+            offsets[cell] < offsets[wrong_product]
+            <= WRONG_PRODUCT_LOOKAHEAD
+            and offsets[after] < limit
+        ):
+            return []
+        return find_path(
+            free_cells, cell, after, {}, (wrong_product,), self.cycle,
+            max_nodes=WRONG_PRODUCT_LOOKAHEAD
+        )
+
+    def survive(self, game: GameState) -> Optional[tuple[int, int]]:
+        """Выбирает ход в сторону наибольшей доступной области поля.
+
+        Используется, когда нет ни безопасного пути к яблоку, ни хода,
+        после которого голова может догнать хвост.
+
+        Параметры:
+            game: Состояние игры.
+        """
+        free_cells = game.snake.free_cells
+        best = None
+        for direction, cell in self.safe_moves(game):
+            key = (
+                self.flood_size(game, cell),
+                -torus_distance(free_cells, cell, game.apple.position)
+            )
+            if best is None or key > best[0]:
+                best = (key, direction)
+        return best[1] if best else None
+
+    @staticmethod
+    def flood_size(game: GameState, start: int) -> int:
+        """Возвращает количество свободных ячеек, доступных из ячейки.
+
+        Подсчёт останавливается на FLOOD_LIMIT ячейках. Тело, неправильный
+        продукт и стены уровня в область не входят.
+
+        Параметры:
+            game: Состояние игры.
+            start: Начальная ячейка.
+        """
+        snake = game.snake
+        neighbor = snake.free_cells.neighbor
+        walls = snake.free_cells.walls
+        seen = {start, game.wrong_product.position}
+        stack = [start]
+        count = 0
+        while stack and count < FLOOD_LIMIT:
+            cell = stack.pop()
+            count += 1
+            for direction in DIRECTIONS:
+                next_cell = neighbor(cell, direction)
+                if (
+                    next_cell not in seen
+                    and next_cell not in snake.occupied
+                    and not (walls is not None and walls[next_cell])
+                ):
+                    seen.add(next_cell)
+                    stack.append(next_cell)
+        return count
+
+
+# Автопилоты политики autopilot_policy по играм: id игры - ключ, значение -
+# игра и её автопилот. Ссылка на игру не даёт id достаться новой игре.
+_autopilots = OrderedDict()
+
+
+def autopilot_policy(game: GameState) -> Optional[tuple[int, int]]:
+    """Политика автопилота для турниров и игр без графики.
+
+    Каждая игра получает свой автопилот, поэтому кэшированный путь и
+    состояние одной игры не переходят в другую. Хранятся автопилоты
+    AUTOPILOT_CACHE_SIZE последних игр.
+
+    Параметры:
+        game: Состояние игры.
+    """
+    entry = _autopilots.get(id(game))
+    if entry is None:
+        entry = _autopilots[id(game)] = (game, Autopilot())
+        while len(_autopilots) > AUTOPILOT_CACHE_SIZE:
+            _autopilots.popitem(last=False)
+    else:
+        _autopilots.move_to_end(id(game))
+    return entry[1](game)
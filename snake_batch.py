@@ -0,0 +1,288 @@
+"""Модуль содержит векторизованное окружение для пакетной симуляции игры.
+
+Окружение BatchSnakeEnv хранит N игр в массивах NumPy и продвигает их все
+одним вызовом step с теми же правилами, что и GameState.step из модуля
+`snake_engine`: проход сквозь стены, рост при поедании яблока и сброс змейки
+при столкновении с собой или поедании неправильного продукта.
+
+Позиции в окружении хранятся как номера ячеек: y * width + x.
+"""
+from typing import Optional
+
+import numpy as np
+
+from snake_engine import (
+    APPLE_EATEN, BOARD_FULL, DOWN, GRID_HEIGHT, GRID_WIDTH, LEFT, RIGHT,
+    SELF_COLLISION, TURNS, UP, WRONG_PRODUCT_EATEN
+)
+
+# Направления движения в порядке их номеров в массивах окружения.
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+# Номер действия "продолжать движение в текущем направлении".
+NO_ACTION = -1
+# Количество раундов случайного выбора ячейки для продукта до перехода
+# к точному выбору среди свободных ячеек.
+PLACEMENT_ATTEMPTS = 4
+
+
+def build_neighbors(width: int, height: int) -> np.ndarray:
+    """Возвращает таблицу соседних ячеек с учётом прохода сквозь стены.
+
+    Элемент [direction, cell] таблицы - номер ячейки, в которую попадает
+    змейка из ячейки cell при движении в направлении direction.
+
+    Параметры:
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+    """
+    cells = np.arange(width * height)
+    x, y = cells % width, cells // width
+    return np.stack([
+        (y + dy) % height * width + (x + dx) % width
+        for dx, dy in DIRECTIONS
+    ])
+
+
+def build_turns() -> np.ndarray:
+    """Возвращает одномерную таблицу поворотов.
+
+    Элемент таблицы с индексом (direction << 3) | (action & 7) - номер
+    направления, которое получит змейка, движущаяся в направлении
+    direction, после действия action. Для NO_ACTION и недопустимых
+    поворотов направление не меняется.
+    """
+    turns = np.empty((len(DIRECTIONS), 8), dtype=np.intp)
+    for index, direction in enumerate(DIRECTIONS):
+        turns[index] = index
+        for action in TURNS[direction]:
+            turns[index, DIRECTIONS.index(action)] = DIRECTIONS.index(action)
+    return turns.reshape(-1)
+
+
+class BatchSnakeEnv:
+    """Класс для пакетной симуляции нескольких игр "Змейка".
+
+    Тело каждой змейки хранится в кольцевом буфере, размер которого -
+    степень двойки, поэтому индексы буфера обновляются побитовым И, а не
+    делением с остатком.
+
+    Атрибуты:
+        num_envs: Количество игр.
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        cells: Количество ячеек игрового поля.
+        rng: Генератор случайных чисел окружения.
+        neighbors: Таблица соседних ячеек, см. build_neighbors.
+        turns: Таблица поворотов, см. build_turns.
+        body: Кольцевые буферы с номерами ячеек тела змеек, форма
+            (num_envs, capacity).
+        heads: Номера ячеек голов змеек.
+        head_index: Индекс головы змейки в кольцевом буфере.
+        tail_index: Индекс хвоста змейки в кольцевом буфере.
+        size: Текущее количество сегментов змейки.
+        length: Длина, до которой растёт змейка.
+        max_length: Максимальная длина змейки за игру.
+        occupancy: Занятость ячеек телом змейки, форма (num_envs, cells).
+        direction: Номер направления движения змейки в DIRECTIONS.
+        apple: Номер ячейки яблока.
+        wrong_product: Номер ячейки неправильного продукта.
+        ticks: Количество прошедших тиков каждой игры.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        width: int = GRID_WIDTH,
+        height: int = GRID_HEIGHT,
+        seed: Optional[int] = None
+    ) -> None:
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.center = (height // 2) * width + width // 2
+        self.capacity = 1 << (self.cells - 1).bit_length()
+        # Номера ячеек хранятся в самом узком подходящем типе: так кольцевые
+        # буферы занимают меньше памяти, а запись в них не требует
+        # преобразования типов.
+        self.cell_dtype = (
+            np.int16 if self.cells <= np.iinfo(np.int16).max else np.int32
+        )
+        self.rng = np.random.default_rng(seed)
+        self.neighbors = build_neighbors(width, height).reshape(-1).astype(
+            self.cell_dtype
+        )
+        self.turns = build_turns()
+        self.envs = np.arange(num_envs)
+        # Смещения строк для индексации двумерных массивов окружения как
+        # одномерных.
+        self.cell_offsets = self.envs * self.cells
+        self.body_offsets = self.envs * self.capacity
+        self.body = np.zeros((num_envs, self.capacity), dtype=self.cell_dtype)
+        self.occupancy = np.zeros((num_envs, self.cells), dtype=bool)
+        self.heads = np.zeros(num_envs, dtype=self.cell_dtype)
+        self.head_index = np.zeros(num_envs, dtype=np.intp)
+        self.tail_index = np.zeros(num_envs, dtype=np.intp)
+        self.size = np.zeros(num_envs, dtype=np.intp)
+        self.length = np.zeros(num_envs, dtype=np.intp)
+        self.max_length = np.ones(num_envs, dtype=np.intp)
+        self.direction = np.zeros(num_envs, dtype=np.intp)
+        self.apple = np.full(num_envs, self.center, dtype=np.intp)
+        self.wrong_product = np.full(num_envs, self.center, dtype=np.intp)
+        self.ticks = np.zeros(num_envs, dtype=np.intp)
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """Начинает заново все игры или игры, отмеченные в маске.
+
+        Параметры:
+            mask: Булев массив формы (num_envs,) с играми для сброса.
+        """
+        envs = self.envs if mask is None else np.flatnonzero(mask)
+        self.reset_snakes(envs)
+        self.max_length[envs] = 1
+        self.ticks[envs] = 0
+        self.place(self.apple, envs, self.wrong_product)
+        self.place(self.wrong_product, envs, self.apple)
+
+    def reset_snakes(self, envs: np.ndarray) -> None:
+        """Сбрасывает змеек в начальное состояние.
+
+        Параметры:
+            envs: Номера игр.
+        """
+        self.occupancy[envs] = False
+        self.occupancy[envs, self.center] = True
+        self.body[envs, 0] = self.center
+        self.heads[envs] = self.center
+        self.head_index[envs] = 0
+        self.tail_index[envs] = 0
+        self.size[envs] = 1
+        self.length[envs] = 1
+        self.direction[envs] = self.rng.integers(
+            len(DIRECTIONS), size=len(envs)
+        )
+
+    def place(
+        self,
+        products: np.ndarray,
+        envs: np.ndarray,
+        other_products: np.ndarray
+    ) -> np.ndarray:
+        """Устанавливает продукты в случайные свободные ячейки.
+
+        Сначала ячейки выбираются случайно с отбраковкой занятых. Игры, для
+        которых за PLACEMENT_ATTEMPTS раундов свободная ячейка не нашлась,
+        получают ячейку точным выбором среди свободных.
+
+        Параметры:
+            products: Массив позиций продукта, который нужно обновить.
+            envs: Номера игр.
+            other_products: Позиции другого продукта, которые нужно
+                исключить.
+
+        Возвращает номера игр, в которых свободных ячеек не осталось.
+        """
+        pending = envs
+        for _ in range(PLACEMENT_ATTEMPTS):
+            if not pending.size:
+                return pending
+            cells = self.rng.integers(self.cells, size=pending.size)
+            free = (
+                ~self.occupancy[pending, cells]
+                & (cells != other_products[pending])
+            )
+            products[pending[free]] = cells[free]
+            pending = pending[~free]
+        if not pending.size:
+            return pending
+        free = ~self.occupancy[pending]
+        free[np.arange(pending.size), other_products[pending]] = False
+        counts = free.sum(axis=1)
+        full = counts == 0
+        choices = self.rng.integers(np.maximum(counts, 1))
+        cells = (free.cumsum(axis=1) > choices[:, None]).argmax(axis=1)
+        products[pending[~full]] = cells[~full]
+        return pending[full]
+
+    def step(
+        self,
+        actions: Optional[np.ndarray] = None
+    ) -> tuple[dict[str, np.ndarray], 'BatchSnakeEnv']:
+        """Продвигает все игры на один тик.
+
+        Игры, в которых змейка была сброшена, продолжаются автоматически.
+
+        Параметры:
+            actions: Массив формы (num_envs,) с номерами новых направлений
+                в DIRECTIONS или NO_ACTION. Недопустимые повороты
+                игнорируются, как и в GameState.step.
+
+        Возвращает словарь булевых массивов формы (num_envs,) для каждого
+        события из `snake_engine` и само окружение.
+        """
+        if actions is not None:
+            self.direction = self.turns[
+                (self.direction << 3) | (np.asarray(actions) & 7)
+            ]
+        next_heads = self.neighbors[self.direction * self.cells + self.heads]
+        cells = self.cell_offsets + next_heads
+        collided = self.occupancy.reshape(-1)[cells]
+        # Змейки, столкнувшиеся с собой, будут сброшены в конце тика,
+        # поэтому голова и хвост обновляются во всех играх без масок.
+        self.head_index += 1
+        self.head_index &= self.capacity - 1
+        self.body.reshape(-1)[self.body_offsets + self.head_index] = (
+            next_heads
+        )
+        self.occupancy.reshape(-1)[cells] = True
+        self.heads = next_heads
+        self.size += 1
+        shrink = self.size > self.length
+        tails = self.body.reshape(-1)[self.body_offsets + self.tail_index]
+        # Хвост подросшей змейки остаётся занятым.
+        self.occupancy.reshape(-1)[self.cell_offsets + tails] = ~shrink
+        self.tail_index += shrink
+        self.tail_index &= self.capacity - 1
+        self.size -= shrink
+        moved = ~collided
+        apple_eaten = next_heads == self.apple
+        apple_eaten &= moved
+        self.length += apple_eaten
+        np.maximum(self.max_length, self.length, out=self.max_length)
+        full_envs = self.place(
+            self.apple, np.flatnonzero(apple_eaten), self.wrong_product
+        )
+        board_full = np.zeros(self.num_envs, dtype=bool)
+        board_full[full_envs] = True
+        wrong_product_eaten = next_heads == self.wrong_product
+        wrong_product_eaten &= moved
+        wrong_product_eaten &= ~apple_eaten
+        reset_envs = np.flatnonzero(collided | wrong_product_eaten)
+        if reset_envs.size or full_envs.size:
+            self.reset_snakes(np.concatenate((reset_envs, full_envs)))
+            self.place(
+                self.wrong_product,
+                np.flatnonzero(wrong_product_eaten),
+                self.apple
+            )
+            self.place(self.apple, full_envs, self.wrong_product)
+        self.ticks += 1
+        return {
+            APPLE_EATEN: apple_eaten,
+            WRONG_PRODUCT_EATEN: wrong_product_eaten,
+            SELF_COLLISION: collided,
+            BOARD_FULL: board_full
+        }, self
+
+    def positions(self, env: int) -> np.ndarray:
+        """Возвращает номера ячеек тела змейки одной игры от головы к
+        хвосту.
+
+        Параметры:
+            env: Номер игры.
+        """
+        indexes = (
+            self.head_index[env] - np.arange(self.size[env])
+        ) & (self.capacity - 1)
+        return self.body[env, indexes]
@@ -0,0 +1,485 @@
+"""Модуль содержит набор бенчмарков для горячих участков игры "Змейка".
+
+Измеряются:
+    - Snake.move при длине змейки 1, 100, 1000 и 10000 сегментов;
+    - Apple.randomize_position при заполнении поля от 10% до 99%;
+    - GameObject.draw_cell и отрисовка кадра с SDL_VIDEODRIVER=dummy на
+        поле размером с окно и на поле LARGE_BOARD_SIZE;
+    - количество тиков в секунду игры без графики;
+    - Arena.step с ARENA_SNAKES змейками на поле ARENA_BOARD_SIZE;
+    - тик игры без графики с обновлением наблюдения ObservationEncoder;
+    - время запуска в новом процессе: импорт модулей без графики, импорт
+        самого pygame и запуск игры (импорт модуля `the_snake` вместе с
+        pygame и открытие окна). Импорт модулей без графики и запуск игры
+        после импорта pygame, который от игры не зависит, не должны
+        превышать STARTUP_BUDGET_MS.
+
+Для каждого бенчмарка выводятся операции в секунду и задержки p50/p99.
+Результаты можно сохранить в JSON и сравнить с сохранённым ранее базовым
+файлом: если какой-то результат стал хуже больше чем на заданный процент,
+то программа завершается с кодом 1.
+
+Запуск:
+    python snake_benchmark.py --json results.json
+    python snake_benchmark.py --baseline results.json --max-regression 10
+"""
+from functools import partial
+from random import choice, seed as random_seed
+from time import perf_counter_ns
+from types import ModuleType
+from typing import Callable, Optional
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from snake_arena import Arena
+from snake_autopilot import HamiltonianCycle
+from snake_engine import (
+    DOWN, GRID_HEIGHT, GRID_WIDTH, LEFT, RIGHT, TURNS, UP, Apple, FreeCells,
+    GameRandom, GameState, Snake
+)
+from snake_observation import ObservationEncoder
+
+DEFAULT_SEED = 0
+DEFAULT_REPEAT = 20_000
+DEFAULT_MAX_REGRESSION = 10.0
+SNAKE_LENGTHS = (1, 100, 1000, 10000)
+FILL_RATIOS = (0.1, 0.5, 0.9, 0.99)
+# Размер поля в ячейках для Snake.move: на нём помещается самая длинная
+# змейка из SNAKE_LENGTHS.
+MOVE_BOARD_SIZE = (128, 128)
+# Размер большого поля для бенчмарка отрисовки кадра.
+LARGE_BOARD_SIZE = (10_000, 10_000)
+# Арена: количество змеек, еды и размер поля. Тик арены в сотни раз
+# дороже тика одиночной игры, поэтому тиков меньше в ARENA_REPEAT_DIVISOR
+# раз.
+ARENA_SNAKES = 1000
+ARENA_FOOD = 500
+ARENA_BOARD_SIZE = (200, 200)
+ARENA_REPEAT_DIVISOR = 100
+# Радиус окрестности головы для бенчмарка наблюдения.
+OBSERVATION_CROP_RADIUS = 5
+# Бюджет времени запуска в миллисекундах.
+STARTUP_BUDGET_MS = 100
+# Модули пакетных запусков без графики.
+HEADLESS_MODULES = (
+    'snake_engine', 'snake_arena', 'snake_autopilot', 'snake_replay',
+    'snake_scores', 'snake_tournament'
+)
+# Запуск процесса в сотни раз дороже остальных операций, поэтому запусков
+# меньше в STARTUP_REPEAT_DIVISOR раз.
+STARTUP_REPEAT_DIVISOR = 2000
+# Замеряемый код запуска и код, выполняемый до замера.
+STARTUP_SCRIPTS = {
+    'startup[headless]': ('', 'import ' + ', '.join(HEADLESS_MODULES)),
+    'startup[pygame]': ('', 'import pygame'),
+    'startup[game]': ('', 'import the_snake\nthe_snake.get_screen()'),
+}
+# Запуски с бюджетом и код, выполняемый до замера при проверке бюджета.
+# Время импорта pygame от игры не зависит и сильно колеблется, поэтому
+# бюджет запуска игры проверяется после импорта pygame в том же процессе.
+STARTUP_BUDGET_PRELOADS = {
+    'startup[headless]': '',
+    'startup[game]': 'import pygame',
+}
+
+
+def measure(
+    name: str,
+    operation: Callable[[], object],
+    repeat: int
+) -> dict:
+    """Измеряет время выполнения операции.
+
+    Параметры:
+        name: Название бенчмарка.
+        operation: Измеряемая операция.
+        repeat: Количество запусков операции.
+
+    Возвращает словарь с названием, количеством операций в секунду и
+    задержками p50 и p99 в наносекундах.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = perf_counter_ns()
+        operation()
+        durations.append(perf_counter_ns() - start)
+    return summarize_durations(name, durations)
+
+
+def summarize_durations(name: str, durations: list[int]) -> dict:
+    """Возвращает результат бенчмарка по замерам операции.
+
+    Параметры:
+        name: Название бенчмарка.
+        durations: Длительности запусков операции в наносекундах.
+
+    Возвращает словарь с названием, количеством операций в секунду и
+    задержками p50 и p99 в наносекундах.
+    """
+    durations = sorted(durations)
+    repeat = len(durations)
+    return {
+        'name': name,
+        'ops_per_second': round(repeat * 10**9 / max(sum(durations), 1)),
+        'p50_ns': durations[repeat // 2],
+        'p99_ns': durations[min(repeat - 1, repeat * 99 // 100)]
+    }
+
+
+def bench_snake_move(repeat: int, seed: int) -> list[dict]:
+    """Измеряет Snake.move для змеек разной длины.
+
+    Змейка движется по гамильтонову циклу автопилота на поле
+    MOVE_BOARD_SIZE, поэтому никогда не сталкивается с собой. Направления
+    цикла вычисляются заранее, чтобы замер не включал их вычисление.
+
+    Параметры:
+        repeat: Количество шагов змейки.
+        seed: Сид генератора случайных чисел игры.
+    """
+    hamiltonian_cycle = HamiltonianCycle(*MOVE_BOARD_SIZE)
+    cycle = [
+        hamiltonian_cycle.direction(cell)
+        for cell in range(hamiltonian_cycle.size)
+    ]
+    results = []
+    for length in SNAKE_LENGTHS:
+        free_cells = FreeCells(*MOVE_BOARD_SIZE)
+        snake = Snake(free_cells=free_cells, rng=GameRandom(seed))
+        position = 0
+        body = []
+        for _ in range(length):
+            body.append(position)
+            position = free_cells.neighbor(position, cycle[position])
+        snake.positions = reversed(body)
+        snake.length = length
+
+        def move(snake=snake):
+            snake.direction = cycle[snake.get_head_position()]
+            snake.move()
+
+        results.append(measure(f'Snake.move[length={length}]', move, repeat))
+    return results
+
+
+def bench_randomize_position(repeat: int, seed: int) -> list[dict]:
+    """Измеряет Apple.randomize_position при разном заполнении поля.
+
+    Параметры:
+        repeat: Количество перемещений яблока.
+        seed: Сид генератора случайных чисел игры.
+    """
+    results = []
+    for fill_ratio in FILL_RATIOS:
+        free_cells = FreeCells()
+        for cell in free_cells.cells[:]:
+            if len(free_cells) <= (1 - fill_ratio) * GRID_WIDTH * GRID_HEIGHT:
+                break
+            free_cells.occupy(cell)
+        apple = Apple(free_cells, rng=GameRandom(seed))
+        results.append(measure(
+            f'Apple.randomize_position[fill={fill_ratio:.0%}]',
+            apple.randomize_position,
+            repeat
+        ))
+    return results
+
+
+def bench_headless_game(repeat: int, seed: int) -> list[dict]:
+    """Измеряет тики игры без графики со случайными поворотами.
+
+    Параметры:
+        repeat: Количество тиков.
+        seed: Сид игры.
+    """
+    game = GameState(seed=seed)
+
+    def step():
+        game.step(choice((None, *TURNS[game.snake.direction])))
+
+    return [measure('GameState.step', step, repeat)]
+
+
+def bench_arena_step(repeat: int, seed: int) -> list[dict]:
+    """Измеряет тики арены со множеством змеек и случайными поворотами.
+
+    Параметры:
+        repeat: Количество тиков одиночной игры.
+        seed: Сид арены.
+    """
+    width, height = ARENA_BOARD_SIZE
+    arena = Arena(ARENA_SNAKES, ARENA_FOOD, seed, width, height)
+    actions = [
+        choice((None, UP, DOWN, LEFT, RIGHT)) for _ in range(ARENA_SNAKES)
+    ]
+    return [measure(
+        f'Arena.step[snakes={ARENA_SNAKES}]',
+        partial(arena.step, actions),
+        max(repeat // ARENA_REPEAT_DIVISOR, 1)
+    )]
+
+
+def bench_observation_update(repeat: int, seed: int) -> list[dict]:
+    """Измеряет тики игры без графики с обновлением наблюдения.
+
+    Параметры:
+        repeat: Количество тиков.
+        seed: Сид игры.
+    """
+    game = GameState(seed=seed)
+    encoder = ObservationEncoder(game, OBSERVATION_CROP_RADIUS, True)
+
+    def step():
+        events, _ = game.step(choice((None, *TURNS[game.snake.direction])))
+        encoder.update(events)
+        encoder.crop()
+
+    return [measure('GameState.step+ObservationEncoder.update', step, repeat)]
+
+
+def render_frame(the_snake: ModuleType, game: GameState) -> None:
+    """Продвигает игру на тик со случайным поворотом и отрисовывает кадр.
+
+    Параметры:
+        the_snake: Модуль `the_snake`.
+        game: Состояние игры с объектами модуля `the_snake`.
+    """
+    snake = game.snake
+    events, _ = game.step(choice((None, *TURNS[snake.direction])))
+    the_snake.draw_events(events, snake, game.apple, game.wrong_product)
+    the_snake.pg.display.update(the_snake.dirty_rects)
+    the_snake.dirty_rects.clear()
+
+
+def build_rendered_game(
+    the_snake: ModuleType,
+    width: int,
+    height: int,
+    seed: int
+) -> GameState:
+    """Создаёт игру с отрисовкой на поле заданного размера.
+
+    Параметры:
+        the_snake: Модуль `the_snake`.
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        seed: Сид игры.
+    """
+    the_snake.camera = the_snake.Camera(width, height)
+    rng = GameRandom(seed)
+    snake = the_snake.Snake(
+        free_cells=FreeCells.for_board(width, height), rng=rng
+    )
+    apple = the_snake.Apple(snake.free_cells, rng=rng)
+    wrong_product = the_snake.WrongProduct(snake.free_cells, rng=rng)
+    the_snake.redraw_board(snake, apple, wrong_product)
+    return GameState(snake, apple, wrong_product, seed)
+
+
+def bench_rendering(repeat: int, seed: int) -> list[dict]:
+    """Измеряет GameObject.draw_cell и отрисовку кадра без окна.
+
+    Кадр измеряется на поле размером с окно и на поле LARGE_BOARD_SIZE:
+    отрисовываются только видимые камере ячейки, поэтому время кадра не
+    должно зависеть от площади поля.
+
+    Параметры:
+        repeat: Количество отрисовок.
+        seed: Сид игры.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    # Модуль импортируется здесь, чтобы бенчмарки игровой логики не
+    # требовали pygame.
+    import the_snake
+
+    game = build_rendered_game(the_snake, GRID_WIDTH, GRID_HEIGHT, seed)
+    apple = game.apple
+
+    def draw_cell():
+        apple.draw_cell(apple.position)
+        the_snake.dirty_rects.clear()
+
+    results = [
+        measure('GameObject.draw_cell', draw_cell, repeat),
+        measure('frame', partial(render_frame, the_snake, game), repeat)
+    ]
+    large_game = build_rendered_game(the_snake, *LARGE_BOARD_SIZE, seed)
+    results.append(measure(
+        'frame[board={}x{}]'.format(*LARGE_BOARD_SIZE),
+        partial(render_frame, the_snake, large_game),
+        repeat
+    ))
+    the_snake.camera = the_snake.Camera()
+    return results
+
+
+def measure_startup(preload: str, code: str) -> int:
+    """Выполняет код в новом процессе интерпретатора.
+
+    Параметры:
+        preload: Код, выполняемый до замера.
+        code: Замеряемый код.
+
+    Возвращает время выполнения замеряемого кода в наносекундах.
+    """
+    script = '\n'.join((
+        preload,
+        'from time import perf_counter_ns',
+        'start = perf_counter_ns()',
+        code,
+        'print(perf_counter_ns() - start)'
+    ))
+    completed = subprocess.run(
+        (sys.executable, '-c', script),
+        capture_output=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={
+            **os.environ,
+            'SDL_VIDEODRIVER': 'dummy',
+            'PYGAME_HIDE_SUPPORT_PROMPT': '1'
+        },
+        text=True
+    )
+    return int(completed.stdout.split()[-1])
+
+
+def bench_startup(repeat: int, seed: int) -> list[dict]:
+    """Измеряет время запуска в новом процессе.
+
+    Параметры:
+        repeat: Количество запусков одиночной операции.
+        seed: Сид игры. Время запуска от него не зависит.
+    """
+    runs = max(repeat // STARTUP_REPEAT_DIVISOR, 1)
+    return [
+        summarize_durations(
+            name, [measure_startup(*script) for _ in range(runs)]
+        )
+        for name, script in STARTUP_SCRIPTS.items()
+    ]
+
+
+BENCHMARKS = (
+    bench_snake_move,
+    bench_randomize_position,
+    bench_rendering,
+    bench_headless_game,
+    bench_arena_step,
+    bench_observation_update,
+    bench_startup,
+)
+
+
+def run_benchmarks(
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = DEFAULT_SEED,
+    benchmarks: tuple[Callable[[int, int], list[dict]], ...] = BENCHMARKS
+) -> list[dict]:
+    """Запускает бенчмарки с фиксированным сидом.
+
+    Сид задаёт и случайные повороты, и игры, которые создают бенчмарки,
+    поэтому результаты с одним сидом воспроизводимы.
+
+    Параметры:
+        repeat: Количество запусков каждой операции.
+        seed: Сид генератора случайных чисел.
+        benchmarks: Запускаемые бенчмарки.
+    """
+    random_seed(seed)
+    results = []
+    for benchmark in benchmarks:
+        results.extend(benchmark(repeat, seed))
+    return results
+
+
+def find_regressions(
+    results: list[dict],
+    baseline: list[dict],
+    max_regression: float = DEFAULT_MAX_REGRESSION
+) -> list[str]:
+    """Сравнивает результаты с базовыми.
+
+    Параметры:
+        results: Новые результаты.
+        baseline: Базовые результаты.
+        max_regression: Допустимое ухудшение операций в секунду в
+            процентах.
+
+    Возвращает описания результатов, ухудшившихся сильнее допустимого.
+    """
+    baseline_ops = {
+        result['name']: result['ops_per_second'] for result in baseline
+    }
+    regressions = []
+    for result in results:
+        expected = baseline_ops.get(result['name'])
+        if not expected:
+            continue
+        change = (result['ops_per_second'] - expected) / expected * 100
+        if change < -max_regression:
+            regressions.append(
+                f'{result["name"]}: {result["ops_per_second"]} оп/с, '
+                f'базовое значение {expected} оп/с ({change:+.1f}%)'
+            )
+    return regressions
+
+
+def format_results(results: list[dict]) -> str:
+    """Возвращает таблицу результатов бенчмарков.
+
+    Параметры:
+        results: Результаты бенчмарков.
+    """
+    width = max(len(result['name']) for result in results)
+    lines = [f'{"Бенчмарк":<{width}}  {"оп/с":>12}  {"p50, нс":>10}  '
+             f'{"p99, нс":>10}']
+    for result in results:
+        lines.append(
+            f'{result["name"]:<{width}}  {result["ops_per_second"]:>12}  '
+            f'{result["p50_ns"]:>10}  {result["p99_ns"]:>10}'
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Запускает бенчмарки из командной строки.
+
+    Параметры:
+        argv: Аргументы командной строки.
+
+    Возвращает код завершения программы.
+    """
+    parser = argparse.ArgumentParser(
+        description='Бенчмарки игры "Змейка".'
+    )
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--json', help='файл для сохранения результатов')
+    parser.add_argument('--baseline', help='файл с базовыми результатами')
+    parser.add_argument(
+        '--max-regression', type=float, default=DEFAULT_MAX_REGRESSION,
+        help='допустимое ухудшение результата в процентах'
+    )
+    args = parser.parse_args(argv)
+    results = run_benchmarks(args.repeat, args.seed)
+    print(format_results(results))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as file:
+        regressions = find_regressions(
+            results, json.load(file), args.max_regression
+        )
+    for regression in regressions:
+        print(f'Ухудшение: {regression}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
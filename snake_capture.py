@@ -0,0 +1,251 @@
+"""Модуль содержит запись кадров игры "Змейка" для видео.
+
+Запись не должна задерживать игровой цикл, поэтому кадр с экрана
+копируется одним копированием буфера поверхности (get_view) в заранее
+выделенный буфер из пула, а сжатие и запись на диск выполняет фоновый
+поток. Если свободных буферов нет, то есть поток записи не успевает, то
+кадр отбрасывается, а не ждёт: отброшенные кадры считаются в атрибуте
+dropped. Кадры, в которых ничего не отрисовывалось (пустой список
+изменённых прямоугольников), не копируются: считаются в атрибуте skipped.
+
+Формат файла записи:
+    - сигнатура CAPTURE_MAGIC и номер версии формата (1 байт);
+    - ширина, высота, длина строки пикселей в байтах, размер пикселя в
+        битах и маски каналов R, G, B, A (varint), признак сжатия (1 байт);
+    - записи кадров: количество кадров с предыдущей записи (varint),
+        размер данных (varint) и пиксели кадра, сжатые zlib, если файл
+        сжатый. Пропущенные между записями кадры повторяют предыдущий
+        кадр.
+
+Запуск:
+    python the_snake.py --autopilot --capture game.frames
+    python snake_capture.py game.frames --png-dir frames
+"""
+from queue import Empty, SimpleQueue
+from threading import Thread
+from typing import BinaryIO, Iterator, Optional
+import argparse
+import os
+import zlib
+
+import pygame as pg
+
+from snake_varint import decode_varints, encode_varint
+
+CAPTURE_MAGIC = b'SNKF'
+CAPTURE_VERSION = 1
+# Количество буферов кадров: столько кадров может ждать записи.
+CAPTURE_POOL_SIZE = 8
+# Уровень сжатия zlib: быстрый, кадры игры сжимаются хорошо и так.
+COMPRESSION_LEVEL = 1
+
+
+class FrameCapture:
+    """Класс для записи кадров экрана в фоновом потоке.
+
+    Атрибуты:
+        file: Файл записи.
+        compress: Признак сжатия кадров.
+        frame: Номер текущего кадра.
+        captured: Количество скопированных кадров.
+        skipped: Количество кадров без изменений.
+        dropped: Количество кадров, отброшенных из-за занятости пула.
+        stale: Признак того, что последний кадр с изменениями был
+            отброшен, поэтому следующий кадр копируется в любом случае.
+        free: Свободные буферы кадров.
+        queue: Кадры, ожидающие записи: номер кадра и буфер. None -
+            сигнал завершения потока.
+        thread: Фоновый поток записи.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        surface: pg.Surface,
+        pool_size: int = CAPTURE_POOL_SIZE,
+        compress: bool = True
+    ) -> None:
+        self.file = open(path, 'wb')
+        self.compress = compress
+        self.frame = self.captured = self.skipped = self.dropped = 0
+        self.stale = True
+        header = bytearray(CAPTURE_MAGIC)
+        header.append(CAPTURE_VERSION)
+        for value in (
+            surface.get_width(), surface.get_height(), surface.get_pitch(),
+            surface.get_bitsize(), *surface.get_masks()
+        ):
+            encode_varint(value, header)
+        header.append(compress)
+        self.file.write(header)
+        size = surface.get_pitch() * surface.get_height()
+        self.free = SimpleQueue()
+        for _ in range(pool_size):
+            self.free.put(bytearray(size))
+        self.queue = SimpleQueue()
+        self.thread = Thread(
+            target=self.run, name='frame-capture', daemon=True
+        )
+        self.thread.start()
+
+    def capture(self, surface: pg.Surface, dirty_rects: list) -> bool:
+        """Копирует кадр и ставит его в очередь записи, не дожидаясь её.
+
+        Параметры:
+            surface: Поверхность экрана.
+            dirty_rects: Прямоугольники, изменившиеся за кадр.
+
+        Возвращает True, если кадр поставлен в очередь записи.
+        """
+        self.frame += 1
+        if not dirty_rects and not self.stale:
+            self.skipped += 1
+            return False
+        try:
+            buffer = self.free.get_nowait()
+        except Empty:
+            self.dropped += 1
+            self.stale = True
+            return False
+        view = surface.get_view('0')
+        buffer[:] = view
+        # Поверхность заблокирована, пока существует её представление.
+        del view
+        self.queue.put((self.frame, buffer))
+        self.captured += 1
+        self.stale = False
+        return True
+
+    def run(self) -> None:
+        """Сжимает и записывает кадры, пока не придёт сигнал завершения."""
+        previous = 0
+        record = bytearray()
+        while (item := self.queue.get()) is not None:
+            frame, buffer = item
+            data = (
+                zlib.compress(buffer, COMPRESSION_LEVEL) if self.compress
+                else buffer
+            )
+            record.clear()
+            encode_varint(frame - previous, record)
+            encode_varint(len(data), record)
+            self.file.write(record)
+            self.file.write(data)
+            previous = frame
+            self.free.put(buffer)
+
+    def close(self) -> None:
+        """Дожидается записи всех кадров и закрывает файл."""
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+
+
+def read_varint(file: BinaryIO) -> Optional[int]:
+    """Читает из файла число в формате varint.
+
+    Параметры:
+        file: Файл записи.
+
+    Возвращает число или None, если файл закончился.
+    """
+    data = bytearray()
+    while byte := file.read(1):
+        data += byte
+        if not byte[0] & 0x80:
+            return next(decode_varints(data))
+    if data:
+        raise ValueError('Запись кадров обрывается посреди числа.')
+    return None
+
+
+class CaptureReader:
+    """Класс для чтения записи кадров.
+
+    Атрибуты:
+        path: Путь к файлу записи.
+        width: Ширина кадра в пикселях.
+        height: Высота кадра в пикселях.
+        pitch: Длина строки пикселей в байтах.
+        bitsize: Размер пикселя в битах.
+        masks: Маски каналов R, G, B, A.
+        compressed: Признак сжатия кадров.
+        offset: Смещение первой записи кадра в файле.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as file:
+            if file.read(len(CAPTURE_MAGIC) + 1) != (
+                CAPTURE_MAGIC + bytes((CAPTURE_VERSION,))
+            ):
+                raise ValueError(f'{path} не является записью кадров.')
+            self.width, self.height, self.pitch, self.bitsize, *self.masks = (
+                read_varint(file) for _ in range(8)
+            )
+            self.compressed = bool(file.read(1)[0])
+            self.offset = file.tell()
+
+    def frames(self) -> Iterator[tuple[int, bytes]]:
+        """Перебирает записанные кадры: номер кадра и пиксели."""
+        frame = 0
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            while (delta := read_varint(file)) is not None:
+                frame += delta
+                data = file.read(read_varint(file))
+                yield frame, zlib.decompress(data) if self.compressed else data
+
+    def surface(self, data: bytes) -> pg.Surface:
+        """Возвращает поверхность с пикселями кадра.
+
+        Параметры:
+            data: Пиксели кадра.
+        """
+        surface = pg.Surface(
+            (self.width, self.height), 0, self.bitsize, self.masks
+        )
+        buffer = surface.get_buffer()
+        if surface.get_pitch() == self.pitch:
+            buffer.write(data)
+            return surface
+        row_size = self.width * surface.get_bytesize()
+        for row in range(self.height):
+            start = row * self.pitch
+            buffer.write(
+                data[start:start + row_size], row * surface.get_pitch()
+            )
+        return surface
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Сохраняет кадры записи в PNG-файлы для сборки видео.
+
+    Пропущенные кадры сохраняются копиями предыдущего кадра, поэтому
+    номера файлов совпадают с номерами кадров игры.
+
+    Параметры:
+        argv: Аргументы командной строки.
+    """
+    parser = argparse.ArgumentParser(
+        description='Экспорт записи кадров игры "Змейка".'
+    )
+    parser.add_argument('path', help='файл записи кадров')
+    parser.add_argument('--png-dir', required=True, help='папка для кадров')
+    args = parser.parse_args(argv)
+    reader = CaptureReader(args.path)
+    os.makedirs(args.png_dir, exist_ok=True)
+    previous = None
+    last_frame = 0
+    for frame, data in reader.frames():
+        surface = reader.surface(data)
+        for number in range(last_frame + 1, frame + 1):
+            pg.image.save(
+                surface if number == frame else previous,
+                os.path.join(args.png_dir, f'{number:06d}.png')
+            )
+        previous, last_frame = surface, frame
+
+
+if __name__ == '__main__':
+    main()
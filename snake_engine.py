@@ -0,0 +1,914 @@
+"""Модуль содержит игровую логику "Змейки", не зависящую от pygame.
+
+Модуль не импортирует pygame и не создаёт окно, поэтому игру можно
+симулировать без графики: для ботов, тестов и анализа. Модуль `the_snake`
+отрисовывает состояние игры поверх этой логики.
+
+Позиции на игровом поле - номера ячеек y * width + x, где width - ширина
+поля в ячейках. Номера ячеек хранятся в массивах array, а в пиксели они
+переводятся только при отрисовке.
+"""
+from array import array
+from copy import copy
+from random import Random, getrandbits
+import os
+from typing import Iterable, Iterator, Optional, Union
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+GRID_SIZE = 20
+# Размер игрового поля по умолчанию в ячейках: поле целиком помещается в
+# окно игры.
+GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
+GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
+
+# Направления движения.
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+# Словарь с привязкой текущего направления движения змейки к допустимым
+# новым направлениям движения.
+TURNS = {
+    UP: (LEFT, RIGHT),
+    DOWN: (LEFT, RIGHT),
+    LEFT: (UP, DOWN),
+    RIGHT: (UP, DOWN)
+}
+
+CENTER_SCREEN_POINT = ((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))
+CENTER_CELL = GRID_HEIGHT // 2 * GRID_WIDTH + GRID_WIDTH // 2
+# Наибольшая площадь поля в ячейках, для которой FreeCells хранит массив
+# всех свободных ячеек. Для больших полей используется SparseFreeCells.
+DENSE_CELLS_LIMIT = 1 << 16
+# Начальная ёмкость кольцевого буфера тела змейки (степень двойки).
+MIN_BODY_CAPACITY = 16
+
+# События, которые возвращает метод GameState.step.
+APPLE_EATEN = 'apple_eaten'
+WRONG_PRODUCT_EATEN = 'wrong_product_eaten'
+SELF_COLLISION = 'self_collision'
+WALL_COLLISION = 'wall_collision'
+# Змейка заняла всё поле, и новому яблоку негде появиться (победа).
+BOARD_FULL = 'board_full'
+
+# Количество бит в случайном сиде игры и в состоянии генератора GameRandom.
+SEED_BITS = 64
+SEED_MASK = (1 << SEED_BITS) - 1
+
+
+class GameRandom(Random):
+    """Класс для представления генератора случайных чисел игры.
+
+    Генератор SplitMix64 хранит состояние в одном 64-битном числе, поэтому
+    копия генератора для клона игры создаётся за доли микросекунды, а не
+    копированием 2,5 КБ состояния Random. Методы choice, randrange и другие
+    наследуются от Random и работают поверх getrandbits.
+
+    Атрибуты:
+        state: Состояние генератора.
+    """
+
+    def seed(self, a: Optional[int] = None, version: int = 2) -> None:
+        """Устанавливает состояние генератора по сиду.
+
+        Параметры:
+            a: Сид. По умолчанию выбирается случайно.
+            version: Не используется, оставлен для совместимости с Random.
+        """
+        if a is None:
+            a = int.from_bytes(os.urandom(SEED_BITS // 8), 'little')
+        self.state = a & SEED_MASK
+        self.gauss_next = None
+
+    def getrandbits(self, k: int) -> int:
+        """Возвращает случайное неотрицательное число из k бит.
+
+        Параметры:
+            k: Количество бит.
+        """
+        result = bits = 0
+        while bits < k:
+            self.state = state = (self.state + 0x9E3779B97F4A7C15) & SEED_MASK
+            state = ((state ^ state >> 30) * 0xBF58476D1CE4E5B9) & SEED_MASK
+            state = ((state ^ state >> 27) * 0x94D049BB133111EB) & SEED_MASK
+            result |= (state ^ state >> 31) << bits
+            bits += SEED_BITS
+        return result >> (bits - k)
+
+    def random(self) -> float:
+        """Возвращает случайное число в диапазоне [0, 1)."""
+        return self.getrandbits(53) * 2.0 ** -53
+
+    def getstate(self) -> int:
+        """Возвращает состояние генератора."""
+        return self.state
+
+    def setstate(self, state: int) -> None:
+        """Восстанавливает состояние генератора.
+
+        Параметры:
+            state: Состояние, которое вернул getstate.
+        """
+        self.state = state
+
+    def __copy__(self) -> 'GameRandom':
+        """Возвращает независимую копию генератора."""
+        clone = GameRandom.__new__(GameRandom)
+        clone.state = self.state
+        clone.gauss_next = None
+        return clone
+
+
+class CellSet:
+    """Класс для представления множества ячеек небольшого игрового поля.
+
+    Принадлежность ячейки хранится в bytearray по байту на ячейку поля,
+    поэтому память не зависит от количества ячеек в множестве.
+
+    Атрибуты:
+        flags: Массив с отметками ячеек множества.
+        size: Количество ячеек в множестве.
+    """
+
+    __slots__ = ('flags', 'size')
+
+    def __init__(self, area: int) -> None:
+        self.flags = bytearray(area)
+        self.size = 0
+
+    def __contains__(self, cell: int) -> bool:
+        """Проверяет, входит ли ячейка в множество."""
+        return self.flags[cell] != 0
+
+    def __len__(self) -> int:
+        """Возвращает количество ячеек в множестве."""
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        """Перебирает ячейки множества по возрастанию номеров."""
+        return (cell for cell, flag in enumerate(self.flags) if flag)
+
+    def add(self, cell: int) -> None:
+        """Добавляет ячейку в множество.
+
+        Параметры:
+            cell: Номер ячейки.
+        """
+        if not self.flags[cell]:
+            self.flags[cell] = 1
+            self.size += 1
+
+    def discard(self, cell: int) -> None:
+        """Удаляет ячейку из множества, если она в нём есть.
+
+        Параметры:
+            cell: Номер ячейки.
+        """
+        if self.flags[cell]:
+            self.flags[cell] = 0
+            self.size -= 1
+
+    def copy(self) -> 'CellSet':
+        """Возвращает копию множества."""
+        clone = CellSet.__new__(CellSet)
+        clone.flags = self.flags[:]
+        clone.size = self.size
+        return clone
+
+
+class FreeCells:
+    """Класс для представления индекса свободных ячеек игрового поля.
+
+    Свободные ячейки хранятся в плотном массиве cells, а массив indexes
+    хранит для каждой ячейки поля её индекс в cells (-1 для занятых ячеек).
+    Занятая ячейка удаляется из cells обменом с последним элементом, поэтому
+    занятие, освобождение и выбор случайной свободной ячейки выполняются за
+    O(1).
+
+    Одну ячейку могут занимать несколько объектов (например, голова змейки
+    и съеденное ею яблоко), поэтому для ячеек хранится количество объектов
+    в них.
+
+    Стены уровня занимаются при создании индекса и никогда не
+    освобождаются, поэтому продукты на стенах не появляются.
+
+    Атрибуты:
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        area: Количество ячеек поля.
+        typecode: Код типа array, в котором помещаются номера ячеек поля.
+        center: Центральная ячейка поля - стартовая позиция змейки.
+        walls: Карта стен - байт на ячейку, 1 - стена, или None, если
+            стен нет.
+        cells: Массив свободных ячеек.
+        indexes: Массив с индексами ячеек в массиве cells.
+        occupancy: Массив с количеством объектов в каждой ячейке.
+    """
+
+    __slots__ = (
+        'width', 'height', 'area', 'typecode', 'center', 'walls', 'cells',
+        'indexes', 'occupancy'
+    )
+
+    def __init__(
+        self,
+        width: int = GRID_WIDTH,
+        height: int = GRID_HEIGHT,
+        walls: Optional[bytes] = None
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.area = width * height
+        self.typecode = 'i' if self.area < 1 << 31 else 'q'
+        self.center = self.cell(width // 2, height // 2)
+        self.cells = array(self.typecode, range(self.area))
+        self.indexes = array(self.typecode, range(self.area))
+        self.occupancy = bytearray(self.area)
+        self.build_walls(walls)
+
+    @classmethod
+    def for_board(
+        cls,
+        width: int,
+        height: int,
+        walls: Optional[bytes] = None
+    ) -> 'FreeCells':
+        """Возвращает индекс свободных ячеек для поля заданного размера.
+
+        Для полей больше DENSE_CELLS_LIMIT ячеек возвращается
+        SparseFreeCells, память которого не зависит от площади поля.
+
+        Параметры:
+            width: Ширина игрового поля в ячейках.
+            height: Высота игрового поля в ячейках.
+            walls: Карта стен уровня или None.
+        """
+        if width * height > DENSE_CELLS_LIMIT:
+            return SparseFreeCells(width, height, walls)
+        return cls(width, height, walls)
+
+    def build_walls(self, walls: Optional[bytes]) -> None:
+        """Занимает ячейки стен уровня.
+
+        Параметры:
+            walls: Карта стен уровня или None.
+        """
+        if walls is not None and len(walls) != self.area:
+            raise ValueError('Размер карты стен не совпадает с полем.')
+        self.walls = walls
+        if walls is None:
+            return
+        if walls[self.center]:
+            raise ValueError('Центр поля - стартовая позиция змейки - '
+                             'не может быть стеной.')
+        cell = walls.find(1)
+        while cell >= 0:
+            self.occupy(cell)
+            cell = walls.find(1, cell + 1)
+
+    def __len__(self) -> int:
+        """Возвращает количество свободных ячеек."""
+        return len(self.cells)
+
+    def __contains__(self, cell: int) -> bool:
+        """Проверяет, свободна ли ячейка."""
+        return not self.occupancy[cell]
+
+    def cell(self, x: int, y: int) -> int:
+        """Возвращает номер ячейки по её столбцу и строке.
+
+        Параметры:
+            x: Столбец ячейки.
+            y: Строка ячейки.
+        """
+        return y * self.width + x
+
+    def coordinates(self, cell: int) -> tuple[int, int]:
+        """Возвращает столбец и строку ячейки.
+
+        Параметры:
+            cell: Номер ячейки.
+        """
+        y, x = divmod(cell, self.width)
+        return x, y
+
+    def neighbor(self, cell: int, direction: tuple[int, ...]) -> int:
+        """Возвращает соседнюю ячейку с учётом прохода сквозь стены.
+
+        Параметры:
+            cell: Номер ячейки.
+            direction: Направление движения.
+        """
+        y, x = divmod(cell, self.width)
+        return (
+            (y + direction[1]) % self.height * self.width
+            + (x + direction[0]) % self.width
+        )
+
+    def cell_set(self) -> Union[CellSet, set[int]]:
+        """Возвращает пустое множество ячеек, подходящее для этого поля."""
+        return CellSet(self.area)
+
+    def copy(self) -> 'FreeCells':
+        """Возвращает независимую копию индекса."""
+        clone = type(self).__new__(type(self))
+        clone.restore(self)
+        return clone
+
+    def restore(self, other: 'FreeCells') -> None:
+        """Копирует в индекс состояние другого индекса того же поля.
+
+        Параметры:
+            other: Индекс, состояние которого копируется.
+        """
+        self.width = other.width
+        self.height = other.height
+        self.area = other.area
+        self.typecode = other.typecode
+        self.center = other.center
+        self.walls = other.walls
+        self.cells = other.cells[:]
+        self.indexes = other.indexes[:]
+        self.occupancy = other.occupancy[:]
+
+    def occupy(self, cell: int) -> None:
+        """Отмечает ячейку занятой.
+
+        Параметры:
+            cell: Номер ячейки.
+        """
+        count = self.occupancy[cell]
+        self.occupancy[cell] = count + 1
+        if count:
+            return
+        index = self.indexes[cell]
+        last_cell = self.cells.pop()
+        if last_cell != cell:
+            self.cells[index] = last_cell
+            self.indexes[last_cell] = index
+        self.indexes[cell] = -1
+
+    def release(self, cell: int) -> None:
+        """Освобождает ячейку, занятую одним объектом.
+
+        Параметры:
+            cell: Номер ячейки.
+        """
+        count = self.occupancy[cell]
+        self.occupancy[cell] = count - 1
+        if count > 1:
+            return
+        self.indexes[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def choice(self, rng: Random) -> Optional[int]:
+        """Возвращает случайную свободную ячейку или None, если поле
+        заполнено.
+
+        Параметры:
+            rng: Генератор случайных чисел игры.
+        """
+        return rng.choice(self.cells) if self.cells else None
+
+
+class SparseFreeCells(FreeCells):
+    """Класс для представления индекса свободных ячеек большого поля.
+
+    Хранятся только занятые ячейки, поэтому память пропорциональна длине
+    змейки, а не площади поля. Случайная свободная ячейка выбирается
+    случайными попытками с отбраковкой занятых: на большом поле змейка
+    занимает малую долю ячеек, и попыток почти всегда нужна одна.
+
+    Атрибуты:
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        area: Количество ячеек поля.
+        typecode: Код типа array, в котором помещаются номера ячеек поля.
+        center: Центральная ячейка поля - стартовая позиция змейки.
+        walls: Карта стен - байт на ячейку, 1 - стена, или None, если
+            стен нет.
+        occupancy: Словарь с количеством объектов в каждой занятой ячейке.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        width: int = GRID_WIDTH,
+        height: int = GRID_HEIGHT,
+        walls: Optional[bytes] = None
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.area = width * height
+        self.typecode = 'i' if self.area < 1 << 31 else 'q'
+        self.center = self.cell(width // 2, height // 2)
+        self.occupancy = {}
+        self.build_walls(walls)
+
+    def __len__(self) -> int:
+        """Возвращает количество свободных ячеек."""
+        return self.area - len(self.occupancy)
+
+    def __contains__(self, cell: int) -> bool:
+        """Проверяет, свободна ли ячейка."""
+        return 0 <= cell < self.area and cell not in self.occupancy
+
+    def cell_set(self) -> Union[CellSet, set[int]]:
+        """Возвращает пустое множество ячеек, подходящее для этого поля."""
+        return set()
+
+    def restore(self, other: 'FreeCells') -> None:
+        """Копирует в индекс состояние другого индекса того же поля.
+
+        Параметры:
+            other: Индекс, состояние которого копируется.
+        """
+        self.width = other.width
+        self.height = other.height
+        self.area = other.area
+        self.typecode = other.typecode
+        self.center = other.center
+        self.walls = other.walls
+        self.occupancy = other.occupancy.copy()
+
+    def occupy(self, cell: int) -> None:
+        """Отмечает ячейку занятой.
+
+        Параметры:
+            cell: Номер ячейки.
+        """
+        self.occupancy[cell] = self.occupancy.get(cell, 0) + 1
+
+    def release(self, cell: int) -> None:
+        """Освобождает ячейку, занятую одним объектом.
+
+        Параметры:
+            cell: Номер ячейки.
+        """
+        count = self.occupancy.pop(cell)
+        if count > 1:
+            self.occupancy[cell] = count - 1
+
+    def choice(self, rng: Random) -> Optional[int]:
+        """Возвращает случайную свободную ячейку или None, если поле
+        заполнено.
+
+        Параметры:
+            rng: Генератор случайных чисел игры.
+        """
+        if not len(self):
+            return None
+        while True:
+            cell = rng.randrange(self.area)
+            if cell not in self.occupancy:
+                return cell
+
+
+class GameObject:
+    """Базовый класс для игровых объектов.
+
+    Атрибуты:
+        position: Ячейка объекта на игровом поле.
+        body_color: Цвет объекта.
+    """
+
+    __slots__ = ('position', 'body_color')
+
+    def __init__(
+        self,
+        body_color: Optional[tuple[int, ...]] = None,
+        position: int = CENTER_CELL
+    ) -> None:
+        self.position = position
+        self.body_color = body_color
+
+    def restore(self, other: 'GameObject') -> None:
+        """Копирует в объект состояние другого объекта.
+
+        Связи с индексом свободных ячеек и генератором случайных чисел не
+        копируются: их восстанавливает GameState.
+
+        Параметры:
+            other: Объект, состояние которого копируется.
+        """
+        self.position = other.position
+        self.body_color = other.body_color
+
+
+class Snake(GameObject):
+    """Класс для представления объекта "Змейка".
+
+    Тело змейки хранится в кольцевом буфере array, ёмкость которого -
+    степень двойки. Голова находится в элементе head_index, а остальные
+    сегменты - в предыдущих элементах буфера. При заполнении буфер
+    удваивается.
+
+    Атрибуты:
+        length: Длина объекта "Змейка".
+        positions: Список ячеек всех сегментов тела объекта "Змейка",
+            начиная с головы. Создаётся при каждом обращении.
+        body: Кольцевой буфер с ячейками сегментов тела.
+        head_index: Индекс головы в буфере body.
+        size: Количество сегментов тела.
+        occupied: Множество ячеек, занятых телом объекта "Змейка".
+            Поддерживается синхронно с телом, чтобы проверка столкновения
+            выполнялась за O(1).
+        free_cells: Индекс свободных ячеек игрового поля, общий для змейки
+            и продуктов.
+        rng: Генератор случайных чисел игры, общий для змейки и продуктов.
+        direction: Направление движения объекта "Змейка".
+        speed: Скорость движения объекта "Змейка".
+        max_length: Максимальная величина объекта "Змейка" за игру.
+        max_length_speed: Скорость объекта "Змейка" на момент достижения
+            максимальной длины.
+        last: Ячейка последнего сегмента объекта "Змейка".
+        reset_situation: Проверка сброса объекта "Змейка".
+    """
+
+    __slots__ = (
+        'free_cells', 'rng', 'body', 'head_index', 'size', 'occupied',
+        'length', 'direction', 'speed', 'max_length', 'max_length_speed',
+        'last', 'reset_situation'
+    )
+
+    MIN_SNAKE_SPEED = 5
+    MAX_SNAKE_SPEED = 30
+
+    def __init__(
+        self,
+        body_color: Optional[tuple[int, ...]] = None,
+        free_cells: Optional[FreeCells] = None,
+        rng: Optional[Random] = None
+    ) -> None:
+        super().__init__(body_color)
+        if free_cells is None:
+            free_cells = FreeCells()
+        self.free_cells = free_cells
+        self.rng = rng if rng else GameRandom()
+        self.position = self.free_cells.center
+        self.size = 0
+        self.reset()
+        self.speed = self.MIN_SNAKE_SPEED
+        self.max_length = self.length
+        self.max_length_speed = self.speed
+
+    def reset(self) -> None:
+        """Сбрасывает объект "Змейка" в начальное состояние."""
+        self.length = 1
+        self.positions = (self.position,)
+        self.direction = self.rng.choice((UP, DOWN, RIGHT, LEFT))
+        self.last = None
+        self.reset_situation = False
+
+    @property
+    def positions(self) -> list[int]:
+        """Возвращает ячейки сегментов тела объекта "Змейка"."""
+        mask = len(self.body) - 1
+        return [
+            self.body[(self.head_index - index) & mask]
+            for index in range(self.size)
+        ]
+
+    @positions.setter
+    def positions(self, positions: Iterable[int]) -> None:
+        """Устанавливает ячейки сегментов и перестраивает множество занятых
+        ячеек.
+
+        Параметры:
+            positions: Ячейки сегментов тела, начиная с головы.
+        """
+        if self.size:
+            for position in self.positions:
+                self.free_cells.release(position)
+        positions = list(positions)
+        self.size = len(positions)
+        capacity = max(MIN_BODY_CAPACITY, 1 << (self.size - 1).bit_length())
+        self.body = array(self.free_cells.typecode, reversed(positions))
+        self.body.extend(bytes(capacity - self.size))
+        self.head_index = self.size - 1
+        self.occupied = self.free_cells.cell_set()
+        for position in positions:
+            self.occupied.add(position)
+            self.free_cells.occupy(position)
+
+    def get_head_position(self) -> int:
+        """Возвращает ячейку головы объекта "Змейка"."""
+        return self.body[self.head_index]
+
+    def get_tail_position(self) -> int:
+        """Возвращает ячейку хвоста объекта "Змейка"."""
+        tail_index = self.head_index - self.size + 1
+        return self.body[tail_index & (len(self.body) - 1)]
+
+    def grow_body(self) -> None:
+        """Удваивает ёмкость кольцевого буфера тела."""
+        body = array(self.free_cells.typecode, reversed(self.positions))
+        body.extend(bytes(len(body)))
+        self.body = body
+        self.head_index = self.size - 1
+
+    def restore(self, other: 'Snake') -> None:
+        """Копирует в объект "Змейка" состояние другой змейки.
+
+        Параметры:
+            other: Змейка, состояние которой копируется.
+        """
+        super().restore(other)
+        self.body = other.body[:]
+        self.head_index = other.head_index
+        self.size = other.size
+        self.occupied = other.occupied.copy()
+        self.length = other.length
+        self.direction = other.direction
+        self.speed = other.speed
+        self.max_length = other.max_length
+        self.max_length_speed = other.max_length_speed
+        self.last = other.last
+        self.reset_situation = other.reset_situation
+
+    def move(self) -> None:
+        """Обновляет позицию объекта "Змейка"."""
+        free_cells = self.free_cells
+        body = self.body
+        # Вычисления FreeCells.neighbor выполняются на месте: move - самый
+        # частый вызов игры.
+        width = free_cells.width
+        y, x = divmod(body[self.head_index], width)
+        next_head_position = (
+            (y + self.direction[1]) % free_cells.height * width
+            + (x + self.direction[0]) % width
+        )
+        walls = free_cells.walls
+        if next_head_position in self.occupied or (
+            walls is not None and walls[next_head_position]
+        ):
+            self.reset_situation = True
+        else:
+            if self.size == len(body):
+                self.grow_body()
+                body = self.body
+            self.head_index = (self.head_index + 1) & (len(body) - 1)
+            body[self.head_index] = next_head_position
+            self.size += 1
+            self.occupied.add(next_head_position)
+            free_cells.occupy(next_head_position)
+        if self.size > self.length:
+            self.size -= 1
+            self.last = body[(self.head_index - self.size) & (len(body) - 1)]
+            self.occupied.discard(self.last)
+            free_cells.release(self.last)
+
+    def facing_wall(self) -> bool:
+        """Проверяет, находится ли перед головой стена уровня."""
+        walls = self.free_cells.walls
+        return walls is not None and bool(walls[self.free_cells.neighbor(
+            self.get_head_position(), self.direction
+        )])
+
+    def update_direction(self, new_direction: tuple[int, ...]) -> None:
+        """Обновляет направление движения объекта "Змейка".
+
+        Параметры:
+            new_direction: Новое направление движения объекта "Змейка".
+        """
+        self.direction = new_direction
+
+    def update_speed(self, acceleration: int) -> bool:
+        """Обновляет скорость движения объекта "Змейка".
+
+        Параметры:
+            acceleration: Ускорение движения объекта "Змейка".
+
+        Возвращает True, если скорость изменилась.
+        """
+        if not (
+            self.MIN_SNAKE_SPEED
+            <= self.speed + acceleration
+            <= self.MAX_SNAKE_SPEED
+        ):
+            return False
+        self.speed = self.speed + acceleration
+        return True
+
+    def increase_length(self) -> bool:
+        """Увеличивает длину объекта "Змейка".
+
+        Возвращает True, если достигнута новая максимальная длина.
+        """
+        self.length += 1
+        if self.length <= self.max_length:
+            return False
+        self.max_length = self.length
+        self.max_length_speed = self.speed
+        return True
+
+
+class Apple(GameObject):
+    """Класс для представления объекта "Яблоко".
+
+    Атрибуты:
+        free_cells: Индекс свободных ячеек игрового поля. Если индекс не
+            передан, то создаётся новый, в котором занята центральная
+            ячейка - стартовая позиция змейки.
+        rng: Генератор случайных чисел игры.
+    """
+
+    __slots__ = ('free_cells', 'rng', '_position')
+
+    def __init__(
+        self,
+        free_cells: Optional[FreeCells] = None,
+        body_color: Optional[tuple[int, ...]] = None,
+        rng: Optional[Random] = None
+    ) -> None:
+        if free_cells is None:
+            free_cells = FreeCells()
+            free_cells.occupy(free_cells.center)
+        self.free_cells = free_cells
+        self.rng = rng if rng else GameRandom()
+        super().__init__(body_color, free_cells.center)
+        self.randomize_position()
+
+    @property
+    def position(self) -> int:
+        """Возвращает ячейку объекта-продукта."""
+        return self._position
+
+    @position.setter
+    def position(self, position: int) -> None:
+        """Перемещает объект-продукт и обновляет индекс свободных ячеек.
+
+        Параметры:
+            position: Новая ячейка объекта-продукта.
+        """
+        if hasattr(self, '_position'):
+            self.free_cells.release(self._position)
+        self._position = position
+        self.free_cells.occupy(position)
+
+    def restore(self, other: 'Apple') -> None:
+        """Копирует в объект-продукт состояние другого продукта.
+
+        Индекс свободных ячеек при этом не меняется: продукт уже учтён в
+        восстановленном индексе.
+
+        Параметры:
+            other: Продукт, состояние которого копируется.
+        """
+        self._position = other._position
+        self.body_color = other.body_color
+
+    def randomize_position(self) -> bool:
+        """Устанавливает случайное положение объекта-продукта на игровом поле.
+
+        Возвращает False, если свободных ячеек не осталось.
+        """
+        position = self.free_cells.choice(self.rng)
+        if position is None:
+            return False
+        self.position = position
+        return True
+
+
+class WrongProduct(Apple):
+    """Класс для представления объекта "Неправильный продукт"."""
+
+    __slots__ = ()
+
+
+class GameState:
+    """Класс для представления состояния игры "Змейка" без отрисовки.
+
+    Все случайные решения игры (направление змейки после сброса и позиции
+    продуктов) принимает один генератор случайных чисел, поэтому игра
+    полностью определяется сидом и действиями игрока.
+
+    Объекты, не переданные в конструктор, создаются с генератором
+    GameRandom(seed) в порядке: змейка, яблоко, неправильный продукт.
+    Переданные объекты должны быть созданы так же, иначе игру нельзя будет
+    воспроизвести по сиду. Размер поля в ячейках (width и height) и карта
+    стен уровня (walls) используются только для создания змейки; размер
+    поля не зависит от размера окна.
+
+    Атрибуты:
+        seed: Сид генератора случайных чисел игры. По умолчанию выбирается
+            случайно.
+        snake: Объект "Змейка".
+        apple: Объект "Яблоко".
+        wrong_product: Объект "Неправильный продукт".
+        ticks: Количество прошедших тиков игры.
+    """
+
+    __slots__ = ('seed', 'snake', 'apple', 'wrong_product', 'ticks')
+
+    def __init__(
+        self,
+        snake: Optional[Snake] = None,
+        apple: Optional[Apple] = None,
+        wrong_product: Optional[WrongProduct] = None,
+        seed: Optional[int] = None,
+        width: int = GRID_WIDTH,
+        height: int = GRID_HEIGHT,
+        walls: Optional[bytes] = None
+    ) -> None:
+        self.seed = seed if seed is not None else getrandbits(SEED_BITS)
+        self.snake = snake if snake else Snake(
+            free_cells=FreeCells.for_board(width, height, walls),
+            rng=GameRandom(self.seed)
+        )
+        rng = self.snake.rng
+        self.apple = apple if apple else Apple(self.snake.free_cells, rng=rng)
+        self.wrong_product = (
+            wrong_product if wrong_product
+            else WrongProduct(self.snake.free_cells, rng=rng)
+        )
+        self.ticks = 0
+
+    def clone(self) -> 'GameState':
+        """Возвращает независимую копию игры.
+
+        Объекты копии - классы этого модуля, даже если игра отрисовывается
+        модулем `the_snake`, поэтому копия не обращается к pygame. Буферы
+        змейки и индекса свободных ячеек копируются целиком, а генератор
+        случайных чисел - одним числом состояния.
+        """
+        free_cells = self.snake.free_cells.copy()
+        rng = copy(self.snake.rng)
+        clone = GameState.__new__(GameState)
+        clone.seed = self.seed
+        clone.ticks = self.ticks
+        clone.snake = Snake.__new__(Snake)
+        clone.apple = Apple.__new__(Apple)
+        clone.wrong_product = WrongProduct.__new__(WrongProduct)
+        for game_object, original in (
+            (clone.snake, self.snake),
+            (clone.apple, self.apple),
+            (clone.wrong_product, self.wrong_product)
+        ):
+            game_object.free_cells = free_cells
+            game_object.rng = rng
+            game_object.restore(original)
+        return clone
+
+    def snapshot(self) -> 'GameState':
+        """Возвращает снимок состояния игры для метода restore.
+
+        Снимок - клон игры, его можно восстанавливать многократно.
+        """
+        return self.clone()
+
+    def restore(self, snapshot: 'GameState') -> None:
+        """Восстанавливает состояние игры из снимка.
+
+        Объекты игры сохраняются, меняется только их состояние, поэтому
+        игру, отрисовываемую модулем `the_snake`, можно откатить на месте.
+
+        Параметры:
+            snapshot: Снимок, который вернул метод snapshot или clone.
+        """
+        self.snake.free_cells.restore(snapshot.snake.free_cells)
+        self.snake.rng.setstate(snapshot.snake.rng.getstate())
+        self.snake.restore(snapshot.snake)
+        self.apple.restore(snapshot.apple)
+        self.wrong_product.restore(snapshot.wrong_product)
+        self.seed = snapshot.seed
+        self.ticks = snapshot.ticks
+
+    def step(
+        self,
+        action: Optional[tuple[int, ...]] = None
+    ) -> tuple[list[str], 'GameState']:
+        """Продвигает игру на один тик.
+
+        Параметры:
+            action: Новое направление движения объекта "Змейка". Если
+                направление не является допустимым поворотом, то змейка
+                продолжает движение в текущем направлении.
+
+        Возвращает список произошедших за тик событий и состояние игры.
+        """
+        snake = self.snake
+        if action in TURNS[snake.direction]:
+            snake.update_direction(action)
+        snake.move()
+        self.ticks += 1
+        events = []
+        if snake.reset_situation:
+            events.append(
+                WALL_COLLISION if snake.facing_wall() else SELF_COLLISION
+            )
+            snake.reset()
+        elif snake.get_head_position() == self.apple.position:
+            snake.increase_length()
+            events.append(APPLE_EATEN)
+            if not self.apple.randomize_position():
+                events.append(BOARD_FULL)
+                snake.reset()
+                self.apple.randomize_position()
+        elif snake.get_head_position() == self.wrong_product.position:
+            snake.reset()
+            self.wrong_product.randomize_position()
+            events.append(WRONG_PRODUCT_EATEN)
+        return events, self
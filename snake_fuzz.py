@@ -0,0 +1,362 @@
+"""Модуль содержит фаззинг правил игры "Змейка" без графики.
+
+Игры симулируются (модуль `snake_engine`) на полях разного размера со
+случайным и враждебным вводом: повороты назад, повторы, тесные спирали,
+частые изменения скорости. Ввод - последовательность кодов ACTIONS, по
+коду на тик. После каждого тика проверяются инварианты:
+    - сегменты змейки не повторяются: занятых ячеек столько же, сколько
+        сегментов, а сегментов - длина змейки (или на один меньше на тике,
+        когда змейка съела яблоко и ещё не выросла);
+    - продукты не появляются на змейке и друг на друге. Исключение -
+        тик сброса: змейка появляется в центре поля, даже если там лежит
+        продукт. Это правило игры: продукт остаётся на месте, и змейка
+        уходит с него на следующем тике;
+    - голова остаётся на поле и сдвигается на одну ячейку с проходом
+        сквозь край поля, а после сброса стоит в центре поля;
+    - максимальная длина не уменьшается, скорость не выходит за пределы.
+Проверки после тика выполняются за O(1). Раз в FULL_CHECK_PERIOD тиков
+и в конце игры тело змейки сверяется с множеством занятых ячеек и
+индексом свободных ячеек целиком.
+
+Игры распределяются по пулу процессов пачками сидов. Игра определяется
+сидом, поэтому нарушение воспроизводится по сиду, размеру поля и вводу.
+Ввод нарушения сокращается до минимального: коды заменяются
+продолжением движения и удаляются куски ввода, пока нарушение
+сохраняется.
+
+Запуск:
+    python snake_fuzz.py --games 1000 --ticks 10000
+"""
+from math import ceil
+from random import Random
+from typing import Callable, Iterable, Optional
+import argparse
+import os
+import sys
+
+from snake_engine import (
+    BOARD_FULL, DOWN, GRID_HEIGHT, GRID_WIDTH, LEFT, RIGHT, SELF_COLLISION,
+    UP, WALL_COLLISION, WRONG_PRODUCT_EATEN, GameState, Snake
+)
+
+# Коды ввода: продолжение движения, повороты, ускорение и замедление.
+ACTIONS = (None, UP, DOWN, LEFT, RIGHT)
+SPEED_UP = len(ACTIONS)
+SPEED_DOWN = SPEED_UP + 1
+CODES = SPEED_DOWN + 1
+# Размеры полей: на маленьких полях чаще столкновения и заполнение поля.
+BOARD_SIZES = ((3, 3), (4, 4), (5, 3), (8, 6), (GRID_WIDTH, GRID_HEIGHT))
+# Режимы ввода: веса кодов ACTIONS, SPEED_UP и SPEED_DOWN.
+INPUT_WEIGHTS = (
+    # Случайный ввод.
+    (4, 1, 1, 1, 1, 1, 1),
+    # Частые повороты назад и повторы.
+    (1, 3, 3, 3, 3, 0, 0),
+    # Редкие повороты и частые изменения скорости.
+    (8, 1, 1, 1, 1, 4, 4),
+)
+# Тесная спираль по часовой стрелке: змейка врезается в себя.
+SPIRAL = bytes(ACTIONS.index(direction) for direction in (UP, RIGHT, DOWN,
+                                                          LEFT))
+RESET_EVENTS = {
+    SELF_COLLISION, WALL_COLLISION, WRONG_PRODUCT_EATEN, BOARD_FULL
+}
+# Период полной сверки тела змейки в тиках.
+FULL_CHECK_PERIOD = 4096
+DEFAULT_TICKS = 10_000
+DEFAULT_GAMES = 100
+
+# Нарушение: сид, ширина и высота поля, сокращённый ввод и описание.
+Failure = tuple[int, int, int, bytes, str]
+
+
+def generate_input(seed: int, ticks: int) -> bytes:
+    """Возвращает ввод игры: режим ввода выбирается по сиду.
+
+    Параметры:
+        seed: Сид игры.
+        ticks: Количество тиков.
+    """
+    rng = Random(seed)
+    mode = seed % (len(INPUT_WEIGHTS) + 1)
+    if mode == len(INPUT_WEIGHTS):
+        actions = bytearray()
+        while len(actions) < ticks:
+            actions += SPIRAL[rng.randrange(len(SPIRAL)):]
+            actions += bytes(rng.randrange(3))
+        return bytes(actions[:ticks])
+    return bytes(rng.choices(range(CODES), INPUT_WEIGHTS[mode], k=ticks))
+
+
+def board_size(seed: int) -> tuple[int, int]:
+    """Возвращает размер поля игры по её сиду.
+
+    Параметры:
+        seed: Сид игры.
+    """
+    return BOARD_SIZES[seed // (len(INPUT_WEIGHTS) + 1) % len(BOARD_SIZES)]
+
+
+def check_tick(
+    game: GameState,
+    events: list[str],
+    previous_head: int,
+    previous_max_length: int
+) -> Optional[str]:
+    """Проверяет инварианты после тика за O(1).
+
+    Параметры:
+        game: Состояние игры.
+        events: События тика.
+        previous_head: Ячейка головы до тика.
+        previous_max_length: Максимальная длина до тика.
+
+    Возвращает описание нарушения или None.
+    """
+    snake = game.snake
+    free_cells = snake.free_cells
+    head = snake.get_head_position()
+    if not 0 <= head < free_cells.area:
+        return f'Голова {head} за пределами поля.'
+    reset = not RESET_EVENTS.isdisjoint(events)
+    if not reset and head != free_cells.neighbor(
+        previous_head, snake.direction
+    ):
+        return f'Голова сдвинулась из {previous_head} в {head}.'
+    if reset and (head != free_cells.center or snake.size != 1):
+        return 'Змейка не сброшена в центр поля.'
+    if len(snake.occupied) != snake.size or not (
+        snake.length - 1 <= snake.size <= snake.length
+    ):
+        return (
+            f'Длина {snake.length}, сегментов {snake.size}, занятых ячеек '
+            f'{len(snake.occupied)}.'
+        )
+    for product in (game.apple, game.wrong_product):
+        if product.position in snake.occupied and not reset:
+            return f'Продукт в ячейке {product.position} лежит на змейке.'
+    if game.apple.position == game.wrong_product.position:
+        return 'Продукты лежат в одной ячейке.'
+    if snake.max_length < max(previous_max_length, snake.length):
+        return f'Максимальная длина уменьшилась до {snake.max_length}.'
+    if not Snake.MIN_SNAKE_SPEED <= snake.speed <= Snake.MAX_SNAKE_SPEED:
+        return f'Скорость {snake.speed} вне допустимых пределов.'
+    return None
+
+
+def check_board(game: GameState) -> Optional[str]:
+    """Сверяет тело змейки с занятыми и свободными ячейками за O(длины).
+
+    Параметры:
+        game: Состояние игры.
+
+    Возвращает описание нарушения или None.
+    """
+    snake = game.snake
+    positions = snake.positions
+    occupied = set(positions)
+    if len(occupied) != len(positions):
+        return 'Сегменты змейки повторяются.'
+    if any(cell not in snake.occupied for cell in occupied):
+        return 'Множество занятых ячеек не совпадает с телом змейки.'
+    occupied.update((game.apple.position, game.wrong_product.position))
+    free_cells = snake.free_cells
+    if len(free_cells) != free_cells.area - len(occupied):
+        return (
+            f'Свободных ячеек {len(free_cells)}, а должно быть '
+            f'{free_cells.area - len(occupied)}.'
+        )
+    return None
+
+
+def play_input(
+    seed: int,
+    width: int,
+    height: int,
+    actions: bytes
+) -> Optional[tuple[int, str]]:
+    """Играет игру с заданным вводом и проверяет инварианты.
+
+    Параметры:
+        seed: Сид игры.
+        width: Ширина поля в ячейках.
+        height: Высота поля в ячейках.
+        actions: Ввод - коды ACTIONS, SPEED_UP и SPEED_DOWN по одному на
+            тик.
+
+    Возвращает номер тика и описание первого нарушения или None.
+    """
+    game = GameState(seed=seed, width=width, height=height)
+    snake = game.snake
+    step = game.step
+    for tick, code in enumerate(actions):
+        if code >= SPEED_UP:
+            snake.update_speed(1 if code == SPEED_UP else -1)
+            code = 0
+        head = snake.get_head_position()
+        max_length = snake.max_length
+        events, _ = step(ACTIONS[code])
+        message = check_tick(game, events, head, max_length)
+        if message is None and (tick + 1) % FULL_CHECK_PERIOD == 0:
+            message = check_board(game)
+        if message is not None:
+            return tick, message
+    message = check_board(game)
+    return None if message is None else (len(actions) - 1, message)
+
+
+def shrink(actions: bytes, fails: Callable[[bytes], bool]) -> bytes:
+    """Сокращает ввод, сохраняя нарушение.
+
+    Сначала коды по одному заменяются продолжением движения, затем
+    удаляются куски ввода, начиная с половины и уменьшая размер куска до
+    одного кода. Замены идут первыми: они могут вызвать нарушение
+    раньше, и тогда удаление отрежет лишний конец ввода. Результат - ввод,
+    из которого нельзя удалить ни одного кода без исчезновения нарушения.
+
+    Параметры:
+        actions: Ввод, на котором нарушение воспроизводится.
+        fails: Проверка того, что нарушение воспроизводится на вводе.
+    """
+    for index, code in enumerate(actions):
+        if code:
+            candidate = actions[:index] + b'\0' + actions[index + 1:]
+            if fails(candidate):
+                actions = candidate
+    chunk = len(actions) // 2
+    while chunk:
+        start = 0
+        size = len(actions)
+        while start < len(actions):
+            candidate = actions[:start] + actions[start + chunk:]
+            if fails(candidate):
+                actions = candidate
+            else:
+                start += chunk
+        # Удаление одного кода может сделать лишним уже проверенный код,
+        # поэтому проход по одному коду повторяется, пока ввод сокращается.
+        if chunk > 1 or len(actions) == size:
+            chunk //= 2
+    return actions
+
+
+def fuzz_game(seed: int, ticks: int) -> Optional[Failure]:
+    """Играет одну игру и сокращает ввод нарушения, если оно найдено.
+
+    Параметры:
+        seed: Сид игры.
+        ticks: Количество тиков.
+    """
+    width, height = board_size(seed)
+    actions = generate_input(seed, ticks)
+    failure = play_input(seed, width, height, actions)
+    if failure is None:
+        return None
+    tick, message = failure
+    actions = shrink(
+        actions[:tick + 1],
+        lambda candidate: play_input(seed, width, height, candidate)
+        is not None
+    )
+    return seed, width, height, actions, message
+
+
+def fuzz_games(seeds: Iterable[int], ticks: int) -> list[Failure]:
+    """Играет пачку игр в процессе пула.
+
+    Параметры:
+        seeds: Сиды игр.
+        ticks: Количество тиков в одной игре.
+
+    Возвращает найденные нарушения.
+    """
+    return [
+        failure for failure in (fuzz_game(seed, ticks) for seed in seeds)
+        if failure is not None
+    ]
+
+
+def run_fuzz(
+    games: int = DEFAULT_GAMES,
+    ticks: int = DEFAULT_TICKS,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> list[Failure]:
+    """Играет игры со случайным вводом в пуле процессов.
+
+    Параметры:
+        games: Количество игр.
+        ticks: Количество тиков в одной игре.
+        seed: Сид первой игры, следующие игры получают seed + 1, seed + 2
+            и так далее.
+        workers: Количество процессов пула. По умолчанию - количество ядер.
+        batch_size: Количество игр в одной задаче процесса.
+
+    Возвращает найденные нарушения.
+    """
+    # Пул процессов импортируется здесь: его импорт дороже импорта
+    # остальных модулей игры.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers if workers else os.cpu_count() or 1
+    if not batch_size:
+        batch_size = max(1, ceil(games / (workers * 4)))
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(
+                fuzz_games,
+                range(start, min(start + batch_size, seed + games)),
+                ticks
+            )
+            for start in range(seed, seed + games, batch_size)
+        ]
+        return [
+            failure for future in futures for failure in future.result()
+        ]
+
+
+def format_failure(failure: Failure) -> str:
+    """Возвращает описание нарушения для воспроизведения.
+
+    Параметры:
+        failure: Нарушение.
+    """
+    seed, width, height, actions, message = failure
+    return (
+        f'сид {seed}, поле {width}x{height}, ввод {list(actions)}: '
+        f'{message}'
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Запускает фаззинг и выводит найденные нарушения.
+
+    Если нарушения найдены, то программа завершается с кодом 1.
+
+    Параметры:
+        argv: Аргументы командной строки.
+    """
+    parser = argparse.ArgumentParser(
+        description='Фаззинг правил игры "Змейка".'
+    )
+    parser.add_argument(
+        '--games', type=int, default=DEFAULT_GAMES, help='количество игр'
+    )
+    parser.add_argument(
+        '--ticks', type=int, default=DEFAULT_TICKS,
+        help='количество тиков в одной игре'
+    )
+    parser.add_argument('--seed', type=int, default=0, help='сид первой игры')
+    parser.add_argument('--workers', type=int, help='количество процессов')
+    args = parser.parse_args(argv)
+    failures = run_fuzz(args.games, args.ticks, args.seed, args.workers)
+    for failure in failures:
+        print(format_failure(failure))
+    print(f'Тиков: {args.games * args.ticks}, нарушений: {len(failures)}.')
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
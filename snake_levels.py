@@ -0,0 +1,109 @@
+"""Модуль содержит загрузку уровней игры "Змейка" со стенами.
+
+Уровень - карта стен поля. Карта задаётся текстовым файлом или картинкой
+PNG:
+    - в текстовом файле строка файла - строка поля, символ WALL_CHAR -
+        стена, любой другой символ - пустая ячейка. Короткие строки
+        дополняются пустыми ячейками до ширины самой длинной строки;
+    - в картинке пиксель - ячейка, пиксель с яркостью меньше
+        WALL_BRIGHTNESS - стена.
+
+При загрузке карта компилируется в bytes с байтом на ячейку поля
+(1 - стена), поэтому проверка стены - одно обращение по номеру ячейки.
+Загруженные уровни кэшируются по пути к файлу: карта неизменяемая, и
+один уровень можно использовать в нескольких играх.
+
+Центр поля - стартовая позиция змейки - не может быть стеной: это
+проверяется при создании индекса свободных ячеек с картой стен
+(см. FreeCells.build_walls).
+"""
+from functools import lru_cache
+import os
+
+WALL_CHAR = '#'
+# Пиксели картинки темнее этой яркости (0-255) считаются стенами.
+WALL_BRIGHTNESS = 128
+# Количество уровней, которые хранит кэш загрузки.
+LEVEL_CACHE_SIZE = 32
+IMAGE_EXTENSIONS = ('.png',)
+
+
+class Level:
+    """Класс для представления уровня - карты стен игрового поля.
+
+    Атрибуты:
+        name: Имя уровня.
+        width: Ширина поля в ячейках.
+        height: Высота поля в ячейках.
+        walls: Карта стен - байт на ячейку, 1 - стена.
+    """
+
+    __slots__ = ('name', 'width', 'height', 'walls')
+
+    def __init__(
+        self,
+        name: str,
+        width: int,
+        height: int,
+        walls: bytes
+    ) -> None:
+        if not width or not height:
+            raise ValueError(f'Уровень {name} не содержит ячеек.')
+        if len(walls) != width * height:
+            raise ValueError(
+                f'Размер карты стен уровня {name} не совпадает с полем.'
+            )
+        self.name = name
+        self.width = width
+        self.height = height
+        self.walls = walls
+
+
+def parse_level(text: str, name: str = '') -> Level:
+    """Компилирует текстовую карту в уровень.
+
+    Параметры:
+        text: Текст карты.
+        name: Имя уровня.
+    """
+    rows = text.splitlines()
+    width = max(map(len, rows), default=0)
+    walls = bytearray()
+    for row in rows:
+        walls += bytes(char == WALL_CHAR for char in row.ljust(width))
+    return Level(name, width, len(rows), bytes(walls))
+
+
+def parse_level_image(path: str) -> Level:
+    """Компилирует картинку в уровень.
+
+    Параметры:
+        path: Путь к картинке.
+    """
+    # pygame нужен только для картинок: текстовые уровни и игры без
+    # графики его не импортируют.
+    import pygame as pg
+
+    image = pg.image.load(path)
+    width, height = image.get_size()
+    pixels = pg.image.tobytes(image, 'RGB')
+    walls = bytes(
+        sum(pixels[index:index + 3]) < 3 * WALL_BRIGHTNESS
+        for index in range(0, len(pixels), 3)
+    )
+    return Level(os.path.basename(path), width, height, walls)
+
+
+@lru_cache(maxsize=LEVEL_CACHE_SIZE)
+def load_level(path: str) -> Level:
+    """Загружает уровень из текстового файла или картинки.
+
+    Повторная загрузка того же пути возвращает уровень из кэша.
+
+    Параметры:
+        path: Путь к файлу уровня.
+    """
+    if path.lower().endswith(IMAGE_EXTENSIONS):
+        return parse_level_image(path)
+    with open(path, encoding='utf-8') as file:
+        return parse_level(file.read(), os.path.basename(path))
@@ -0,0 +1,207 @@
+"""Модуль содержит кодирование состояния игры "Змейка" в тензор NumPy.
+
+Наблюдение - массив uint8 формы (C, height, width): в каждом канале
+отмечены ячейки тела змейки, головы, яблока и неправильного продукта, а в
+каналах направлений (если они включены) - ячейка головы в канале текущего
+направления движения.
+
+Массив выделяется один раз и после каждого тика обновляется только в
+изменившихся ячейках: новая голова, освободившийся хвост (Snake.last) и
+переместившиеся продукты. Поэтому обновление занимает O(1) и не выделяет
+памяти. Только после сброса змейки массив строится заново.
+
+Для окрестности головы массив хранится с отступом crop_radius ячеек, в
+котором повторяются ячейки с противоположного края поля (поле замкнуто).
+Поэтому окрестность - это срез массива, а не копия.
+"""
+import numpy as np
+
+from snake_engine import (
+    BOARD_FULL, DOWN, LEFT, RIGHT, SELF_COLLISION, UP, WALL_COLLISION,
+    WRONG_PRODUCT_EATEN, GameState
+)
+
+# Номера каналов наблюдения.
+BODY = 0
+HEAD = 1
+APPLE = 2
+WRONG_PRODUCT = 3
+# Каналы направлений движения идут после основных каналов в этом порядке.
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+BASE_CHANNELS = 4
+# События, после которых змейка сброшена и наблюдение строится заново.
+RESET_EVENTS = {
+    SELF_COLLISION, WALL_COLLISION, WRONG_PRODUCT_EATEN, BOARD_FULL
+}
+
+
+class ObservationEncoder:
+    """Класс для пошагового кодирования игры в тензор наблюдения.
+
+    Атрибуты:
+        game: Игра, которую кодирует наблюдение.
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        crop_radius: Радиус окрестности головы в ячейках.
+        directions: Признак каналов направлений движения.
+        padded: Массив наблюдения с отступом crop_radius по краям.
+        cells: Одномерное представление memoryview массива padded.
+        plane_size: Количество ячеек канала массива padded.
+        rows: Смещения копий строки поля в канале массива padded.
+        columns: Индексы копий столбца поля в массиве padded.
+        observation: Представление наблюдения только для чтения, форма
+            (C, height, width).
+        head: Ячейка головы в наблюдении.
+        direction: Канал направления, в котором отмечена голова.
+        apple: Ячейка яблока в наблюдении.
+        wrong_product: Ячейка неправильного продукта в наблюдении.
+    """
+
+    def __init__(
+        self,
+        game: GameState,
+        crop_radius: int = 0,
+        directions: bool = False
+    ) -> None:
+        free_cells = game.snake.free_cells
+        if not 0 <= crop_radius <= min(free_cells.width, free_cells.height):
+            raise ValueError(
+                'Радиус окрестности должен быть от 0 до меньшей стороны '
+                'поля.'
+            )
+        self.game = game
+        self.width = free_cells.width
+        self.height = free_cells.height
+        self.crop_radius = crop_radius
+        self.directions = directions
+        channels = BASE_CHANNELS + (len(DIRECTIONS) if directions else 0)
+        self.padded = np.zeros(
+            (
+                channels,
+                self.height + 2 * crop_radius,
+                self.width + 2 * crop_radius
+            ),
+            dtype=np.uint8
+        )
+        self.observation = self.padded[
+            :,
+            crop_radius:crop_radius + self.height,
+            crop_radius:crop_radius + self.width
+        ]
+        self.observation.flags.writeable = False
+        # Запись отдельных ячеек через memoryview в разы быстрее
+        # индексации массива NumPy. Копии строк и столбцов в отступе
+        # вычисляются заранее.
+        self.cells = memoryview(self.padded).cast('B')
+        padded_width = self.padded.shape[2]
+        self.plane_size = self.padded.shape[1] * padded_width
+        self.rows = [
+            tuple(row * padded_width for row in self.copies(self.height, y))
+            for y in range(self.height)
+        ]
+        self.columns = [
+            self.copies(self.width, x) for x in range(self.width)
+        ]
+        self.rebuild()
+
+    def copies(self, size: int, coordinate: int) -> tuple[int, ...]:
+        """Возвращает индексы копий координаты в массиве с отступом.
+
+        Параметры:
+            size: Размер поля по оси.
+            coordinate: Координата ячейки по оси.
+        """
+        radius = self.crop_radius
+        return tuple(
+            index
+            for index in (
+                coordinate + radius - size,
+                coordinate + radius,
+                coordinate + radius + size
+            )
+            if 0 <= index < size + 2 * radius
+        )
+
+    def set_cell(self, channel: int, cell: int, value: int) -> None:
+        """Записывает значение ячейки во все её копии.
+
+        Параметры:
+            channel: Канал наблюдения.
+            cell: Ячейка игрового поля.
+            value: Значение: 1 - ячейка отмечена, 0 - нет.
+        """
+        y, x = divmod(cell, self.width)
+        start = channel * self.plane_size
+        cells = self.cells
+        columns = self.columns[x]
+        for row in self.rows[y]:
+            for column in columns:
+                cells[start + row + column] = value
+
+    def rebuild(self) -> None:
+        """Строит наблюдение заново по состоянию игры."""
+        game = self.game
+        snake = game.snake
+        self.padded.fill(0)
+        for cell in snake.positions:
+            self.set_cell(BODY, cell, 1)
+        self.head = snake.get_head_position()
+        self.set_cell(HEAD, self.head, 1)
+        self.direction = None
+        if self.directions:
+            self.direction = BASE_CHANNELS + DIRECTIONS.index(snake.direction)
+            self.set_cell(self.direction, self.head, 1)
+        self.apple = game.apple.position
+        self.set_cell(APPLE, self.apple, 1)
+        self.wrong_product = game.wrong_product.position
+        self.set_cell(WRONG_PRODUCT, self.wrong_product, 1)
+
+    def update(self, events: list[str]) -> np.ndarray:
+        """Обновляет наблюдение после тика игры.
+
+        Параметры:
+            events: События тика, которые вернул метод GameState.step.
+
+        Возвращает наблюдение только для чтения.
+        """
+        if not RESET_EVENTS.isdisjoint(events):
+            self.rebuild()
+            return self.observation
+        game = self.game
+        snake = game.snake
+        head = snake.get_head_position()
+        if head != self.head:
+            self.set_cell(BODY, head, 1)
+            self.set_cell(HEAD, self.head, 0)
+            self.set_cell(HEAD, head, 1)
+            # Snake.last не меняется, пока змейка растёт, поэтому хвост
+            # стирается, только если его ячейка не занята телом.
+            if snake.last is not None and snake.last not in snake.occupied:
+                self.set_cell(BODY, snake.last, 0)
+        if self.directions:
+            direction = BASE_CHANNELS + DIRECTIONS.index(snake.direction)
+            self.set_cell(self.direction, self.head, 0)
+            self.set_cell(direction, head, 1)
+            self.direction = direction
+        self.head = head
+        for channel, product, position in (
+            (APPLE, 'apple', game.apple.position),
+            (WRONG_PRODUCT, 'wrong_product', game.wrong_product.position)
+        ):
+            if position != getattr(self, product):
+                self.set_cell(channel, getattr(self, product), 0)
+                self.set_cell(channel, position, 1)
+                setattr(self, product, position)
+        return self.observation
+
+    def crop(self) -> np.ndarray:
+        """Возвращает окрестность головы только для чтения.
+
+        Окрестность - срез формы (C, 2 * crop_radius + 1,
+        2 * crop_radius + 1) с головой в центре.
+        """
+        y, x = divmod(self.head, self.width)
+        size = 2 * self.crop_radius + 1
+        crop = self.padded[:, y:y + size, x:x + size]
+        crop.flags.writeable = False
+        return crop
@@ -0,0 +1,115 @@
+"""Модуль содержит профилировщик кадров игрового цикла "Змейки".
+
+Профилировщик замеряет длительность фаз каждого кадра с помощью
+perf_counter_ns и хранит замеры последних кадров в кольцевых буферах
+фиксированного размера, поэтому запись замера не выделяет новую память
+под историю.
+"""
+from array import array
+from time import perf_counter_ns
+import csv
+
+# Количество кадров, замеры которых хранит профилировщик.
+PROFILE_FRAMES = 3600
+
+
+class FrameProfiler:
+    """Класс для замера фаз кадров игрового цикла.
+
+    Атрибуты:
+        phases: Названия фаз кадра в порядке их выполнения.
+        capacity: Количество хранимых кадров.
+        samples: Словарь с кольцевым буфером длительностей (нс) для каждой
+            фазы и для кадра целиком (ключ 'frame').
+        frame_index: Индекс текущего кадра в кольцевых буферах.
+        frames: Общее количество замеренных кадров.
+    """
+
+    def __init__(
+        self,
+        phases: tuple[str, ...],
+        capacity: int = PROFILE_FRAMES
+    ) -> None:
+        self.phases = phases
+        self.capacity = capacity
+        self.samples = {
+            phase: array('q', bytes(8 * capacity))
+            for phase in (*phases, 'frame')
+        }
+        self.frame_index = 0
+        self.frames = 0
+        self.frame_start = self.phase_start = perf_counter_ns()
+
+    def mark(self, phase: str) -> None:
+        """Завершает фазу кадра и добавляет её длительность к замеру кадра.
+
+        Фаза может выполняться за кадр несколько раз (например, несколько
+        тиков игры), тогда её длительности складываются.
+
+        Параметры:
+            phase: Название завершившейся фазы.
+        """
+        now = perf_counter_ns()
+        self.samples[phase][self.frame_index] += now - self.phase_start
+        self.phase_start = now
+
+    def end_frame(self) -> None:
+        """Завершает кадр и переходит к следующему элементу буферов."""
+        now = perf_counter_ns()
+        self.samples['frame'][self.frame_index] = now - self.frame_start
+        self.frame_start = self.phase_start = now
+        self.frame_index = (self.frame_index + 1) % self.capacity
+        self.frames += 1
+        for phase in self.phases:
+            self.samples[phase][self.frame_index] = 0
+
+    def restart_frame(self) -> None:
+        """Начинает замер текущего кадра заново.
+
+        Вызывается после паузы игры, чтобы время паузы не попало в замеры.
+        """
+        self.frame_start = self.phase_start = perf_counter_ns()
+
+    def recorded(self, phase: str) -> list[int]:
+        """Возвращает записанные длительности фазы от старых к новым.
+
+        Параметры:
+            phase: Название фазы или 'frame'.
+        """
+        samples = self.samples[phase]
+        if self.frames < self.capacity:
+            return samples[:self.frames].tolist()
+        return (
+            samples[self.frame_index:] + samples[:self.frame_index]
+        ).tolist()
+
+    def stats(self, phase: str) -> tuple[float, float]:
+        """Возвращает среднюю длительность фазы и её 99-й перцентиль в мс.
+
+        Параметры:
+            phase: Название фазы или 'frame'.
+        """
+        samples = sorted(self.recorded(phase))
+        if not samples:
+            return 0.0, 0.0
+        return (
+            sum(samples) / len(samples) / 10**6,
+            samples[len(samples) * 99 // 100] / 10**6
+        )
+
+    def dump_csv(self, path: str) -> None:
+        """Сохраняет замеры хранимых кадров в CSV-файл.
+
+        Параметры:
+            path: Путь к файлу.
+        """
+        columns = (*self.phases, 'frame')
+        recorded = [self.recorded(phase) for phase in columns]
+        first_frame = self.frames - len(recorded[0])
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(('frame_number', *(
+                f'{phase}_ns' for phase in columns
+            )))
+            for offset, row in enumerate(zip(*recorded)):
+                writer.writerow((first_frame + offset, *row))
@@ -0,0 +1,152 @@
+"""Модуль содержит протокол сетевой игры на арене "Змейка".
+
+Модуль не зависит от asyncio и pygame: его используют и сервер
+(модуль `snake_server`), и клиент (подкоманда connect модуля `the_snake`).
+
+Протокол поверх TCP:
+    - клиент отправляет по одному байту на поворот: код направления
+        DIRECTIONS[код];
+    - сервер отправляет сообщения: длина сообщения (varint) и числа
+        сообщения (varint): тип сообщения, номер тика, для SNAPSHOT также
+        ширина и высота поля, код змейки клиента и ячейка её головы,
+        увеличенная на 1 (0 - змейки нет на поле), затем количество
+        ячеек и пары (разность номера ячейки с предыдущей ячейкой, код
+        содержимого ячейки). Коды содержимого - EMPTY, FOOD и коды змеек
+        из модуля `snake_arena`.
+"""
+from typing import Iterable
+
+from snake_arena import DIRECTIONS
+from snake_varint import decode_varints, encode_varint
+
+DEFAULT_HOST = 'localhost'
+DEFAULT_PORT = 8765
+# Типы сообщений сервера.
+SNAPSHOT = 0
+DELTA = 1
+# Коды направлений в протоколе.
+DIRECTION_CODES = {
+    direction: code for code, direction in enumerate(DIRECTIONS)
+}
+
+
+def encode_message(
+    header: Iterable[int],
+    cells: dict[int, int]
+) -> bytes:
+    """Кодирует сообщение сервера.
+
+    Параметры:
+        header: Числа заголовка сообщения.
+        cells: Коды содержимого ячеек.
+
+    Возвращает сообщение вместе с длиной.
+    """
+    payload = bytearray()
+    for value in header:
+        encode_varint(value, payload)
+    encode_varint(len(cells), payload)
+    previous = 0
+    for cell in sorted(cells):
+        encode_varint(cell - previous, payload)
+        encode_varint(cells[cell], payload)
+        previous = cell
+    message = bytearray()
+    encode_varint(len(payload), message)
+    return bytes(message + payload)
+
+
+class MessageReader:
+    """Класс для выделения сообщений сервера из потока байт.
+
+    Атрибуты:
+        buffer: Принятые байты, ещё не составившие целого сообщения.
+    """
+
+    __slots__ = ('buffer',)
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Добавляет принятые байты и возвращает целые сообщения.
+
+        Параметры:
+            data: Принятые байты.
+        """
+        self.buffer += data
+        messages = []
+        offset = 0
+        while True:
+            length = shift = 0
+            for start in range(offset, len(self.buffer)):
+                byte = self.buffer[start]
+                length |= (byte & 0x7F) << shift
+                shift += 7
+                if not byte & 0x80:
+                    break
+            else:
+                break
+            end = start + 1 + length
+            if end > len(self.buffer):
+                break
+            messages.append(bytes(self.buffer[start + 1:end]))
+            offset = end
+        del self.buffer[:offset]
+        return messages
+
+
+class ArenaBoard:
+    """Класс для представления арены на стороне клиента.
+
+    Атрибуты:
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        snake_code: Код змейки клиента.
+        head: Ячейка головы змейки клиента или None.
+        tick: Номер последнего принятого тика.
+        cells: Коды содержимого непустых ячеек.
+    """
+
+    __slots__ = ('width', 'height', 'snake_code', 'head', 'tick', 'cells')
+
+    def __init__(self) -> None:
+        self.width = self.height = self.snake_code = self.tick = 0
+        self.head = None
+        self.cells = {}
+
+    def apply(self, message: bytes) -> dict[int, int]:
+        """Применяет сообщение сервера.
+
+        Параметры:
+            message: Сообщение без длины.
+
+        Возвращает коды содержимого изменившихся ячеек. Для SNAPSHOT
+        возвращаются все непустые ячейки.
+        """
+        values = decode_varints(message)
+        kind, self.tick = next(values), next(values)
+        snapshot = kind == SNAPSHOT
+        if snapshot:
+            self.width, self.height = next(values), next(values)
+            self.snake_code = next(values)
+            head = next(values)
+            self.head = head - 1 if head else None
+            self.cells = {}
+        elif kind != DELTA:
+            raise ValueError(f'Неизвестный тип сообщения: {kind}.')
+        changes = {}
+        cell = 0
+        for _ in range(next(values)):
+            cell += next(values)
+            changes[cell] = next(values)
+        for cell, code in changes.items():
+            if code:
+                self.cells[cell] = code
+            else:
+                self.cells.pop(cell, None)
+            # В DELTA ячейка змейки клиента появляется только под новой
+            # головой. В SNAPSHOT есть всё тело, а голова - в заголовке.
+            if code == self.snake_code and not snapshot:
+                self.head = cell
+        return changes
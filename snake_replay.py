@@ -0,0 +1,291 @@
+"""Модуль содержит запись и воспроизведение игр "Змейка".
+
+Игра полностью определяется сидом генератора случайных чисел и действиями
+игрока, поэтому запись хранит только сид и изменения ввода: повороты и
+изменения скорости с номерами тиков, на которых они произошли.
+
+Формат файла записи:
+    - сигнатура REPLAY_MAGIC и номер версии формата (1 байт);
+    - сид игры, ширина и высота игрового поля в ячейках (varint);
+    - записи ввода (varint): (тиков с предыдущей записи << 3) | код, где
+        код 0-3 - поворот в направлении DIRECTIONS[код], SPEED_UP и
+        SPEED_DOWN - изменение скорости на 1, END - конец игры.
+
+Varint - целое число без знака, записанное по 7 бит в байте (см. модуль
+`snake_varint`). Поворот обычно занимает 1-2 байта.
+
+Воспроизведение симулирует игру без графики (модуль `snake_engine`) и
+периодически сохраняет ключевые кадры - клоны состояния игры, поэтому
+переход к любому тику не требует симуляции с начала игры.
+
+Запуск:
+    python snake_replay.py game.replay
+    python snake_replay.py game.replay --seek 1000
+"""
+from array import array
+from bisect import bisect_right
+from typing import Optional
+import argparse
+
+from snake_engine import (
+    DOWN, GRID_HEIGHT, GRID_WIDTH, LEFT, RIGHT, TURNS, UP, GameState, Snake
+)
+from snake_varint import decode_varints, encode_varint
+
+REPLAY_MAGIC = b'SNKR'
+REPLAY_VERSION = 3
+# Направления движения в порядке их кодов в записи.
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+# Коды записей, не являющихся поворотами.
+SPEED_UP = 4
+SPEED_DOWN = 5
+END = 7
+CODE_BITS = 3
+# Количество тиков между ключевыми кадрами воспроизведения.
+KEYFRAME_INTERVAL = 10_000
+
+
+class ReplayRecorder:
+    """Класс для записи игры.
+
+    Атрибуты:
+        seed: Сид игры.
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        data: Буфер с записью игры.
+        last_tick: Тик последней записи ввода.
+        speed: Скорость змейки на момент последней записи ввода.
+        finished: Признак записанного конца игры.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        width: int = GRID_WIDTH,
+        height: int = GRID_HEIGHT
+    ) -> None:
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.data = bytearray(REPLAY_MAGIC)
+        self.data.append(REPLAY_VERSION)
+        for value in (seed, width, height):
+            encode_varint(value, self.data)
+        self.last_tick = 0
+        self.speed = Snake.MIN_SNAKE_SPEED
+        self.finished = False
+
+    def add(self, tick: int, code: int) -> None:
+        """Дописывает запись ввода.
+
+        Параметры:
+            tick: Тик, перед которым применяется ввод.
+            code: Код записи.
+        """
+        encode_varint(
+            (tick - self.last_tick) << CODE_BITS | code, self.data
+        )
+        self.last_tick = tick
+
+    def record(
+        self,
+        game: GameState,
+        action: Optional[tuple[int, ...]] = None
+    ) -> None:
+        """Записывает ввод перед очередным вызовом game.step.
+
+        Записываются только изменения скорости с предыдущего вызова и
+        допустимые повороты: остальной ввод не влияет на игру.
+
+        Параметры:
+            game: Состояние игры.
+            action: Действие, которое будет передано в game.step.
+        """
+        speed = game.snake.speed
+        while self.speed != speed:
+            code = SPEED_UP if speed > self.speed else SPEED_DOWN
+            self.speed += 1 if code == SPEED_UP else -1
+            self.add(game.ticks, code)
+        if action in TURNS[game.snake.direction]:
+            self.add(game.ticks, DIRECTIONS.index(action))
+
+    def finish(self, game: GameState) -> bytes:
+        """Записывает конец игры.
+
+        Параметры:
+            game: Состояние игры.
+
+        Возвращает запись игры.
+        """
+        if not self.finished:
+            self.record(game)
+            self.add(game.ticks, END)
+            self.finished = True
+        return bytes(self.data)
+
+    def save(self, path: str) -> None:
+        """Сохраняет запись игры в файл. Вызывается после finish.
+
+        Параметры:
+            path: Путь к файлу.
+        """
+        with open(path, 'wb') as file:
+            file.write(self.data)
+
+
+class ReplayPlayer:
+    """Класс для воспроизведения записи игры без графики.
+
+    Атрибуты:
+        seed: Сид игры.
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        ticks: Массив с тиками записей ввода.
+        codes: Массив с кодами записей ввода.
+        end_tick: Количество тиков игры.
+        keyframe_interval: Количество тиков между ключевыми кадрами.
+        keyframes: Список ключевых кадров: (тик, индекс следующей записи
+            ввода, состояние игры), упорядоченный по тикам.
+        game: Текущее состояние игры.
+        input_index: Индекс следующей записи ввода.
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        keyframe_interval: int = KEYFRAME_INTERVAL
+    ) -> None:
+        header_size = len(REPLAY_MAGIC) + 1
+        if (
+            data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC
+            or len(data) < header_size
+        ):
+            raise ValueError('Данные не являются записью игры.')
+        if data[len(REPLAY_MAGIC)] != REPLAY_VERSION:
+            raise ValueError(
+                f'Неподдерживаемая версия записи игры: '
+                f'{data[len(REPLAY_MAGIC)]}.'
+            )
+        values = decode_varints(data, header_size)
+        self.seed, self.width, self.height = (
+            next(values, None) for _ in range(3)
+        )
+        self.ticks = array('q')
+        self.codes = array('b')
+        self.end_tick = None
+        tick = 0
+        for value in values:
+            tick += value >> CODE_BITS
+            code = value & ((1 << CODE_BITS) - 1)
+            if code == END:
+                self.end_tick = tick
+                break
+            self.ticks.append(tick)
+            self.codes.append(code)
+        if self.end_tick is None:
+            raise ValueError('Запись игры не завершена.')
+        self.keyframe_interval = keyframe_interval
+        self.game = GameState(
+            seed=self.seed, width=self.width, height=self.height
+        )
+        self.input_index = 0
+        self.keyframes = [(0, 0, self.game.clone())]
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        keyframe_interval: int = KEYFRAME_INTERVAL
+    ) -> 'ReplayPlayer':
+        """Загружает запись игры из файла.
+
+        Параметры:
+            path: Путь к файлу.
+            keyframe_interval: Количество тиков между ключевыми кадрами.
+        """
+        with open(path, 'rb') as file:
+            return cls(file.read(), keyframe_interval)
+
+    def step(self) -> list[str]:
+        """Применяет ввод текущего тика и продвигает игру на один тик.
+
+        Возвращает список произошедших за тик событий.
+        """
+        game = self.game
+        action = None
+        while (
+            self.input_index < len(self.ticks)
+            and self.ticks[self.input_index] == game.ticks
+        ):
+            code = self.codes[self.input_index]
+            if code == SPEED_UP or code == SPEED_DOWN:
+                game.snake.update_speed(1 if code == SPEED_UP else -1)
+            else:
+                action = DIRECTIONS[code]
+            self.input_index += 1
+        events, _ = game.step(action)
+        if (
+            game.ticks % self.keyframe_interval == 0
+            and game.ticks > self.keyframes[-1][0]
+        ):
+            self.keyframes.append(
+                (game.ticks, self.input_index, game.clone())
+            )
+        return events
+
+    def seek(self, tick: int) -> GameState:
+        """Переходит к состоянию игры после заданного количества тиков.
+
+        При переходе назад состояние восстанавливается из ближайшего
+        предыдущего ключевого кадра.
+
+        Параметры:
+            tick: Номер тика, от 0 до end_tick.
+
+        Возвращает состояние игры.
+        """
+        if not 0 <= tick <= self.end_tick:
+            raise ValueError(
+                f'Тик должен быть от 0 до {self.end_tick}, получено: {tick}.'
+            )
+        if tick < self.game.ticks:
+            index = bisect_right(
+                self.keyframes, tick, key=lambda keyframe: keyframe[0]
+            ) - 1
+            _, self.input_index, game = self.keyframes[index]
+            self.game = game.clone()
+        while self.game.ticks < tick:
+            self.step()
+        return self.game
+
+    def play(self) -> GameState:
+        """Воспроизводит игру до конца и возвращает её итоговое состояние."""
+        return self.seek(self.end_tick)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Воспроизводит запись игры из командной строки и выводит её итоги.
+
+    Параметры:
+        argv: Аргументы командной строки.
+    """
+    parser = argparse.ArgumentParser(
+        description='Воспроизведение записи игры "Змейка".'
+    )
+    parser.add_argument('path', help='файл записи игры')
+    parser.add_argument(
+        '--seek', type=int, help='тик, до которого воспроизводится игра'
+    )
+    args = parser.parse_args(argv)
+    player = ReplayPlayer.load(args.path)
+    game = player.play() if args.seek is None else player.seek(args.seek)
+    print(
+        f'Сид: {player.seed}, тик: {game.ticks} из {player.end_tick}, '
+        f'длина: {game.snake.length}, '
+        f'максимальная длина: {game.snake.max_length}, '
+        f'скорость при максимальной длине: {game.snake.max_length_speed}'
+    )
+
+
+if __name__ == '__main__':
+    main()
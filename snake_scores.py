@@ -0,0 +1,235 @@
+"""Модуль содержит таблицу рекордов игры "Змейка" в SQLite.
+
+Результат игры - максимальная длина змейки за игру, скорость, на которой
+она достигнута, и имя игрока (для турниров - политика). Индекс по
+(максимальная длина, скорость) позволяет выбирать K лучших результатов,
+не сортируя всю таблицу.
+
+Игра не пишет на диск сама: результаты ставятся в ограниченную очередь
+ScoreWriter, а фоновый поток записывает их пачками в одной транзакции.
+Поэтому запись не задерживает кадр. Если поток записи упал, то ошибка
+поднимается при следующей постановке результата и при закрытии, а не
+теряется вместе с результатами. Результаты пакетных запусков без графики
+записываются сразу пачкой функцией insert_scores.
+
+База открывается в режиме WAL: чтение рекордов не блокирует фоновую
+запись.
+
+Запуск:
+    python snake_scores.py scores.sqlite3 --top 10
+"""
+from queue import Full, Queue
+from threading import Thread
+from typing import Iterable, Optional
+import argparse
+import sqlite3
+
+# Количество результатов, которые фоновый поток записывает за одну
+# транзакцию.
+WRITE_BATCH_SIZE = 10_000
+# Максимальное количество результатов, ожидающих записи. Если очередь
+# заполнена, то постановка результата ждёт фоновый поток.
+WRITE_QUEUE_SIZE = 100_000
+# Период в секундах, с которым ожидающая постановка в очередь проверяет,
+# что фоновый поток жив.
+WRITE_CHECK_INTERVAL = 0.1
+DEFAULT_TOP = 10
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS scores ('
+    'max_length INTEGER NOT NULL, '
+    'speed INTEGER NOT NULL, '
+    "player TEXT NOT NULL DEFAULT '')",
+    'CREATE INDEX IF NOT EXISTS scores_rank '
+    'ON scores (max_length DESC, speed DESC)',
+)
+INSERT_SCORE = (
+    'INSERT INTO scores (max_length, speed, player) VALUES (?, ?, ?)'
+)
+SELECT_TOP = (
+    'SELECT max_length, speed, player FROM scores '
+    'ORDER BY max_length DESC, speed DESC LIMIT ?'
+)
+
+Score = tuple[int, int, str]
+
+
+def open_scores(path: str) -> sqlite3.Connection:
+    """Открывает базу рекордов и создаёт таблицу, если её нет.
+
+    Параметры:
+        path: Путь к файлу базы.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    with connection:
+        for statement in SCHEMA:
+            connection.execute(statement)
+    return connection
+
+
+def insert_scores(
+    connection: sqlite3.Connection,
+    scores: Iterable[Score]
+) -> None:
+    """Записывает результаты одной транзакцией.
+
+    Параметры:
+        connection: Соединение с базой рекордов.
+        scores: Результаты: максимальная длина, скорость, на которой она
+            достигнута, и имя игрока.
+    """
+    with connection:
+        connection.executemany(INSERT_SCORE, scores)
+
+
+def top_scores(
+    connection: sqlite3.Connection,
+    count: int = DEFAULT_TOP
+) -> list[Score]:
+    """Возвращает лучшие результаты по длине, а при равной длине - по
+    скорости.
+
+    Параметры:
+        connection: Соединение с базой рекордов.
+        count: Количество результатов.
+    """
+    return connection.execute(SELECT_TOP, (count,)).fetchall()
+
+
+class ScoreWriter:
+    """Класс для записи результатов в базу рекордов в фоновом потоке.
+
+    Атрибуты:
+        path: Путь к файлу базы.
+        batch_size: Максимальное количество результатов в транзакции.
+        queue: Очередь результатов, ожидающих записи. None - сигнал
+            завершения потока.
+        thread: Фоновый поток записи.
+        error: Исключение, на котором упал фоновый поток, или None.
+    """
+
+    __slots__ = ('path', 'batch_size', 'queue', 'thread', 'error')
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = WRITE_BATCH_SIZE,
+        queue_size: int = WRITE_QUEUE_SIZE
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.queue = Queue(queue_size)
+        self.error = None
+        # База создаётся до запуска потока, чтобы ошибки пути были
+        # видны сразу.
+        open_scores(path).close()
+        self.thread = Thread(
+            target=self.run, name='score-writer', daemon=True
+        )
+        self.thread.start()
+
+    def submit(self, max_length: int, speed: int, player: str = '') -> None:
+        """Ставит результат в очередь записи, не дожидаясь её.
+
+        Параметры:
+            max_length: Максимальная длина змейки за игру.
+            speed: Скорость змейки, на которой достигнута max_length.
+            player: Имя игрока.
+        """
+        self.put((max_length, speed, player))
+
+    def put(self, score: Optional[Score]) -> None:
+        """Ставит элемент в очередь записи.
+
+        Если очередь заполнена, то постановка ждёт фоновый поток, пока он
+        жив.
+
+        Параметры:
+            score: Результат или None - сигнал завершения потока.
+        """
+        self.check()
+        while True:
+            try:
+                self.queue.put(score, timeout=WRITE_CHECK_INTERVAL)
+                return
+            except Full:
+                self.check()
+
+    def check(self) -> None:
+        """Поднимает ошибку фонового потока, если он упал."""
+        if self.error is not None:
+            raise RuntimeError(
+                f'Запись рекордов в {self.path} остановлена ошибкой.'
+            ) from self.error
+
+    def run(self) -> None:
+        """Записывает результаты из очереди, пока не придёт сигнал
+        завершения.
+
+        Поток ждёт первый результат, а затем забирает из очереди все
+        накопившиеся результаты, но не больше batch_size, и записывает их
+        одной транзакцией. Исключение сохраняется в error и поднимается
+        в потоке игры.
+        """
+        try:
+            self.write()
+        except Exception as error:
+            self.error = error
+
+    def write(self) -> None:
+        """Записывает пачки результатов до сигнала завершения."""
+        connection = open_scores(self.path)
+        try:
+            running = True
+            while running:
+                batch = []
+                score = self.queue.get()
+                while score is not None:
+                    batch.append(score)
+                    if len(batch) >= self.batch_size or self.queue.empty():
+                        break
+                    score = self.queue.get()
+                running = score is not None
+                insert_scores(connection, batch)
+        finally:
+            connection.close()
+
+    def close(self) -> None:
+        """Дожидается записи всех результатов и завершает поток.
+
+        Поднимает ошибку фонового потока, если он упал.
+        """
+        if self.thread.is_alive():
+            self.put(None)
+            self.thread.join()
+        self.check()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Выводит таблицу лучших результатов.
+
+    Параметры:
+        argv: Аргументы командной строки.
+    """
+    parser = argparse.ArgumentParser(
+        description='Таблица рекордов игры "Змейка".'
+    )
+    parser.add_argument('path', help='файл базы рекордов')
+    parser.add_argument(
+        '--top', type=int, default=DEFAULT_TOP,
+        help='количество лучших результатов'
+    )
+    args = parser.parse_args(argv)
+    connection = open_scores(args.path)
+    try:
+        for place, (max_length, speed, player) in enumerate(
+            top_scores(connection, args.top), start=1
+        ):
+            print(f'{place}. {max_length} на скорости {speed} {player}')
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+"""Модуль содержит сетевой сервер арены "Змейка" на asyncio.
+
+Сервер - единственный источник состояния игры: он продвигает арену
+(модуль `snake_arena`) с фиксированной частотой TICK_RATE, а клиенты только
+присылают повороты и отрисовывают присланные изменения. Каждый клиент
+управляет своей змейкой на общей арене.
+
+Протокол описан в модуле `snake_protocol`.
+
+При подключении и после пропущенных тиков клиент получает SNAPSHOT - все
+непустые ячейки поля, а затем на каждом тике DELTA - только изменившиеся
+ячейки: новые головы, убранные хвосты и перемещения еды. DELTA кодируется
+один раз и рассылается всем клиентам.
+
+Сервер не ждёт медленных клиентов: если в буфере отправки клиента
+накопилось больше max_buffer байт, то тики для него пропускаются, а
+когда буфер освободится, клиент получает SNAPSHOT. Поэтому память на
+клиента ограничена, а медленный клиент не задерживает тик.
+
+Запуск:
+    python snake_server.py --port 8765 --width 200 --height 200
+    python the_snake.py connect localhost 8765
+"""
+from typing import Optional
+import argparse
+import asyncio
+
+from snake_arena import (
+    DEFAULT_FOOD, DIRECTIONS, SNAKE_CODE_OFFSET, Arena, ArenaSnake
+)
+from snake_engine import GRID_HEIGHT, GRID_WIDTH
+from snake_protocol import (
+    DEFAULT_HOST, DEFAULT_PORT, DELTA, SNAPSHOT, encode_message
+)
+
+# Частота тиков сервера в секунду.
+TICK_RATE = 10
+# Максимальный размер буфера отправки клиента в байтах.
+MAX_CLIENT_BUFFER = 1 << 16
+# Максимальное количество байт ввода, читаемых за раз.
+INPUT_CHUNK_SIZE = 64
+
+
+class ClientConnection:
+    """Класс для представления подключённого клиента.
+
+    Атрибуты:
+        writer: Поток отправки клиенту.
+        snake: Змейка клиента.
+        synced: Признак того, что клиент получил все тики после
+            последнего SNAPSHOT.
+    """
+
+    __slots__ = ('writer', 'snake', 'synced')
+
+    def __init__(self, writer: asyncio.StreamWriter, snake: ArenaSnake):
+        self.writer = writer
+        self.snake = snake
+        self.synced = False
+
+
+class ArenaServer:
+    """Класс сервера арены.
+
+    Атрибуты:
+        arena: Арена с журналом изменений.
+        tick_rate: Частота тиков в секунду.
+        max_buffer: Максимальный размер буфера отправки клиента в байтах.
+        clients: Подключённые клиенты.
+        actions: Повороты змеек, полученные с последнего тика.
+        free_snakes: Змейки отключившихся клиентов для новых клиентов.
+    """
+
+    def __init__(
+        self,
+        arena: Arena,
+        tick_rate: float = TICK_RATE,
+        max_buffer: int = MAX_CLIENT_BUFFER
+    ) -> None:
+        if arena.changes is None:
+            raise ValueError('Арена сервера должна вести журнал изменений.')
+        self.arena = arena
+        self.tick_rate = tick_rate
+        self.max_buffer = max_buffer
+        self.clients = set()
+        self.actions = {}
+        self.free_snakes = []
+
+    def connect(
+        self,
+        writer: asyncio.StreamWriter
+    ) -> Optional[ClientConnection]:
+        """Подключает клиента и даёт ему змейку.
+
+        Параметры:
+            writer: Поток отправки клиенту.
+
+        Возвращает клиента или None, если на поле нет места для змейки.
+        """
+        if self.free_snakes:
+            snake = self.arena.place_snake(self.free_snakes[-1])
+            if snake is not None:
+                self.free_snakes.pop()
+        else:
+            snake = self.arena.add_snake()
+        if snake is None:
+            return None
+        client = ClientConnection(writer, snake)
+        self.clients.add(client)
+        self.send(client, None)
+        return client
+
+    def disconnect(self, client: ClientConnection) -> None:
+        """Убирает змейку отключившегося клиента с поля.
+
+        Параметры:
+            client: Клиент.
+        """
+        self.clients.remove(client)
+        if client.snake.alive:
+            self.arena.remove_snake(client.snake)
+        self.actions.pop(client.snake.snake_id, None)
+        self.free_snakes.append(client.snake)
+        client.writer.close()
+
+    def handle_input(self, client: ClientConnection, data: bytes) -> None:
+        """Запоминает последний поворот клиента до следующего тика.
+
+        Параметры:
+            client: Клиент.
+            data: Коды направлений. Неизвестные коды пропускаются.
+        """
+        for code in reversed(data):
+            if code < len(DIRECTIONS):
+                self.actions[client.snake.snake_id] = DIRECTIONS[code]
+                return
+
+    async def handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Обслуживает подключение клиента до его закрытия.
+
+        Параметры:
+            reader: Поток приёма от клиента.
+            writer: Поток отправки клиенту.
+        """
+        client = self.connect(writer)
+        if client is None:
+            writer.close()
+            return
+        try:
+            while data := await reader.read(INPUT_CHUNK_SIZE):
+                self.handle_input(client, data)
+        except ConnectionError:
+            pass
+        finally:
+            self.disconnect(client)
+
+    def snapshot(self, client: ClientConnection) -> bytes:
+        """Кодирует SNAPSHOT для клиента.
+
+        Параметры:
+            client: Клиент.
+        """
+        arena = self.arena
+        snake = client.snake
+        return encode_message(
+            (
+                SNAPSHOT, arena.ticks, arena.free_cells.width,
+                arena.free_cells.height,
+                snake.snake_id + SNAKE_CODE_OFFSET,
+                snake.get_head_position() + 1 if snake.body else 0
+            ),
+            arena.contents()
+        )
+
+    def send(self, client: ClientConnection, delta: Optional[bytes]) -> None:
+        """Отправляет клиенту DELTA или, если клиент отстал, SNAPSHOT.
+
+        Если буфер отправки клиента переполнен, то тик для клиента
+        пропускается.
+
+        Параметры:
+            client: Клиент.
+            delta: DELTA текущего тика или None, если нужен SNAPSHOT.
+        """
+        writer = client.writer
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > self.max_buffer:
+            client.synced = False
+            return
+        if delta is None or not client.synced:
+            delta = self.snapshot(client)
+            client.synced = True
+        writer.write(delta)
+
+    def tick(self) -> list[tuple]:
+        """Продвигает арену на тик и рассылает изменения клиентам.
+
+        Возвращает события тика арены.
+        """
+        events = self.arena.step(self.actions)
+        self.actions.clear()
+        delta = encode_message((DELTA, self.arena.ticks), self.arena.changes)
+        self.arena.changes.clear()
+        for client in self.clients:
+            self.send(client, delta)
+        return events
+
+    async def run(self, ticks: Optional[int] = None) -> None:
+        """Продвигает арену с частотой tick_rate.
+
+        Если тик не уложился в период, то следующие тики не догоняют
+        отставание, а отсчитываются заново от текущего времени.
+
+        Параметры:
+            ticks: Количество тиков или None для бесконечной игры.
+        """
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_rate
+        deadline = loop.time()
+        while ticks is None or ticks > 0:
+            self.tick()
+            if ticks is not None:
+                ticks -= 1
+            deadline = max(deadline + period, loop.time())
+            await asyncio.sleep(deadline - loop.time())
+
+    async def serve(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        ticks: Optional[int] = None
+    ) -> None:
+        """Принимает клиентов и продвигает арену.
+
+        Параметры:
+            host: Адрес сервера.
+            port: Порт сервера.
+            ticks: Количество тиков или None для бесконечной игры.
+        """
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await self.run(ticks)
+
+
+def parse_server_arguments(argv: Optional[list[str]] = None) -> dict:
+    """Разбирает аргументы командной строки сервера.
+
+    Параметры:
+        argv: Аргументы командной строки.
+    """
+    parser = argparse.ArgumentParser(
+        description='Сервер арены игры "Змейка".'
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help='адрес сервера')
+    parser.add_argument(
+        '--port', type=int, default=DEFAULT_PORT, help='порт сервера'
+    )
+    parser.add_argument(
+        '--width', type=int, default=GRID_WIDTH,
+        help='ширина игрового поля в ячейках'
+    )
+    parser.add_argument(
+        '--height', type=int, default=GRID_HEIGHT,
+        help='высота игрового поля в ячейках'
+    )
+    parser.add_argument(
+        '--food', type=int, default=DEFAULT_FOOD,
+        help='количество еды на поле'
+    )
+    parser.add_argument(
+        '--tick-rate', type=float, default=TICK_RATE,
+        help='частота тиков в секунду'
+    )
+    parser.add_argument('--seed', type=int, help='сид арены')
+    return vars(parser.parse_args(argv))
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Запускает сервер арены.
+
+    Параметры:
+        argv: Аргументы командной строки.
+    """
+    args = parse_server_arguments(argv)
+    arena = Arena(
+        snakes=0, food=args['food'], seed=args['seed'],
+        width=args['width'], height=args['height'], track_changes=True
+    )
+    server = ArenaServer(arena, args['tick_rate'])
+    try:
+        asyncio.run(server.serve(args['host'], args['port']))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+"""Модуль содержит запуск турниров ботов для игры "Змейка".
+
+Игры симулируются без графики (модуль `snake_engine`) в пуле процессов.
+Каждый процесс получает пачку сидов, играет по одной игре на сид и
+возвращает только компактные итоги игр: максимальную длину, количество
+прожитых тиков и причину окончания игры.
+
+Бот (политика) - функция, которая принимает состояние игры GameState и
+возвращает новое направление движения змейки или None. В командной строке
+политика задаётся строкой вида "модуль:функция".
+"""
+from array import array
+from importlib import import_module
+from math import ceil
+import os
+from random import choice, seed as random_seed
+from typing import Callable, Iterable, Optional
+
+from snake_engine import (
+    BOARD_FULL, DOWN, LEFT, RIGHT, SELF_COLLISION, TURNS, UP,
+    WRONG_PRODUCT_EATEN, GameState
+)
+
+# Причина окончания игры, если змейка дожила до ограничения по тикам.
+TIMEOUT = 'timeout'
+# Причины окончания игры в порядке их кодов в итогах игр.
+END_CAUSES = (SELF_COLLISION, WRONG_PRODUCT_EATEN, BOARD_FULL, TIMEOUT)
+# Количество чисел в итоге одной игры: максимальная длина, количество
+# тиков и код причины окончания игры.
+SUMMARY_SIZE = 3
+DEFAULT_MAX_TICKS = 10_000
+
+TABLE_HEADER = (
+    'Политика', 'Игр', 'Ср. макс. длина', 'Макс. длина', 'Ср. тиков',
+    *END_CAUSES
+)
+
+Policy = Callable[[GameState], Optional[tuple[int, ...]]]
+
+
+def random_policy(game: GameState) -> Optional[tuple[int, ...]]:
+    """Выбирает случайный допустимый поворот или продолжение движения.
+
+    Параметры:
+        game: Состояние игры.
+    """
+    return choice((None, *TURNS[game.snake.direction]))
+
+
+def greedy_policy(game: GameState) -> Optional[tuple[int, ...]]:
+    """Поворачивает в сторону яблока, избегая соседних занятых ячеек.
+
+    Параметры:
+        game: Состояние игры.
+    """
+    snake = game.snake
+    free_cells = snake.free_cells
+    head = snake.get_head_position()
+    head_x, head_y = free_cells.coordinates(head)
+    apple_x, apple_y = free_cells.coordinates(game.apple.position)
+    preferred = []
+    if apple_x != head_x:
+        preferred.append(RIGHT if apple_x > head_x else LEFT)
+    if apple_y != head_y:
+        preferred.append(DOWN if apple_y > head_y else UP)
+    candidates = [snake.direction, *TURNS[snake.direction]]
+    candidates.sort(key=lambda direction: direction not in preferred)
+    for direction in candidates:
+        position = free_cells.neighbor(head, direction)
+        if (
+            position not in snake.occupied
+            and position != game.wrong_product.position
+        ):
+            return direction
+    return None
+
+
+def load_policy(path: str) -> Policy:
+    """Возвращает политику по строке вида "модуль:функция".
+
+    Параметры:
+        path: Путь к политике.
+    """
+    module_name, separator, function_name = path.partition(':')
+    if not separator:
+        raise ValueError(
+            f'Политика должна задаваться как "модуль:функция", '
+            f'получено: {path!r}.'
+        )
+    policy = getattr(import_module(module_name), function_name)
+    if not callable(policy):
+        raise TypeError(f'Политика {path!r} не является функцией.')
+    return policy
+
+
+def play_game(
+    policy: Policy,
+    seed: int,
+    max_ticks: int = DEFAULT_MAX_TICKS
+) -> tuple[int, int, int]:
+    """Играет одну игру до первого сброса змейки или ограничения по тикам.
+
+    Параметры:
+        policy: Политика, управляющая змейкой.
+        seed: Сид игры. Им же инициализируется модуль random, которым
+            пользуются политики.
+        max_ticks: Ограничение количества тиков.
+
+    Возвращает максимальную длину змейки, количество тиков и код причины
+    окончания игры в END_CAUSES.
+    """
+    random_seed(seed)
+    game = GameState(seed=seed)
+    for _ in range(max_ticks):
+        events, _ = game.step(policy(game))
+        for cause in (SELF_COLLISION, WRONG_PRODUCT_EATEN, BOARD_FULL):
+            if cause in events:
+                return (
+                    game.snake.max_length,
+                    game.ticks,
+                    END_CAUSES.index(cause)
+                )
+    return game.snake.max_length, game.ticks, END_CAUSES.index(TIMEOUT)
+
+
+def play_games(
+    policy_path: str,
+    seeds: Iterable[int],
+    max_ticks: int = DEFAULT_MAX_TICKS
+) -> array:
+    """Играет пачку игр в процессе пула.
+
+    Параметры:
+        policy_path: Политика в виде строки "модуль:функция".
+        seeds: Сиды игр.
+        max_ticks: Ограничение количества тиков в одной игре.
+
+    Возвращает итоги игр, записанные подряд по SUMMARY_SIZE чисел.
+    """
+    policy = load_policy(policy_path)
+    summaries = array('q')
+    for game_seed in seeds:
+        summaries.extend(play_game(policy, game_seed, max_ticks))
+    return summaries
+
+
+def run_tournament(
+    policy_paths: list[str],
+    games: int,
+    seed: int = 0,
+    max_ticks: int = DEFAULT_MAX_TICKS,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> dict[str, array]:
+    """Играет одинаковый набор игр каждой политикой в пуле процессов.
+
+    Параметры:
+        policy_paths: Политики в виде строк "модуль:функция".
+        games: Количество игр для каждой политики.
+        seed: Сид первой игры, следующие игры получают seed + 1, seed + 2
+            и так далее.
+        max_ticks: Ограничение количества тиков в одной игре.
+        workers: Количество процессов пула. По умолчанию - количество ядер.
+        batch_size: Количество игр в одной задаче процесса.
+
+    Возвращает словарь с итогами игр для каждой политики.
+    """
+    # Пул процессов импортируется здесь: его импорт дороже импорта
+    # остальных модулей игры.
+    from concurrent.futures import ProcessPoolExecutor
+
+    for policy_path in policy_paths:
+        load_policy(policy_path)
+    workers = workers if workers else os.cpu_count() or 1
+    if not batch_size:
+        batch_size = max(1, ceil(games / (workers * 4)))
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {
+            policy_path: [
+                executor.submit(
+                    play_games,
+                    policy_path,
+                    range(start, min(start + batch_size, seed + games)),
+                    max_ticks
+                )
+                for start in range(seed, seed + games, batch_size)
+            ]
+            for policy_path in policy_paths
+        }
+        results = {}
+        for policy_path, policy_futures in futures.items():
+            results[policy_path] = array('q')
+            for future in policy_futures:
+                results[policy_path].extend(future.result())
+    return results
+
+
+def summarize(summaries: array) -> tuple:
+    """Возвращает строку таблицы статистики для итогов игр одной политики.
+
+    Параметры:
+        summaries: Итоги игр, записанные подряд по SUMMARY_SIZE чисел.
+    """
+    max_lengths = summaries[0::SUMMARY_SIZE]
+    ticks = summaries[1::SUMMARY_SIZE]
+    causes = summaries[2::SUMMARY_SIZE]
+    games = len(max_lengths)
+    return (
+        games,
+        round(sum(max_lengths) / games, 2),
+        max(max_lengths),
+        round(sum(ticks) / games, 1),
+        *(causes.count(code) for code in range(len(END_CAUSES)))
+    )
+
+
+def format_table(results: dict[str, array]) -> str:
+    """Возвращает таблицу статистики турнира.
+
+    Параметры:
+        results: Итоги игр для каждой политики.
+    """
+    rows = [TABLE_HEADER] + [
+        (policy_path, *summarize(summaries))
+        for policy_path, summaries in results.items()
+    ]
+    widths = [
+        max(len(str(row[column])) for row in rows)
+        for column in range(len(TABLE_HEADER))
+    ]
+    return '\n'.join(
+        '  '.join(
+            str(value).ljust(width) for value, width in zip(row, widths)
+        ).rstrip()
+        for row in rows
+    )
@@ -0,0 +1,41 @@
+"""Модуль содержит кодирование целых чисел в формате varint.
+
+Varint - целое число без знака, записанное по 7 бит в байте, начиная с
+младших; старший бит байта означает, что число продолжается. Небольшие
+числа занимают 1-2 байта. Формат используют файлы записи игры (модуль
+`snake_replay`), записи кадров (модуль `snake_capture`) и сетевой
+протокол арены (модуль `snake_protocol`).
+"""
+from typing import Iterator
+
+
+def encode_varint(value: int, data: bytearray) -> None:
+    """Дописывает неотрицательное целое число в формате varint.
+
+    Параметры:
+        value: Записываемое число.
+        data: Буфер, в который записывается число.
+    """
+    while value > 0x7F:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+
+
+def decode_varints(data: bytes, offset: int = 0) -> Iterator[int]:
+    """Последовательно читает числа в формате varint.
+
+    Параметры:
+        data: Буфер с числами.
+        offset: Смещение первого числа в буфере.
+    """
+    value = shift = 0
+    for byte in memoryview(data)[offset:]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        yield value
+        value = shift = 0
+    if shift:
+        raise ValueError('Данные обрываются посреди числа varint.')
@@ -0,0 +1,134 @@
+import time
+
+from snake_arena import (
+    HEAD_COLLISION, SNAKE_COLLISION, Arena, ArenaSnake
+)
+from snake_engine import APPLE_EATEN, DOWN, LEFT, RIGHT, SELF_COLLISION, UP
+
+
+def make_arena(width=10, height=10):
+    return Arena(snakes=0, food=0, seed=0, width=width, height=height,
+                 respawn=False)
+
+
+def put_snake(arena, cells, direction):
+    snake = ArenaSnake(len(arena.snakes), cells[0], direction)
+    snake.body.extend(cells[1:])
+    snake.length = len(cells)
+    arena.snakes.append(snake)
+    for cell in cells:
+        arena.set_owner(cell, snake.snake_id + 1)
+    return snake
+
+
+def put_food(arena, cell):
+    arena.food.add(cell)
+    arena.free_cells.occupy(cell)
+
+
+def check_grid(arena):
+    occupied = {
+        cell: snake.snake_id + 1
+        for snake in arena.alive_snakes() for cell in snake.body
+    }
+    for cell in range(arena.free_cells.area):
+        assert arena.owners[cell] == occupied.get(cell, 0), (
+            'Сетка владельцев должна совпадать с телами змеек.'
+        )
+        assert (cell in arena.free_cells) == (
+            cell not in occupied and cell not in arena.food
+        ), 'Индекс свободных ячеек должен учитывать змеек и еду.'
+
+
+def test_head_to_head_kills_both():
+    arena = make_arena()
+    first = put_snake(arena, [arena.free_cells.cell(3, 5)], RIGHT)
+    second = put_snake(arena, [arena.free_cells.cell(5, 5)], LEFT)
+    events = arena.step()
+    assert sorted(events) == [(HEAD_COLLISION, 0), (HEAD_COLLISION, 1)]
+    assert not first.alive and not second.alive
+    check_grid(arena)
+
+
+def test_head_to_body_kills_only_attacker():
+    arena = make_arena()
+    cell = arena.free_cells.cell
+    victim = put_snake(arena, [cell(5, 4), cell(5, 5), cell(5, 6)], UP)
+    attacker = put_snake(arena, [cell(4, 5)], UP)
+    events = arena.step({attacker.snake_id: RIGHT})
+    assert events == [(SNAKE_COLLISION, attacker.snake_id)]
+    assert victim.alive and not attacker.alive
+    assert victim.get_head_position() == cell(5, 3)
+    check_grid(arena)
+
+
+def test_head_into_vacated_tail_does_not_depend_on_order():
+    def play(attacker_first):
+        arena = make_arena()
+        cell = arena.free_cells.cell
+        snakes = {}
+        for name in (('attacker', 'victim') if attacker_first
+                     else ('victim', 'attacker')):
+            if name == 'attacker':
+                snakes[name] = put_snake(arena, [cell(4, 5)], RIGHT)
+            else:
+                snakes[name] = put_snake(arena, [cell(5, 4), cell(5, 5)], UP)
+        names = {snake.snake_id: name for name, snake in snakes.items()}
+        events = arena.step()
+        check_grid(arena)
+        return sorted((event, names[snake_id]) for event, snake_id in events)
+
+    assert play(True) == play(False) == [(SNAKE_COLLISION, 'attacker')], (
+        'Вход в освобождаемый хвост должен быть столкновением при любом '
+        'порядке змеек.'
+    )
+
+
+def test_self_collision():
+    arena = make_arena()
+    cell = arena.free_cells.cell
+    snake = put_snake(
+        arena, [cell(5, 5), cell(6, 5), cell(6, 6), cell(5, 6)], LEFT
+    )
+    assert arena.step([DOWN]) == [(SELF_COLLISION, snake.snake_id)], (
+        'Вход головы в свой хвост должен быть столкновением.'
+    )
+
+
+def test_food_grows_snake_and_respawns():
+    arena = make_arena()
+    snake = put_snake(arena, [arena.free_cells.cell(2, 2)], RIGHT)
+    put_food(arena, arena.free_cells.cell(3, 2))
+    assert arena.step() == [(APPLE_EATEN, 0)]
+    assert snake.length == 2 and len(arena.food) == 1
+    assert arena.free_cells.cell(3, 2) not in arena.food
+    arena.step()
+    assert len(snake.body) == 2
+    check_grid(arena)
+
+
+def test_random_arena_keeps_grid_consistent():
+    arena = Arena(snakes=40, food=20, seed=4, width=20, height=15)
+    turns = (None, UP, DOWN, LEFT, RIGHT)
+    for _ in range(300):
+        arena.step([arena.rng.choice(turns) for _ in arena.snakes])
+        assert len(arena.food) == 20
+    check_grid(arena)
+    assert max(snake.max_length for snake in arena.snakes) > 1
+
+
+def test_step_does_not_depend_on_body_length():
+    def tick_time(length):
+        arena = Arena(snakes=500, food=0, seed=1, width=1000, height=1000)
+        for snake in arena.snakes:
+            snake.length = length
+        start = time.perf_counter()
+        for _ in range(length):
+            arena.step()
+        return time.perf_counter() - start
+
+    tick_time(10)
+    short, long = tick_time(20) / 20, tick_time(200) / 200
+    assert long < short * 3, (
+        'Время тика не должно расти с длиной змеек.'
+    )
@@ -0,0 +1,201 @@
+import os
+import time
+
+import pytest
+
+import snake_autopilot
+import snake_engine
+import snake_tournament
+import the_snake
+from snake_levels import load_level
+
+
+@pytest.mark.parametrize('width, height', [(6, 4), (5, 4), (4, 5), (2, 2)])
+def test_hamiltonian_cycle_visits_every_cell_once(width, height):
+    cycle = snake_autopilot.HamiltonianCycle(width, height)
+    free_cells = snake_engine.FreeCells(width, height)
+    cell = 0
+    for _ in range(width * height):
+        assert cycle.index(free_cells.neighbor(cell, cycle.direction(cell))) \
+            == (cycle.index(cell) + 1) % cycle.size, (
+                'Следующая ячейка цикла должна иметь следующий номер.'
+            )
+        x, y = free_cells.coordinates(cell)
+        dx, dy = cycle.direction(cell)
+        assert 0 <= x + dx < width and 0 <= y + dy < height, (
+            'Цикл не должен проходить сквозь стены.'
+        )
+        cell = free_cells.neighbor(cell, cycle.direction(cell))
+    assert cell == 0
+    assert sorted(map(cycle.index, range(width * height))) == list(
+        range(width * height)
+    )
+
+
+def test_no_hamiltonian_cycle_on_odd_board():
+    assert snake_autopilot.HamiltonianCycle.for_board(5, 5) is None
+
+
+def test_find_path_waits_for_body_to_leave():
+    free_cells = snake_engine.FreeCells(5, 1)
+    # Ячейка 1 освобождается только к третьему ходу, ячейка 4 - сразу.
+    path = snake_autopilot.find_path(free_cells, 0, 2, {1: 3, 4: 1})
+    assert [cell for _, cell in path] == [4, 3, 2], (
+        'Путь не должен проходить через ячейку, которую ещё занимает тело.'
+    )
+    assert snake_autopilot.find_path(free_cells, 0, 2, {1: 3, 4: 3}) is None
+
+
+def test_autopilot_grows_without_collisions():
+    game = snake_engine.GameState(seed=0)
+    pilot = snake_autopilot.Autopilot()
+    for _ in range(5000):
+        events, _ = game.step(pilot(game))
+        assert snake_engine.SELF_COLLISION not in events
+        assert snake_engine.WRONG_PRODUCT_EATEN not in events
+    assert game.snake.length > 100
+
+
+def test_autopilot_follows_cycle_when_long():
+    game = snake_engine.GameState(seed=1, width=8, height=6)
+    pilot = snake_autopilot.Autopilot()
+    while game.snake.length < 30 and game.ticks < 5000:
+        events, _ = game.step(pilot(game))
+        assert snake_engine.SELF_COLLISION not in events
+        assert snake_engine.WRONG_PRODUCT_EATEN not in events
+    assert game.snake.length >= 30, (
+        'Змейка должна заполнять небольшое поле, двигаясь по циклу.'
+    )
+
+
+def test_autopilot_avoids_level_walls():
+    level = load_level(os.path.join(
+        os.path.dirname(__file__), os.pardir, 'levels', 'rooms.txt'
+    ))
+    game = snake_engine.GameState(
+        seed=4, width=level.width, height=level.height, walls=level.walls
+    )
+    pilot = snake_autopilot.Autopilot()
+    for _ in range(3000):
+        events, _ = game.step(pilot(game))
+        assert snake_engine.WALL_COLLISION not in events, (
+            'Автопилот не должен врезаться в стены уровня.'
+        )
+        assert snake_engine.SELF_COLLISION not in events
+    assert game.snake.length > 30
+
+
+def test_autopilot_decisions_are_fast_for_long_snake():
+    game = snake_engine.GameState(seed=2, width=400, height=400)
+    free_cells = game.snake.free_cells
+    # Тело зигзагом заполняет верхние 100 строк по 200 ячеек, голова - в
+    # начале последней строки.
+    body = [
+        free_cells.cell(x if y % 2 == 0 else 199 - x, y)
+        for y in range(100) for x in range(200)
+    ]
+    game.snake.positions = reversed(body)
+    game.snake.length = len(body)
+    game.snake.direction = (-1, 0)
+    game.apple.position = free_cells.cell(300, 300)
+    game.wrong_product.position = free_cells.cell(350, 350)
+    pilot = snake_autopilot.Autopilot()
+    times = []
+    for _ in range(1000):
+        start = time.perf_counter()
+        direction = pilot(game)
+        times.append(time.perf_counter() - start)
+        events, _ = game.step(direction)
+        assert snake_engine.SELF_COLLISION not in events
+    times.sort()
+    assert times[int(len(times) * 0.99)] < 0.002, (
+        'Время решения автопилота не должно зависеть от длины змейки.'
+    )
+    assert game.snake.length > len(body)
+
+
+def test_autopilot_search_per_decision_is_bounded(monkeypatch):
+    budgets = []
+    find_path = snake_autopilot.find_path
+
+    def recording_find_path(*args, **kwargs):
+        budgets.append(
+            kwargs.get('max_nodes', snake_autopilot.MAX_SEARCH_NODES)
+        )
+        return find_path(*args, **kwargs)
+
+    monkeypatch.setattr(snake_autopilot, 'find_path', recording_find_path)
+    game = snake_engine.GameState(seed=2, width=1000, height=1000)
+    pilot = snake_autopilot.Autopilot()
+    for _ in range(3000):
+        budgets.clear()
+        game.step(pilot(game))
+        assert sum(budgets) <= 1000, (
+            'Поиски за одно решение не должны зависеть от размера поля.'
+        )
+    assert game.snake.max_length > 1
+
+
+def test_blocked_path_is_repaired_locally(monkeypatch):
+    game = snake_engine.GameState(seed=0, width=21, height=21)
+    pilot = snake_autopilot.Autopilot()
+    game.step(pilot(game))
+    path = list(pilot.path)
+    game.wrong_product.position = path[-1][1]
+    budgets = []
+    find_path = snake_autopilot.find_path
+
+    def recording_find_path(*args, **kwargs):
+        budgets.append(kwargs.get('max_nodes'))
+        return find_path(*args, **kwargs)
+
+    monkeypatch.setattr(snake_autopilot, 'find_path', recording_find_path)
+    direction = pilot(game)
+    assert budgets == [snake_autopilot.REPAIR_SEARCH_NODES], (
+        'Перекрытый путь должен чиниться коротким обходом, а не новым '
+        'поиском до яблока.'
+    )
+    head = game.snake.free_cells.neighbor(
+        game.snake.get_head_position(), direction
+    )
+    assert head != game.wrong_product.position
+    assert pilot.path[:len(path) - 2] == path[:len(path) - 2], (
+        'Путь за препятствием должен сохраниться.'
+    )
+
+
+def test_autopilot_policy_in_tournament():
+    max_length, ticks, cause = snake_tournament.play_game(
+        snake_autopilot.autopilot_policy, seed=5, max_ticks=1000
+    )
+    assert ticks == 1000
+    assert snake_tournament.END_CAUSES[cause] == snake_tournament.TIMEOUT
+    assert max_length > 10
+
+
+def test_autopilot_policy_keeps_state_per_game():
+    games = [
+        snake_engine.GameState(seed=seed, width=8, height=6)
+        for seed in (7, 8)
+    ]
+    expected = [game.clone() for game in games]
+    pilots = [snake_autopilot.Autopilot() for _ in games]
+    for _ in range(1000):
+        for game, expected_game, pilot in zip(games, expected, pilots):
+            game.step(snake_autopilot.autopilot_policy(game))
+            expected_game.step(pilot(expected_game))
+    for game, expected_game in zip(games, expected):
+        assert game.snake.positions == expected_game.snake.positions, (
+            'Состояние автопилота не должно переходить между играми.'
+        )
+
+
+def test_step_game_uses_autopilot():
+    game = snake_engine.GameState(seed=3)
+    pilot = snake_autopilot.Autopilot()
+    expected = game.clone()
+    expected.step(snake_autopilot.Autopilot()(expected))
+    the_snake.step_game(game, pilot=pilot)
+    assert game.snake.positions == expected.snake.positions, (
+        'В режиме автопилота поворот должен выбирать автопилот.'
+    )
@@ -0,0 +1,76 @@
+import numpy as np
+
+import snake_batch
+import snake_engine
+
+
+def _move_towards(env, targets):
+    head_x, head_y = env.heads % env.width, env.heads // env.width
+    target_x, target_y = targets % env.width, targets // env.width
+    return np.select(
+        [target_x > head_x, target_x < head_x, target_y > head_y],
+        [
+            snake_batch.DIRECTIONS.index(snake_engine.RIGHT),
+            snake_batch.DIRECTIONS.index(snake_engine.LEFT),
+            snake_batch.DIRECTIONS.index(snake_engine.DOWN)
+        ],
+        snake_batch.DIRECTIONS.index(snake_engine.UP)
+    )
+
+
+def _check_bodies(env):
+    for env_index in range(env.num_envs):
+        positions = env.positions(env_index)
+        assert positions[0] == env.heads[env_index]
+        assert len(set(positions.tolist())) == env.size[env_index], (
+            'Сегменты змейки не должны повторяться.'
+        )
+        assert env.occupancy[env_index].sum() == env.size[env_index]
+        assert env.occupancy[env_index, positions].all(), (
+            'Сетка занятости должна совпадать с телом змейки.'
+        )
+        assert env.size[env_index] <= env.length[env_index]
+
+
+def test_wrap_around():
+    env = snake_batch.BatchSnakeEnv(1, width=5, height=4, seed=0)
+    env.direction[:] = snake_batch.DIRECTIONS.index(snake_engine.LEFT)
+    env.apple[:] = env.wrong_product[:] = 0
+    for _ in range(3):
+        env.step()
+    assert env.heads[0] == env.center + 2, (
+        'Змейка должна проходить сквозь стену игрового поля.'
+    )
+
+
+def test_apple_growth_and_body_invariants():
+    env = snake_batch.BatchSnakeEnv(64, width=12, height=10, seed=1)
+    eaten = np.zeros(env.num_envs, dtype=np.intp)
+    for _ in range(300):
+        events, _ = env.step(_move_towards(env, env.apple))
+        eaten += events[snake_engine.APPLE_EATEN]
+        _check_bodies(env)
+    assert env.max_length.max() > 5
+    assert (env.max_length <= eaten + 1).all()
+
+
+def test_wrong_product_resets_snake():
+    env = snake_batch.BatchSnakeEnv(8, seed=2)
+    for _ in range(200):
+        events, _ = env.step(_move_towards(env, env.wrong_product))
+        eaten = events[snake_engine.WRONG_PRODUCT_EATEN]
+        assert (env.length[eaten] == 1).all()
+        assert (env.heads[eaten] == env.center).all()
+    assert env.ticks[0] == 200
+
+
+def test_seeded_runs_are_reproducible():
+    actions = np.random.default_rng(3).integers(-1, 4, size=(100, 16))
+    first = snake_batch.BatchSnakeEnv(16, seed=4)
+    second = snake_batch.BatchSnakeEnv(16, seed=4)
+    for step_actions in actions:
+        first.step(step_actions)
+        second.step(step_actions)
+    assert (first.body == second.body).all()
+    assert (first.apple == second.apple).all()
+    assert (first.max_length == second.max_length).all()
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+import snake_benchmark
+import snake_engine
+
+
+def test_rendered_game_is_reproducible_from_seed():
+    import the_snake
+
+    games = [
+        snake_benchmark.build_rendered_game(the_snake, 40, 30, seed=5)
+        for _ in range(2)
+    ]
+    for game in games:
+        for _ in range(50):
+            game.step()
+    first, second = (
+        (game.apple.position, game.wrong_product.position) for game in games
+    )
+    assert first == second, (
+        'Игры бенчмарка с одним сидом должны совпадать.'
+    )
+    the_snake.camera = the_snake.Camera()
+    the_snake.dirty_rects.clear()
+
+
+def test_run_benchmarks_reports_latencies():
+    results = snake_benchmark.run_benchmarks(
+        repeat=50,
+        benchmarks=(
+            snake_benchmark.bench_snake_move,
+            snake_benchmark.bench_randomize_position,
+            snake_benchmark.bench_headless_game,
+            snake_benchmark.bench_arena_step,
+            snake_benchmark.bench_observation_update
+        )
+    )
+    assert {'Snake.move[length=10000]', 'GameState.step'} <= {
+        result['name'] for result in results
+    }
+    for result in results:
+        assert result['ops_per_second'] > 0
+        assert result['p50_ns'] <= result['p99_ns']
+
+
+def test_find_regressions():
+    baseline = [
+        {'name': 'fast', 'ops_per_second': 1000},
+        {'name': 'slow', 'ops_per_second': 1000},
+    ]
+    results = [
+        {'name': 'fast', 'ops_per_second': 950},
+        {'name': 'slow', 'ops_per_second': 800},
+        {'name': 'new', 'ops_per_second': 1},
+    ]
+    regressions = snake_benchmark.find_regressions(results, baseline, 10)
+    assert len(regressions) == 1 and regressions[0].startswith('slow'), (
+        'Ухудшение больше допустимого должно быть обнаружено.'
+    )
+
+
+def test_startup_within_budget():
+    for name, preload in snake_benchmark.STARTUP_BUDGET_PRELOADS.items():
+        _, code = snake_benchmark.STARTUP_SCRIPTS[name]
+        best = min(
+            snake_benchmark.measure_startup(preload, code) for _ in range(3)
+        )
+        assert best < snake_benchmark.STARTUP_BUDGET_MS * 10**6, (
+            f'Запуск {name} не должен превышать бюджет: {best / 10**6} мс.'
+        )
+
+
+def test_game_startup_skips_optional_modules():
+    script = (
+        'import sys\nimport the_snake\nprint(" ".join(sorted(sys.modules)))'
+    )
+    completed = subprocess.run(
+        (sys.executable, '-c', script), capture_output=True, check=True,
+        text=True, cwd=os.path.dirname(snake_benchmark.__file__)
+    )
+    modules = set(completed.stdout.split())
+    for name in (
+        'snake_autopilot', 'snake_capture', 'snake_profiler',
+        'snake_protocol', 'snake_replay', 'snake_scores', 'snake_tournament',
+        'sqlite3'
+    ):
+        assert name not in modules, (
+            f'Запуск игры не должен импортировать модуль {name}.'
+        )
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pygame
+
+import snake_capture
+import the_snake
+from snake_capture import CaptureReader, FrameCapture
+
+
+def test_capture_round_trip_skips_unchanged_frames(tmp_path):
+    path = str(tmp_path / 'game.frames')
+    screen = the_snake.get_screen()
+    capture = FrameCapture(path, screen)
+    colors = [(10, 20, 30), (40, 50, 60)]
+    for color in colors:
+        screen.fill(color)
+        assert capture.capture(screen, [screen.get_rect()])
+        assert not capture.capture(screen, [])
+    capture.close()
+    assert (capture.captured, capture.skipped, capture.dropped) == (2, 2, 0)
+    reader = CaptureReader(path)
+    frames = list(reader.frames())
+    assert [frame for frame, _ in frames] == [1, 3], (
+        'Кадры без изменений не должны записываться.'
+    )
+    for (_, data), color in zip(frames, colors):
+        assert reader.surface(data).get_at((5, 5))[:3] == color
+
+
+def test_capture_drops_frames_instead_of_blocking(tmp_path, monkeypatch):
+    release = threading.Event()
+    compress = snake_capture.zlib.compress
+
+    def slow_compress(data, level):
+        release.wait()
+        return compress(data, level)
+
+    monkeypatch.setattr(snake_capture.zlib, 'compress', slow_compress)
+    path = str(tmp_path / 'game.frames')
+    screen = pygame.Surface((400, 300))
+    capture = FrameCapture(path, screen, pool_size=2)
+    start = time.perf_counter()
+    for _ in range(10):
+        capture.capture(screen, [screen.get_rect()])
+    assert time.perf_counter() - start < 0.1, (
+        'Запись кадров не должна ждать фоновый поток.'
+    )
+    assert (capture.captured, capture.dropped) == (2, 8)
+    release.set()
+    while capture.free.qsize() < 2:
+        time.sleep(0.001)
+    assert capture.capture(screen, []), (
+        'После отброшенного кадра следующий кадр должен записываться.'
+    )
+    capture.close()
+    assert [frame for frame, _ in CaptureReader(path).frames()] == [1, 2, 11]
+
+
+def test_capture_is_cheap(tmp_path):
+    screen = the_snake.get_screen()
+    capture = FrameCapture(str(tmp_path / 'game.frames'), screen)
+    elapsed = 0
+    for _ in range(100):
+        start = time.perf_counter()
+        capture.capture(screen, [screen.get_rect()])
+        elapsed += time.perf_counter() - start
+        time.sleep(0.005)
+    capture.close()
+    assert elapsed / 100 < 0.002, (
+        'Копирование кадра должно занимать меньше 2 мс.'
+    )
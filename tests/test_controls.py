@@ -0,0 +1,110 @@
+import time
+
+import pygame
+import pytest
+
+import the_snake
+from conftest import StopInfiniteLoop
+
+
+def test_fast_turns_are_applied_one_per_tick(snake):
+    snake.direction = the_snake.RIGHT
+    snake.queue_turn(pygame.K_UP)
+    snake.queue_turn(pygame.K_LEFT)
+    assert snake.next_turn() == the_snake.UP
+    snake.update_direction(the_snake.UP)
+    assert snake.next_turn() == the_snake.LEFT, (
+        'Второй поворот должен проверяться по направлению змейки на '
+        'следующем тике.'
+    )
+    assert snake.next_turn() is None
+
+
+def test_invalid_turns_are_skipped(snake):
+    snake.direction = the_snake.RIGHT
+    snake.queue_turn(pygame.K_RIGHT)
+    snake.queue_turn(pygame.K_LEFT)
+    snake.queue_turn(pygame.K_DOWN)
+    assert snake.next_turn() == the_snake.DOWN
+
+
+def test_turn_queue_is_bounded(snake):
+    for _ in range(the_snake.TURN_QUEUE_SIZE + 5):
+        snake.queue_turn(pygame.K_UP)
+    assert len(snake.turns) == the_snake.TURN_QUEUE_SIZE
+
+
+def key_event(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+
+def test_pause_key_and_window_events_pause_game(monkeypatch, snake):
+    activity = the_snake.Activity()
+    monkeypatch.setattr(the_snake, 'activity', activity)
+    the_snake.handle_event(key_event(the_snake.PAUSE_BUTTON), snake)
+    assert not activity.active
+    the_snake.handle_event(key_event(the_snake.PAUSE_BUTTON), snake)
+    assert activity.active
+    the_snake.handle_event(
+        pygame.event.Event(pygame.WINDOWFOCUSLOST), snake
+    )
+    assert not activity.active, 'Игра без фокуса должна встать на паузу.'
+    the_snake.handle_event(
+        pygame.event.Event(pygame.WINDOWFOCUSGAINED), snake
+    )
+    the_snake.handle_event(pygame.event.Event(pygame.WINDOWMINIMIZED), snake)
+    assert not activity.active, 'Свёрнутая игра должна встать на паузу.'
+    the_snake.handle_event(pygame.event.Event(pygame.WINDOWRESTORED), snake)
+    assert activity.active
+
+
+def test_paused_loop_blocks_and_resumes_without_time_jump(monkeypatch):
+    activity = the_snake.Activity()
+    activity.set('visible', False)
+    monkeypatch.setattr(the_snake, 'activity', activity)
+    waited = []
+
+    def wait():
+        waited.append(len(waited))
+        if len(waited) < 3:
+            return key_event(pygame.K_a)
+        return pygame.event.Event(pygame.WINDOWRESTORED)
+
+    class PausedClock:
+        ticks = []
+
+        def tick(self, framerate=0):
+            self.ticks.append(framerate)
+            if len(self.ticks) > 2:
+                raise StopInfiniteLoop
+            # Первый вызов после паузы возвращает длительность паузы.
+            return 60_000 if len(self.ticks) == 1 else 16
+
+    monkeypatch.setattr(pygame.event, 'wait', wait)
+    monkeypatch.setattr(the_snake, 'clock', PausedClock())
+    steps = []
+    monkeypatch.setattr(
+        the_snake, 'step_game', lambda *args: steps.append(args) or []
+    )
+    game = the_snake.GameState(
+        the_snake.Snake(), the_snake.Apple(), the_snake.WrongProduct()
+    )
+    the_snake.get_screen()
+    with pytest.raises(StopInfiniteLoop):
+        the_snake.run_game_loop(game)
+    assert len(waited) == 3, 'На паузе цикл должен ждать событий.'
+    assert not steps, 'После паузы игра не должна догонять пропущенные тики.'
+
+
+def test_activity_measures_cpu_load_per_state(monkeypatch):
+    activity = the_snake.Activity()
+    monkeypatch.setattr(the_snake, 'activity', activity)
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pass
+    activity.set('paused', True)
+    time.sleep(0.1)
+    assert activity.cpu_load(False) < activity.cpu_load(True) / 2, (
+        'На паузе процессорное время должно считаться отдельно.'
+    )
+    assert 'CPU пауза' in activity.report()
@@ -0,0 +1,278 @@
+import copy
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import snake_engine
+from conftest import BASE_DIR
+
+
+def test_engine_import_does_not_require_pygame():
+    result = subprocess.run(
+        [
+            sys.executable, '-c',
+            'import sys, snake_engine; '
+            'assert "pygame" not in sys.modules'
+        ],
+        cwd=BASE_DIR,
+        capture_output=True,
+    )
+    assert result.returncode == 0, (
+        'Модуль `snake_engine` не должен импортировать pygame.\n'
+        f'{result.stderr.decode()}'
+    )
+
+
+def test_step_moves_snake_with_wrap_around():
+    game = snake_engine.GameState()
+    free_cells = game.snake.free_cells
+    game.snake.positions = [0]
+    game.snake.direction = snake_engine.LEFT
+    game.apple.position = game.wrong_product.position = free_cells.cell(1, 1)
+    events, state = game.step()
+    assert state is game
+    assert events == []
+    assert free_cells.coordinates(game.snake.get_head_position()) == (
+        snake_engine.GRID_WIDTH - 1, 0
+    ), 'Змейка должна проходить сквозь стену игрового поля.'
+
+
+def test_step_ignores_reverse_direction():
+    game = snake_engine.GameState()
+    game.snake.direction = snake_engine.RIGHT
+    game.step(snake_engine.LEFT)
+    assert game.snake.direction == snake_engine.RIGHT, (
+        'Змейка не должна разворачиваться в обратном направлении.'
+    )
+
+
+def test_step_apple_increases_length():
+    game = snake_engine.GameState()
+    head = game.snake.get_head_position()
+    game.snake.direction = snake_engine.RIGHT
+    game.apple.position = head + 1
+    events, _ = game.step()
+    assert events == [snake_engine.APPLE_EATEN]
+    assert game.snake.length == 2
+    assert game.apple.position not in game.snake.positions
+
+
+def test_step_wrong_product_resets_snake():
+    game = snake_engine.GameState()
+    game.snake.length = 3
+    head = game.snake.get_head_position()
+    game.snake.direction = snake_engine.DOWN
+    game.wrong_product.position = head + snake_engine.GRID_WIDTH
+    events, _ = game.step()
+    assert events == [snake_engine.WRONG_PRODUCT_EATEN]
+    assert game.snake.length == 1
+    assert list(game.snake.positions) == [snake_engine.CENTER_CELL]
+
+
+def test_step_self_collision_resets_snake():
+    game = snake_engine.GameState()
+    free_cells = game.snake.free_cells
+    game.apple.position = game.wrong_product.position = 0
+    game.snake.length = 5
+    game.snake.positions = [
+        free_cells.cell(x, y) for x, y in ((5, 5), (6, 5), (6, 6), (5, 6))
+    ]
+    game.snake.direction = snake_engine.DOWN
+    events, _ = game.step()
+    assert events == [snake_engine.SELF_COLLISION]
+    assert game.snake.length == 1
+
+
+def test_snake_occupied_follows_positions():
+    snake = snake_engine.Snake()
+    snake.direction = snake_engine.RIGHT
+    for _ in range(10):
+        snake.increase_length()
+        snake.move()
+    for _ in range(5):
+        snake.move()
+    assert snake.length == len(snake.positions) == 11
+    assert set(snake.occupied) == set(snake.positions), (
+        'Множество `occupied` должно совпадать с позициями сегментов змейки.'
+    )
+    assert snake.last not in snake.occupied
+
+
+def test_free_cells_swap_remove():
+    free_cells = snake_engine.FreeCells(width=3, height=2)
+    assert len(free_cells) == 6
+    free_cells.occupy(0)
+    free_cells.occupy(0)
+    assert 0 not in free_cells
+    assert len(free_cells) == 5
+    free_cells.release(0)
+    assert 0 not in free_cells, (
+        'Ячейка должна оставаться занятой, пока её занимает хотя бы один '
+        'объект.'
+    )
+    free_cells.release(0)
+    assert 0 in free_cells
+    for index, cell in enumerate(free_cells.cells):
+        assert free_cells.indexes[cell] == index
+
+
+def test_free_cells_follow_game():
+    game = snake_engine.GameState()
+    for _ in range(2000):
+        game.step(random.choice(
+            (snake_engine.UP, snake_engine.DOWN,
+             snake_engine.LEFT, snake_engine.RIGHT)
+        ))
+        taken = {
+            *game.snake.positions,
+            game.apple.position,
+            game.wrong_product.position
+        }
+        assert not taken & set(game.snake.free_cells.cells), (
+            'Занятые ячейки не должны попадать в индекс свободных ячеек.'
+        )
+        assert len(game.snake.free_cells) == (
+            snake_engine.GRID_WIDTH * snake_engine.GRID_HEIGHT - len(taken)
+        )
+
+
+def test_board_full_is_detected():
+    game = snake_engine.GameState()
+    free_cells = game.snake.free_cells
+    head = game.snake.get_head_position()
+    game.snake.direction = snake_engine.RIGHT
+    game.apple.position = head + 1
+    game.snake.length = 2
+    for cell in list(free_cells.cells):
+        free_cells.occupy(cell)
+    events, _ = game.step()
+    assert events[:2] == [snake_engine.APPLE_EATEN, snake_engine.BOARD_FULL], (
+        'Если яблоку негде появиться, игра должна сообщить о заполнении '
+        'поля, а не зависнуть.'
+    )
+
+
+def test_large_board_uses_sparse_free_cells():
+    game = snake_engine.GameState(seed=1, width=10_000, height=10_000)
+    free_cells = game.snake.free_cells
+    assert isinstance(free_cells, snake_engine.SparseFreeCells)
+    assert free_cells.coordinates(game.snake.get_head_position()) == (
+        5000, 5000
+    )
+    assert len(free_cells.occupancy) == 3, (
+        'Индекс свободных ячеек большого поля должен хранить только '
+        'занятые ячейки.'
+    )
+    assert len(free_cells) == 10_000 * 10_000 - 3
+    assert game.apple.position not in free_cells
+    game.snake.positions = [0]
+    game.snake.direction = snake_engine.UP
+    game.step()
+    assert free_cells.coordinates(game.snake.get_head_position()) == (
+        0, 9999
+    )
+
+
+def test_memory_per_segment_and_game():
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        games = [snake_engine.GameState(seed=seed) for seed in range(100)]
+        per_game = (tracemalloc.get_traced_memory()[0] - start) / len(games)
+        free_cells = snake_engine.FreeCells(128, 128)
+        snake = snake_engine.Snake(free_cells=free_cells)
+        start = tracemalloc.get_traced_memory()[0]
+        snake.positions = range(10_000)
+        snake.length = 10_000
+        per_segment = (tracemalloc.get_traced_memory()[0] - start) / 10_000
+    finally:
+        tracemalloc.stop()
+    assert per_game < 20_000, (
+        f'Игра без графики занимает {per_game:.0f} байт, ожидалось меньше '
+        '20000.'
+    )
+    assert per_segment < 16, (
+        f'Сегмент змейки занимает {per_segment:.1f} байт, ожидалось меньше '
+        '16.'
+    )
+
+
+def game_state(game):
+    snake = game.snake
+    return (
+        game.ticks, snake.positions, snake.direction, snake.length,
+        snake.max_length, game.apple.position, game.wrong_product.position,
+        len(snake.free_cells), snake.rng.getstate()
+    )
+
+
+def play(game, actions):
+    for action in actions:
+        game.step(action)
+    return game_state(game)
+
+
+def test_clone_is_independent_and_deterministic():
+    game = snake_engine.GameState(seed=5)
+    actions = [
+        random.choice((None, snake_engine.UP, snake_engine.LEFT))
+        for _ in range(3000)
+    ]
+    play(game, actions[:500])
+    clone = game.clone()
+    assert game_state(clone) == game_state(game)
+    clone_result = play(clone, actions[500:])
+    assert game_state(game)[0] == 500, (
+        'Ход клона не должен менять исходную игру.'
+    )
+    assert play(game, actions[500:]) == clone_result, (
+        'Клон должен развиваться так же, как исходная игра.'
+    )
+
+
+def test_restore_rolls_back_game():
+    game = snake_engine.GameState(seed=9)
+    actions = [
+        random.choice((None, snake_engine.DOWN, snake_engine.RIGHT))
+        for _ in range(1000)
+    ]
+    snapshot = game.snapshot()
+    first_run = play(game, actions)
+    snake = game.snake
+    game.restore(snapshot)
+    assert game.snake is snake, 'Объекты игры должны сохраняться.'
+    assert play(game, actions) == first_run
+    game.restore(snapshot)
+    assert game.ticks == 0, 'Снимок можно восстанавливать многократно.'
+
+
+def test_clone_of_long_snake_is_fast():
+    game = snake_engine.GameState(seed=1)
+    game.apple.position = game.wrong_product.position = 1100
+    game.snake.positions = range(1000)
+    game.snake.length = 1000
+    durations = []
+    for _ in range(200):
+        start = time.perf_counter_ns()
+        game.clone()
+        durations.append(time.perf_counter_ns() - start)
+    durations.sort()
+    assert durations[len(durations) // 2] < 100_000, (
+        'Клонирование игры со змейкой из 1000 сегментов должно занимать '
+        'микросекунды.'
+    )
+
+
+def test_game_random_is_seeded_and_copyable():
+    rng = snake_engine.GameRandom(123)
+    other = snake_engine.GameRandom(123)
+    assert [rng.randrange(1000) for _ in range(10)] == [
+        other.randrange(1000) for _ in range(10)
+    ], 'Генераторы с одинаковым сидом должны давать одинаковые числа.'
+    clone = copy.copy(rng)
+    assert [clone.getrandbits(100) for _ in range(5)] == [
+        rng.getrandbits(100) for _ in range(5)
+    ]
+    assert 0 <= rng.random() < 1
@@ -0,0 +1,42 @@
+import snake_engine
+import snake_fuzz
+
+
+def test_million_ticks_keep_invariants():
+    failures = snake_fuzz.run_fuzz(games=100, ticks=10_000)
+    assert not failures, (
+        'Правила игры нарушены:\n'
+        + '\n'.join(map(snake_fuzz.format_failure, failures))
+    )
+
+
+def test_shrink_returns_minimal_input():
+    def fails(actions):
+        return actions.count(3) >= 2 and 4 in actions
+
+    actions = bytes((1, 3, 0, 4, 2, 3, 3, 1, 4, 0))
+    shrunk = snake_fuzz.shrink(actions, fails)
+    assert fails(shrunk)
+    assert len(shrunk) == 3, 'Из ввода должно быть удалено всё лишнее.'
+
+
+def test_engine_bug_is_found_and_shrunk(monkeypatch):
+    original_reset = snake_engine.Snake.reset
+
+    def broken_reset(snake):
+        original_reset(snake)
+        snake.max_length = snake.length
+
+    monkeypatch.setattr(snake_engine.Snake, 'reset', broken_reset)
+    failure = snake_fuzz.fuzz_game(seed=3, ticks=10_000)
+    assert failure is not None, 'Нарушение инварианта должно быть найдено.'
+    seed, width, height, actions, message = failure
+    assert 'Максимальная длина' in message
+    tick, _ = snake_fuzz.play_input(seed, width, height, actions)
+    assert tick == len(actions) - 1, (
+        'Сокращённый ввод должен воспроизводить нарушение на последнем тике.'
+    )
+    for index in range(len(actions)):
+        assert snake_fuzz.play_input(
+            seed, width, height, actions[:index] + actions[index + 1:]
+        ) is None, 'Из сокращённого ввода нельзя удалить ни одного кода.'
@@ -0,0 +1,138 @@
+from random import Random
+
+import pygame
+import pytest
+
+import the_snake
+from snake_engine import (
+    RIGHT, TURNS, WALL_COLLISION, FreeCells, GameRandom, GameState, Snake
+)
+from snake_levels import load_level, parse_level
+
+LEVEL = (
+    '#####\n'
+    '#...#\n'
+    '.....\n'
+    '#...#\n'
+    '#####\n'
+)
+
+
+def test_parse_level_compiles_wall_map():
+    level = parse_level('#..\n..#\n#\n', 'small')
+    assert (level.width, level.height) == (3, 3)
+    assert level.walls == bytes((1, 0, 0, 0, 0, 1, 1, 0, 0)), (
+        'Короткие строки должны дополняться пустыми ячейками.'
+    )
+    with pytest.raises(ValueError):
+        FreeCells(3, 3, parse_level('...\n.#.\n...\n').walls)
+
+
+def test_load_level_caches_text_and_png(tmp_path):
+    text_path = tmp_path / 'level.txt'
+    text_path.write_text(LEVEL, encoding='utf-8')
+    level = load_level(str(text_path))
+    assert load_level(str(text_path)) is level, (
+        'Повторная загрузка уровня должна брать его из кэша.'
+    )
+    image = pygame.Surface((level.width, level.height))
+    image.fill((255, 255, 255))
+    for cell, wall in enumerate(level.walls):
+        if wall:
+            y, x = divmod(cell, level.width)
+            image.set_at((x, y), (0, 0, 0))
+    image_path = tmp_path / 'level.png'
+    pygame.image.save(image, str(image_path))
+    assert load_level(str(image_path)).walls == level.walls
+
+
+def test_products_never_land_on_walls():
+    level = parse_level(LEVEL)
+    game = GameState(seed=0, width=5, height=5, walls=level.walls)
+    rng = Random(0)
+    for _ in range(2000):
+        game.step(rng.choice((None, *TURNS[game.snake.direction])))
+        for position in (
+            game.apple.position, game.wrong_product.position,
+            *game.snake.positions
+        ):
+            assert not level.walls[position], (
+                'Продукты и змейка не должны оказываться на стенах.'
+            )
+
+
+def test_snake_hits_wall():
+    level = parse_level(LEVEL)
+    snake = Snake(free_cells=FreeCells(5, 5, level.walls), rng=GameRandom(0))
+    game = GameState(snake, seed=0)
+    # Продукты убираются с пути змейки в нижнюю строку без стен.
+    game.apple.position, game.wrong_product.position = 16, 18
+    snake.direction = RIGHT
+    for _ in range(3):
+        events, _ = game.step()
+    assert snake.get_head_position() == 10, (
+        'Проход сквозь край поля без стены должен быть разрешён.'
+    )
+    game.snake.positions = (7,)
+    game.snake.direction = RIGHT
+    game.step()
+    events, _ = game.step()
+    assert WALL_COLLISION in events
+    assert game.snake.get_head_position() == 12
+
+
+def test_walls_are_drawn_only_inside_small_board(monkeypatch):
+    level = parse_level(LEVEL)
+    monkeypatch.setattr(the_snake, 'camera', the_snake.Camera(5, 5))
+    monkeypatch.setattr(the_snake, 'level_walls', level.walls)
+    the_snake.redraw_board()
+    screen = the_snake.get_screen()
+    size = the_snake.GRID_SIZE
+    assert screen.get_at((1, 1))[:3] == the_snake.WALL_COLOR
+    assert screen.get_at((size + 1, size + 1))[:3] == (
+        the_snake.BOARD_BACKGROUND_COLOR
+    )
+    for point in ((5 * size + 1, 1), (1, 5 * size + 1), (20 * size, 1)):
+        assert screen.get_at(point)[:3] == the_snake.BOARD_BACKGROUND_COLOR, (
+            'За пределами поля не должно быть копий стен.'
+        )
+    the_snake.dirty_rects.clear()
+
+
+def test_walls_are_drawn_from_visible_part_of_large_board(monkeypatch):
+    width, height = 2000, 2000
+    walls = bytearray(width * height)
+    walls[3 * width + 1999] = walls[1999 * width + 2] = 1
+    camera = the_snake.Camera(width, height)
+    camera.x, camera.y = 1998, 1998
+    monkeypatch.setattr(the_snake, 'camera', camera)
+    monkeypatch.setattr(the_snake, 'level_walls', bytes(walls))
+    the_snake.redraw_board()
+    screen = the_snake.get_screen()
+    size = the_snake.GRID_SIZE
+    for x, y in ((1, 5), (4, 1)):
+        assert screen.get_at((x * size + 1, y * size + 1))[:3] == (
+            the_snake.WALL_COLOR
+        ), 'Стены должны отрисовываться с переходом через край поля.'
+    assert screen.get_at((1, 1))[:3] == the_snake.BOARD_BACKGROUND_COLOR
+    the_snake.dirty_rects.clear()
+
+
+def test_background_is_rendered_once_per_camera_position(monkeypatch):
+    level = parse_level(LEVEL)
+    camera = the_snake.Camera(50, 50)
+    monkeypatch.setattr(the_snake, 'camera', camera)
+    monkeypatch.setattr(the_snake, 'level_walls', level.walls * 100)
+    monkeypatch.setattr(the_snake, 'background', the_snake.Background())
+    the_snake.redraw_board()
+    surface = the_snake.background.surface
+    the_snake.redraw_board()
+    assert the_snake.background.surface is surface, (
+        'Фон со стенами не должен отрисовываться заново без сдвига камеры.'
+    )
+    camera.follow(49 * 50 + 49)
+    the_snake.redraw_board()
+    assert the_snake.background.surface is not surface, (
+        'После сдвига камеры фон должен отрисовываться заново.'
+    )
+    the_snake.dirty_rects.clear()
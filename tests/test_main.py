@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+
 import pytest
 
 import the_snake
@@ -17,3 +21,19 @@ def test_main_run_without_exceptions():
             f'`{type(error).__name__}: {error}`\n\n'
             'Убедитесь, что функция работает корректно.'
         )
+
+
+def test_import_does_not_open_window():
+    script = (
+        'import pygame, the_snake\n'
+        'assert not pygame.display.get_init()\n'
+        'assert "screen" not in vars(the_snake)\n'
+        'assert isinstance(the_snake.screen, pygame.Surface)\n'
+        'assert pygame.display.get_init() and not pygame.mixer.get_init()'
+    )
+    subprocess.run(
+        (sys.executable, '-c', script),
+        check=True,
+        cwd=os.path.dirname(the_snake.__file__),
+        env={**os.environ, 'SDL_VIDEODRIVER': 'dummy'}
+    )
@@ -0,0 +1,92 @@
+from random import Random
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from snake_engine import TURNS, GameState
+from snake_observation import (
+    APPLE, BASE_CHANNELS, BODY, DIRECTIONS, HEAD, WRONG_PRODUCT,
+    ObservationEncoder
+)
+
+
+def expected_observation(game, directions):
+    free_cells = game.snake.free_cells
+    channels = BASE_CHANNELS + (len(DIRECTIONS) if directions else 0)
+    expected = np.zeros((channels, free_cells.height * free_cells.width),
+                        dtype=np.uint8)
+    expected[BODY, game.snake.positions] = 1
+    head = game.snake.get_head_position()
+    expected[HEAD, head] = 1
+    expected[APPLE, game.apple.position] = 1
+    expected[WRONG_PRODUCT, game.wrong_product.position] = 1
+    if directions:
+        channel = BASE_CHANNELS + DIRECTIONS.index(game.snake.direction)
+        expected[channel, head] = 1
+    return expected.reshape(channels, free_cells.height, free_cells.width)
+
+
+def random_steps(game, encoder, steps, seed=0):
+    rng = Random(seed)
+    for _ in range(steps):
+        events, _ = game.step(
+            rng.choice((None, *TURNS[game.snake.direction]))
+        )
+        yield encoder.update(events)
+
+
+@pytest.mark.parametrize('crop_radius', (0, 2, 6))
+def test_incremental_observation_matches_rebuild(crop_radius):
+    game = GameState(seed=1, width=8, height=6)
+    encoder = ObservationEncoder(game, crop_radius, directions=True)
+    for observation in random_steps(game, encoder, 2000):
+        assert np.array_equal(
+            observation, expected_observation(game, True)
+        ), 'Наблюдение должно совпадать с построенным заново.'
+
+
+def test_observation_is_read_only_view():
+    game = GameState(seed=2)
+    encoder = ObservationEncoder(game)
+    observation = encoder.observation
+    assert observation.base is encoder.padded, (
+        'Наблюдение должно быть представлением, а не копией.'
+    )
+    with pytest.raises(ValueError):
+        observation[BODY, 0, 0] = 1
+    with pytest.raises(ValueError):
+        encoder.crop()[BODY, 0, 0] = 1
+
+
+def test_crop_is_centered_on_head_and_wraps():
+    game = GameState(seed=3, width=9, height=7)
+    radius = 3
+    encoder = ObservationEncoder(game, radius)
+    for observation in random_steps(game, encoder, 500):
+        y, x = divmod(game.snake.get_head_position(), 9)
+        expected = np.roll(
+            observation, (radius - y, radius - x), axis=(1, 2)
+        )[:, :2 * radius + 1, :2 * radius + 1]
+        assert np.array_equal(encoder.crop(), expected), (
+            'Окрестность должна быть окружением головы на замкнутом поле.'
+        )
+
+
+def test_update_does_not_allocate_arrays():
+    game = GameState(seed=4, width=100, height=100)
+    game.snake.length = 5000
+    encoder = ObservationEncoder(game, crop_radius=5)
+    steps = random_steps(game, encoder, 1000)
+    for _ in range(100):
+        next(steps)
+    tracemalloc.start()
+    try:
+        for _ in steps:
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < encoder.padded.nbytes, (
+        'Обновление наблюдения не должно выделять массивы.'
+    )
@@ -0,0 +1,42 @@
+import csv
+
+import snake_profiler
+import the_snake
+
+
+def test_ring_buffer_keeps_last_frames():
+    profiler = snake_profiler.FrameProfiler(('step',), capacity=4)
+    for _ in range(6):
+        profiler.mark('step')
+        profiler.mark('step')
+        profiler.end_frame()
+    assert profiler.frames == 6
+    assert len(profiler.recorded('step')) == 4, (
+        'Профилировщик должен хранить замеры только последних кадров.'
+    )
+    assert all(sample >= 0 for sample in profiler.recorded('frame'))
+    mean, p99 = profiler.stats('frame')
+    assert 0 <= mean <= p99
+
+
+def test_dump_csv(tmp_path):
+    profiler = snake_profiler.FrameProfiler(('a', 'b'), capacity=2)
+    for _ in range(3):
+        profiler.mark('a')
+        profiler.mark('b')
+        profiler.end_frame()
+    path = tmp_path / 'trace.csv'
+    profiler.dump_csv(str(path))
+    with open(path, encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ['frame_number', 'a_ns', 'b_ns', 'frame_ns']
+    assert [row[0] for row in rows[1:]] == ['1', '2']
+
+
+def test_overlay_draws_dirty_rect():
+    profiler = snake_profiler.FrameProfiler(the_snake.PROFILE_PHASES)
+    profiler.end_frame()
+    the_snake.dirty_rects.clear()
+    the_snake.ProfilerOverlay(profiler).draw()
+    assert len(the_snake.dirty_rects) == 1
+    the_snake.dirty_rects.clear()
@@ -0,0 +1,150 @@
+import snake_engine
+import the_snake
+
+
+def test_draw_cell_collects_dirty_rect(apple):
+    the_snake.dirty_rects.clear()
+    apple.draw()
+    y, x = divmod(apple.position, the_snake.GRID_WIDTH)
+    corner = (x * the_snake.GRID_SIZE, y * the_snake.GRID_SIZE)
+    assert the_snake.dirty_rects == [
+        (*corner, the_snake.GRID_SIZE, the_snake.GRID_SIZE)
+    ], 'Метод `draw_cell` должен добавлять ячейку в `dirty_rects`.'
+    center = (
+        corner[0] + the_snake.GRID_SIZE // 2,
+        corner[1] + the_snake.GRID_SIZE // 2
+    )
+    assert the_snake.screen.get_at(center)[:3] == the_snake.APPLE_COLOR
+    assert the_snake.screen.get_at(corner)[:3] == (
+        the_snake.CELL_BOUNDARY_COLOR
+    )
+    the_snake.dirty_rects.clear()
+
+
+def test_cell_sprites_are_cached(snake):
+    snake.draw_cell(snake.get_head_position())
+    snake.draw_cell(snake.get_head_position())
+    sprite = the_snake.get_cell_sprite(
+        the_snake.SNAKE_COLOR, the_snake.CELL_BOUNDARY_COLOR
+    )
+    assert sprite is the_snake.get_cell_sprite(
+        the_snake.SNAKE_COLOR, the_snake.CELL_BOUNDARY_COLOR
+    ), 'Ячейки одного цвета должны отрисовываться один раз.'
+    the_snake.dirty_rects.clear()
+
+
+def test_camera_follows_head_on_large_board():
+    camera = the_snake.Camera(1000, 1000)
+    assert (camera.width, camera.height) == (
+        the_snake.GRID_WIDTH, the_snake.GRID_HEIGHT
+    )
+    assert camera.follow(500_500)
+    assert camera.to_screen(500_500) == (
+        the_snake.GRID_WIDTH // 2 * the_snake.GRID_SIZE,
+        the_snake.GRID_HEIGHT // 2 * the_snake.GRID_SIZE
+    )
+    assert not camera.follow(500_501), (
+        'Камера не должна двигаться, пока голова далеко от края экрана.'
+    )
+    assert camera.to_screen(0) is None, (
+        'Ячейки вне камеры не должны отрисовываться.'
+    )
+    assert camera.follow(999)
+    assert camera.to_screen(0) is not None, (
+        'Камера должна показывать ячейки за краем замкнутого поля.'
+    )
+    assert len(list(camera.cells())) == camera.width * camera.height
+
+
+def test_camera_is_fixed_on_window_sized_board():
+    camera = the_snake.Camera()
+    assert not camera.follow(0)
+    assert camera.to_screen(4 * the_snake.GRID_WIDTH + 3) == (
+        3 * the_snake.GRID_SIZE, 4 * the_snake.GRID_SIZE
+    )
+
+
+def test_redraw_draws_only_visible_segments(monkeypatch):
+    monkeypatch.setattr(the_snake, 'camera', the_snake.Camera(2000, 2000))
+    snake = the_snake.Snake(
+        free_cells=the_snake.FreeCells.for_board(2000, 2000)
+    )
+    snake.positions = [
+        snake.free_cells.cell(x, 1000) for x in range(2000)
+    ]
+    snake.length = len(snake.positions)
+    the_snake.camera.follow(snake.get_head_position())
+    the_snake.dirty_rects.clear()
+
+    def positions(snake):
+        raise AssertionError(
+            'Отрисовка длинной змейки не должна строить список сегментов.'
+        )
+
+    monkeypatch.setattr(the_snake.Snake, 'positions', property(positions))
+    snake.redraw()
+    assert len(the_snake.dirty_rects) == the_snake.GRID_WIDTH, (
+        'Отрисовываться должны только сегменты, видимые камере.'
+    )
+    the_snake.dirty_rects.clear()
+
+
+def test_clone_of_rendered_game_is_headless(monkeypatch):
+    snake = the_snake.Snake()
+    apple = the_snake.Apple(snake.free_cells, rng=snake.rng)
+    wrong_product = the_snake.WrongProduct(snake.free_cells, rng=snake.rng)
+    clone = the_snake.GameState(snake, apple, wrong_product).clone()
+    assert type(clone.snake) is snake_engine.Snake
+    assert type(clone.wrong_product) is snake_engine.WrongProduct
+    monkeypatch.setattr(the_snake, 'hud', the_snake.Hud())
+    the_snake.hud.dirty.clear()
+    clone.snake.direction = the_snake.RIGHT
+    clone.apple.position = clone.snake.get_head_position() + 1
+    events, _ = clone.step()
+    assert events == [the_snake.APPLE_EATEN]
+    assert not the_snake.hud.dirty, (
+        'Клон игры не должен менять состояние отрисовки.'
+    )
+    assert snake.length == 1
+
+
+def test_hud_redraws_only_changed_fields(monkeypatch):
+    hud = the_snake.Hud()
+    monkeypatch.setattr(the_snake, 'hud', hud)
+    snake = the_snake.Snake()
+    hud.update(snake)
+    the_snake.dirty_rects.clear()
+    hud.draw()
+    assert len(the_snake.dirty_rects) == len(the_snake.HUD_FIELDS)
+    the_snake.dirty_rects.clear()
+    hud.draw()
+    assert not the_snake.dirty_rects, (
+        'Неизменившийся HUD не должен перерисовываться.'
+    )
+    assert snake.update_speed(1)
+    assert hud.dirty == {'speed'}
+    hud.draw()
+    assert len(the_snake.dirty_rects) == 1
+    the_snake.dirty_rects.clear()
+
+
+def test_hud_caches_text_and_survives_board_redraw(monkeypatch):
+    hud = the_snake.Hud()
+    monkeypatch.setattr(the_snake, 'hud', hud)
+    hud.update(the_snake.Snake())
+    hud.draw()
+    texts = dict(hud.texts)
+    hud.set('speed', 6)
+    hud.draw()
+    hud.set('speed', 5)
+    hud.draw()
+    assert hud.texts['Скорость: 5'] is texts['Скорость: 5'], (
+        'Повторяющийся текст должен браться из кэша.'
+    )
+    the_snake.dirty_rects.clear()
+    the_snake.redraw_board()
+    hud.draw()
+    assert len(the_snake.dirty_rects) == 1 + len(the_snake.HUD_FIELDS), (
+        'HUD должен перерисовываться поверх перерисованного поля.'
+    )
+    the_snake.dirty_rects.clear()
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from snake_engine import TURNS, GameState
+from snake_replay import ReplayPlayer, ReplayRecorder
+
+
+def state(game):
+    snake = game.snake
+    return (
+        game.ticks, list(snake.positions), snake.direction, snake.speed,
+        snake.max_length, snake.max_length_speed, game.apple.position,
+        game.wrong_product.position
+    )
+
+
+def record_game(seed, ticks):
+    rng = random.Random(seed)
+    game = GameState(seed=seed)
+    recorder = ReplayRecorder(seed)
+    states = [state(game)]
+    for _ in range(ticks):
+        if rng.random() < 0.05:
+            game.snake.update_speed(rng.choice((-1, 1)))
+        action = rng.choice((None, None, *TURNS[game.snake.direction]))
+        recorder.record(game, action)
+        game.step(action)
+        states.append(state(game))
+    return recorder.finish(game), states
+
+
+def test_same_seed_same_game():
+    first, second = GameState(seed=42), GameState(seed=42)
+    for _ in range(500):
+        action = random.choice((None, *TURNS[first.snake.direction]))
+        first.step(action)
+        second.step(action)
+        assert state(first) == state(second), (
+            'Игры с одинаковым сидом и вводом должны совпадать.'
+        )
+
+
+def test_replay_reproduces_game():
+    data, states = record_game(seed=7, ticks=3000)
+    game = ReplayPlayer(data).play()
+    assert state(game) == states[-1], (
+        'Воспроизведение записи должно приводить к тому же состоянию игры.'
+    )
+    assert len(data) < 3000, (
+        'Запись должна хранить только изменения ввода.'
+    )
+
+
+def test_seek_uses_keyframes():
+    data, states = record_game(seed=3, ticks=2000)
+    player = ReplayPlayer(data, keyframe_interval=250)
+    player.play()
+    assert len(player.keyframes) == 2000 // 250 + 1
+    for tick in (1999, 0, 1234, 250, 251, 2000, 17):
+        assert state(player.seek(tick)) == states[tick], (
+            f'Переход к тику {tick} должен восстанавливать состояние игры.'
+        )
+
+
+@pytest.mark.parametrize('data', [b'', b'NOPE\x01\x00', b'SNKR\x03\x07\x28'])
+def test_invalid_replay(data):
+    with pytest.raises(ValueError):
+        ReplayPlayer(data)
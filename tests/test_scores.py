@@ -0,0 +1,103 @@
+import sqlite3
+import time
+
+import pytest
+
+import snake_engine
+import the_snake
+from snake_scores import (
+    SELECT_TOP, ScoreWriter, insert_scores, open_scores, top_scores
+)
+
+
+def test_top_scores_use_rank_index(tmp_path):
+    connection = open_scores(str(tmp_path / 'scores.sqlite3'))
+    insert_scores(connection, [
+        (10, 5, 'a'), (30, 5, 'b'), (30, 9, 'c'), (20, 30, 'd')
+    ])
+    assert top_scores(connection, 3) == [
+        (30, 9, 'c'), (30, 5, 'b'), (20, 30, 'd')
+    ]
+    plan = ' '.join(
+        str(row) for row in connection.execute(
+            'EXPLAIN QUERY PLAN ' + SELECT_TOP, (10,)
+        )
+    )
+    assert 'scores_rank' in plan and 'TEMP B-TREE' not in plan, (
+        'Лучшие результаты должны выбираться по индексу без сортировки.'
+    )
+    connection.close()
+
+
+def test_bulk_insert_is_fast(tmp_path):
+    connection = open_scores(str(tmp_path / 'scores.sqlite3'))
+    start = time.perf_counter()
+    insert_scores(connection, (
+        (length % 1000, length % 26 + 5, 'bot') for length in range(200_000)
+    ))
+    assert time.perf_counter() - start < 2
+    assert top_scores(connection, 1) == [(999, 30, 'bot')]
+    connection.close()
+
+
+def test_writer_flushes_queue_on_close(tmp_path):
+    path = str(tmp_path / 'scores.sqlite3')
+    writer = ScoreWriter(path, batch_size=7)
+    start = time.perf_counter()
+    for length in range(1000):
+        writer.submit(length, 5, 'player')
+    assert time.perf_counter() - start < 0.1, (
+        'Постановка результата в очередь не должна ждать записи на диск.'
+    )
+    writer.close()
+    connection = open_scores(path)
+    assert connection.execute('SELECT COUNT(*) FROM scores').fetchone() \
+        == (1000,)
+    assert top_scores(connection, 1) == [(999, 5, 'player')]
+    connection.close()
+
+
+def test_writer_reports_thread_error(tmp_path):
+    writer = ScoreWriter(str(tmp_path / 'scores.sqlite3'), queue_size=2)
+    # Такое имя игрока SQLite записать не может: поток записи падает.
+    writer.submit(1, 5, object())
+    writer.thread.join()
+    with pytest.raises(RuntimeError):
+        for _ in range(3):
+            writer.submit(1, 5, 'player')
+    with pytest.raises(RuntimeError) as error:
+        writer.close()
+    assert isinstance(error.value.__cause__, sqlite3.Error), (
+        'Закрытие записи должно поднимать ошибку упавшего потока.'
+    )
+
+
+def test_submit_record_stores_max_length_and_its_speed(tmp_path):
+    path = str(tmp_path / 'scores.sqlite3')
+    rng = snake_engine.GameRandom(4)
+    snake = the_snake.Snake(free_cells=snake_engine.FreeCells(), rng=rng)
+    game = snake_engine.GameState(
+        snake,
+        the_snake.Apple(snake.free_cells, rng=rng),
+        the_snake.WrongProduct(snake.free_cells, rng=rng),
+        seed=4
+    )
+    for _ in range(3):
+        snake.increase_length()
+        the_snake.step_game(game)
+    record_speed = snake.speed
+    assert snake.update_speed(1)
+    game.wrong_product.position = snake.free_cells.neighbor(
+        snake.get_head_position(), snake.direction
+    )
+    events = the_snake.step_game(game)
+    assert snake_engine.WRONG_PRODUCT_EATEN in events
+    the_snake.submit_record(ScoreWriter(path), snake, autopilot=False)
+    connection = open_scores(path)
+    assert top_scores(connection) == [
+        (4, record_speed, the_snake.PLAYER_NAME)
+    ], (
+        'В базу должны записываться рекорд игры и скорость, на которой он '
+        'достигнут.'
+    )
+    connection.close()
@@ -0,0 +1,199 @@
+import asyncio
+import socket
+
+import the_snake
+from snake_arena import FOOD, Arena
+from snake_engine import LEFT, RIGHT
+from snake_protocol import (
+    DIRECTION_CODES, ArenaBoard, MessageReader, encode_message
+)
+from snake_server import ArenaServer
+
+
+def make_server(**kwargs):
+    arena = Arena(snakes=0, food=10, seed=3, width=20, height=15,
+                  track_changes=True)
+    return ArenaServer(arena, tick_rate=1000, **kwargs)
+
+
+class FakeTransport:
+    def __init__(self, buffered=0):
+        self.buffered = buffered
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.data = bytearray()
+
+    def is_closing(self):
+        return False
+
+    def write(self, data):
+        self.data += data
+
+    def close(self):
+        pass
+
+
+def read_board(data, board=None):
+    board = board or ArenaBoard()
+    for message in MessageReader().feed(bytes(data)):
+        board.apply(message)
+    return board
+
+
+def test_message_reader_splits_stream():
+    messages = [
+        encode_message((1, 2), {5: FOOD, 300: 0}),
+        encode_message((1, 3), {cell: 2 for cell in range(100)}),
+    ]
+    stream = b''.join(messages)
+    reader = MessageReader()
+    received = []
+    for start in range(0, len(stream), 7):
+        received += reader.feed(stream[start:start + 7])
+    assert received == MessageReader().feed(stream) and not reader.buffer, (
+        'Сообщения должны собираться из частей потока.'
+    )
+    board = ArenaBoard()
+    board.apply(received[1])
+    assert board.tick == 3 and len(board.cells) == 100
+
+
+def test_deltas_keep_client_board_in_sync():
+    server = make_server()
+    writers = [FakeWriter() for _ in range(5)]
+    clients = [server.connect(writer) for writer in writers]
+    for tick in range(200):
+        server.handle_input(
+            clients[0],
+            bytes((DIRECTION_CODES[(LEFT, RIGHT)[tick // 3 % 2]],))
+        )
+        server.tick()
+    for writer, client in zip(writers, clients):
+        board = read_board(writer.data)
+        assert board.cells == server.arena.contents(), (
+            'Клиент должен восстанавливать поле по изменениям.'
+        )
+        assert board.head == client.snake.get_head_position()
+    snapshot_size = len(server.snapshot(clients[0]))
+    delta_size = len(writers[0].data) - snapshot_size
+    assert delta_size / 200 < snapshot_size, (
+        'Изменения за тик должны быть меньше всего поля.'
+    )
+
+
+def test_slow_client_is_skipped_and_resynced():
+    server = make_server(max_buffer=100)
+    slow, fast = FakeWriter(), FakeWriter()
+    server.connect(slow)
+    server.connect(fast)
+    slow.transport.buffered = 1000
+    received = len(slow.data)
+    for _ in range(20):
+        server.tick()
+    assert len(slow.data) == received, (
+        'Медленному клиенту не должны отправляться тики.'
+    )
+    slow.transport.buffered = 0
+    server.tick()
+    board = ArenaBoard()
+    messages = MessageReader().feed(bytes(slow.data))
+    for message in messages:
+        board.apply(message)
+    assert board.tick == server.arena.ticks
+    assert board.cells == server.arena.contents(), (
+        'Отставший клиент должен получить снимок всего поля.'
+    )
+
+
+def test_snapshot_carries_client_head():
+    server = make_server()
+    client = server.connect(FakeWriter())
+    client.snake.length = 6
+    for _ in range(5):
+        server.handle_input(client, bytes((DIRECTION_CODES[LEFT],)))
+        server.tick()
+    assert client.snake.alive and len(client.snake.body) == 6
+    board = ArenaBoard()
+    board.apply(MessageReader().feed(server.snapshot(client))[0])
+    assert board.head == client.snake.get_head_position(), (
+        'После снимка камера должна следовать за головой змейки.'
+    )
+
+
+def test_disconnect_frees_snake():
+    server = make_server()
+    client = server.connect(FakeWriter())
+    server.disconnect(client)
+    assert not client.snake.alive and not server.clients
+    assert server.connect(FakeWriter()).snake is client.snake
+
+
+async def receive_board(reader, tick):
+    board, messages = ArenaBoard(), MessageReader()
+    while board.tick < tick:
+        for message in messages.feed(await reader.read(1 << 16)):
+            board.apply(message)
+    return board
+
+
+def test_many_clients_over_tcp():
+    async def play():
+        server = make_server()
+        tcp_server = await asyncio.start_server(
+            server.handle_client, 'localhost', 0
+        )
+        port = tcp_server.sockets[0].getsockname()[1]
+        connections = [
+            await asyncio.open_connection('localhost', port)
+            for _ in range(100)
+        ]
+        for _, writer in connections:
+            writer.write(bytes((DIRECTION_CODES[RIGHT],)))
+        async with tcp_server:
+            await server.run(ticks=30)
+            connected = len(server.clients)
+            boards = [
+                await receive_board(reader, 30) for reader, _ in connections
+            ]
+            for _, writer in connections:
+                writer.close()
+            while server.clients:
+                await asyncio.sleep(0.01)
+        return server, connected, boards
+
+    server, connected, boards = asyncio.run(play())
+    assert connected == 100
+    assert all(board.cells == boards[0].cells for board in boards), (
+        'Все клиенты должны видеть одно и то же поле.'
+    )
+    assert len({board.snake_code for board in boards}) == 100
+    assert not server.arena.contents().keys() - server.arena.food, (
+        'Змейки отключившихся клиентов должны убираться с поля.'
+    )
+
+
+def test_client_draws_received_arena():
+    server = make_server()
+    writer = FakeWriter()
+    client = server.connect(writer)
+    for _ in range(5):
+        server.tick()
+    server_side, client_side = socket.socketpair()
+    with server_side, client_side:
+        server_side.sendall(writer.data)
+        client_side.setblocking(False)
+        view = the_snake.ArenaView(ArenaBoard())
+        the_snake.dirty_rects.clear()
+        assert the_snake.receive_arena(client_side, MessageReader(), view)
+    assert view.board.head == client.snake.get_head_position()
+    assert (the_snake.camera.board_width, the_snake.camera.board_height) \
+        == (20, 15)
+    assert the_snake.dirty_rects, 'Клиент должен отрисовать поле арены.'
+    the_snake.dirty_rects.clear()
+    the_snake.camera = the_snake.Camera()
@@ -0,0 +1,42 @@
+import pytest
+
+import snake_tournament
+
+POLICIES = [
+    'snake_tournament:greedy_policy',
+    'snake_tournament:random_policy'
+]
+
+
+def test_tournament_summaries():
+    results = snake_tournament.run_tournament(
+        POLICIES, games=6, seed=10, max_ticks=300, workers=2, batch_size=4
+    )
+    assert list(results) == POLICIES
+    for summaries in results.values():
+        assert len(summaries) == 6 * snake_tournament.SUMMARY_SIZE
+        ticks = summaries[1::snake_tournament.SUMMARY_SIZE]
+        assert all(0 < game_ticks <= 300 for game_ticks in ticks)
+    table = snake_tournament.format_table(results)
+    assert all(policy in table for policy in POLICIES)
+
+
+def test_games_are_reproducible_by_seed():
+    policy = snake_tournament.greedy_policy
+    assert (
+        snake_tournament.play_game(policy, seed=3, max_ticks=500)
+        == snake_tournament.play_game(policy, seed=3, max_ticks=500)
+    ), 'Игры с одинаковым сидом должны заканчиваться одинаково.'
+
+
+@pytest.mark.parametrize(
+    'path, error',
+    (
+        ('snake_tournament.greedy_policy', ValueError),
+        ('snake_tournament:TIMEOUT', TypeError),
+        ('snake_tournament:missing', AttributeError),
+    )
+)
+def test_load_policy_errors(path, error):
+    with pytest.raises(error):
+        snake_tournament.load_policy(path)
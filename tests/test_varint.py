@@ -0,0 +1,18 @@
+import pytest
+
+from snake_varint import decode_varints, encode_varint
+
+
+def test_varint_round_trip():
+    values = [0, 1, 127, 128, 300, 2**64 - 1]
+    data = bytearray()
+    for value in values:
+        encode_varint(value, data)
+    assert list(decode_varints(data)) == values
+
+
+def test_truncated_varint_is_rejected():
+    data = bytearray()
+    encode_varint(300, data)
+    with pytest.raises(ValueError):
+        list(decode_varints(data[:-1]))
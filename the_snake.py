@@ -23,33 +23,57 @@
         единицу.
         левая или правая клавиша CTRL - уменьшение скорости змейки на 1
         единицу.
+    - Пауза: клавиша P. Игра также встаёт на паузу, когда окно теряет
+        фокус или сворачивается, и продолжается, когда окно снова активно.
     - Выход из игры: клавиша Esc.
 """
-from random import choice, randint
-from typing import Optional
+from collections import deque
+from random import Random, getrandbits
+from time import perf_counter, process_time
+from typing import TYPE_CHECKING, Iterator, Optional
+import argparse
+import os
+import socket
 import sys
 
 import pygame as pg
 
-pg.init()
-
-TITLE = (
-    'Змейка. Макс. длина: {max_length} '
-    'на скорости {max_length_speed}. '
-    'Скорость: {speed} (SHIFT ↑, CTRL ↓) '
-    '(Выход: ESC)'
+import snake_engine as engine
+from snake_arena import FOOD
+from snake_levels import load_level
+# Константы игрового поля реэкспортируются для обратной совместимости.
+from snake_engine import (  # noqa: F401
+    APPLE_EATEN, BOARD_FULL, CENTER_SCREEN_POINT, DOWN, GRID_HEIGHT,
+    GRID_SIZE, GRID_WIDTH, LEFT, RIGHT, SCREEN_HEIGHT, SCREEN_WIDTH,
+    SELF_COLLISION, UP, WALL_COLLISION, WRONG_PRODUCT_EATEN, FreeCells,
+    GameState
 )
 
-SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-GRID_SIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
-GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
+# Модули дополнительных возможностей импортируются в функциях, которые их
+# используют: обычный запуск игры не платит за их импорт.
+if TYPE_CHECKING:
+    from snake_autopilot import Autopilot
+    from snake_capture import FrameCapture
+    from snake_profiler import FrameProfiler
+    from snake_protocol import ArenaBoard, MessageReader
+    from snake_replay import ReplayRecorder
+    from snake_scores import ScoreWriter
+
+TITLE = 'Змейка. Скорость: SHIFT ↑, CTRL ↓. Пауза: P. Выход: ESC'
+PAUSED_TITLE = 'Змейка. Пауза. Продолжить: P. Выход: ESC'
 
-# Направления движения.
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# Поля HUD в порядке строк сверху вниз: имя поля и шаблон его текста.
+HUD_FIELDS = {
+    'max_length': 'Макс. длина: {}',
+    'max_length_speed': 'на скорости: {}',
+    'speed': 'Скорость: {}',
+}
+HUD_FONT_SIZE = 20
+# Отступ HUD от левого нижнего угла экрана и отступ текста внутри строки.
+HUD_MARGIN = 4
+HUD_PADDING = 3
+# Максимальное количество строк в кэше отрисованного текста HUD.
+HUD_TEXT_CACHE_SIZE = 256
 
 # Словарь с привязкой текущего направления движения змейки и клавиш
 # клавиатуры со следующим направлением движения змейки.
@@ -77,52 +101,538 @@ SPEED_ACCELERATIONS = {
 }
 ACCELERATION_CONTROL_BUTTONS = {*SPEED_ACCELERATIONS}
 
+# Максимальное количество поворотов, ожидающих применения. Повороты
+# применяются по одному за тик игры, лишние нажатия отбрасываются.
+TURN_QUEUE_SIZE = 3
+
+# События pygame, которые обрабатывает игра. Остальные события
+# отбрасываются, не попадая в очередь.
+ALLOWED_EVENTS = [
+    pg.QUIT, pg.KEYDOWN, pg.WINDOWFOCUSLOST, pg.WINDOWFOCUSGAINED,
+    pg.WINDOWMINIMIZED, pg.WINDOWRESTORED, pg.WINDOWMAXIMIZED,
+    pg.WINDOWHIDDEN, pg.WINDOWSHOWN
+]
+PAUSE_BUTTON = pg.K_p
+# События окна и признаки активности, которые они меняют: фокус окна
+# или видимость окна.
+WINDOW_STATE_EVENTS = {
+    pg.WINDOWFOCUSLOST: ('focused', False),
+    pg.WINDOWFOCUSGAINED: ('focused', True),
+    pg.WINDOWMINIMIZED: ('visible', False),
+    pg.WINDOWHIDDEN: ('visible', False),
+    pg.WINDOWRESTORED: ('visible', True),
+    pg.WINDOWMAXIMIZED: ('visible', True),
+    pg.WINDOWSHOWN: ('visible', True)
+}
+
+# Клавиши поворота змейки на арене. Недопустимые повороты отбрасывает
+# сервер.
+ARENA_DIRECTIONS = {
+    pg.K_UP: UP,
+    pg.K_DOWN: DOWN,
+    pg.K_LEFT: LEFT,
+    pg.K_RIGHT: RIGHT
+}
+# Максимальное количество байт, принимаемых от сервера арены за кадр.
+ARENA_RECEIVE_SIZE = 1 << 16
+
 BOARD_BACKGROUND_COLOR = (211, 211, 211)
 CELL_BOUNDARY_COLOR = (93, 216, 228)
 APPLE_COLOR = (255, 0, 0)
 WRONG_PRODUCT_COLOR = (255, 165, 0)
 SNAKE_COLOR = (76, 187, 23)
+OTHER_SNAKE_COLOR = (30, 90, 160)
+WALL_COLOR = (90, 90, 90)
+
+# Частота кадров: с ней опрашивается клавиатура и обновляется экран.
+# Игра при этом продвигается с частотой, равной скорости змейки.
+FPS = 60
+# События, которыми заканчивается жизнь змейки: после них змейка
+# сбрасывается и экран перерисовывается целиком.
+LIFE_END_EVENTS = {
+    SELF_COLLISION, WALL_COLLISION, WRONG_PRODUCT_EATEN, BOARD_FULL
+}
+# Имена игроков в таблице рекордов.
+PLAYER_NAME = 'player'
+AUTOPILOT_NAME = 'autopilot'
+
+# Максимальное количество тиков игры, которое можно догнать за один кадр
+# после долгой задержки (например, при перетаскивании окна).
+MAX_CATCH_UP_STEPS = 5
+
+# Количество ячеек у края экрана: если голова змейки подходит к краю ближе,
+# то камера центрируется на голове.
+CAMERA_MARGIN = 5
+
+# Фазы кадра, которые замеряет профилировщик.
+PROFILE_PHASES = ('wait', 'handle_keys', 'step', 'draw', 'display_update')
+# Период (в кадрах) обновления текста оверлея профилировщика.
+PROFILE_OVERLAY_REFRESH = 30
+PROFILE_OVERLAY_COLOR = (0, 0, 0)
+PROFILE_OVERLAY_BACKGROUND_COLOR = (255, 255, 255)
+HUD_COLOR = (0, 0, 0)
+HUD_BACKGROUND_COLOR = (255, 255, 255)
+
+# Прямоугольники экрана, изменившиеся за текущий кадр. Передаются в
+# pg.display.update, чтобы обновлять только изменённые ячейки.
+dirty_rects = []
+
+# Кэш заранее отрисованных ячеек. Ключ - пара из цвета ячейки и цвета
+# её границы.
+cell_sprites = {}
+
+# Карта стен уровня текущей игры - байт на ячейку, 1 - стена, или None,
+# если стен нет.
+level_walls = None
+
+
+def init_pygame() -> None:
+    """Инициализирует подсистемы pygame, которые использует игра.
+
+    Инициализируется только дисплей, а вместе с ним и события. Часы
+    pygame работают без инициализации, шрифт инициализируется при
+    первой отрисовке текста, а звук и джойстики не нужны игре.
+    """
+    if not pg.display.get_init():
+        pg.display.init()
+
+
+def get_screen() -> pg.Surface:
+    """Возвращает экран игры. При первом вызове открывает окно."""
+    global screen
+    try:
+        return screen
+    except NameError:
+        init_pygame()
+        screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
+        return screen
+
+
+def get_clock() -> pg.time.Clock:
+    """Возвращает часы игры. При первом вызове создаёт их."""
+    global clock
+    try:
+        return clock
+    except NameError:
+        clock = pg.time.Clock()
+        return clock
+
+
+def __getattr__(name: str) -> object:
+    """Создаёт экран и часы игры при первом обращении к ним.
+
+    Поэтому импорт модуля не инициализирует pygame и не открывает окно.
+
+    Параметры:
+        name: Имя атрибута модуля.
+    """
+    if name == 'screen':
+        return get_screen()
+    if name == 'clock':
+        return get_clock()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def get_cell_sprite(
+    cell_color: tuple[int, ...],
+    cell_boundary_color: tuple[int, ...]
+) -> pg.Surface:
+    """Возвращает заранее отрисованную ячейку заданных цветов.
+
+    Параметры:
+        cell_color: Цвет ячейки.
+        cell_boundary_color: Цвет границы ячейки.
+    """
+    key = (cell_color, cell_boundary_color)
+    sprite = cell_sprites.get(key)
+    if sprite is None:
+        sprite = pg.Surface((GRID_SIZE, GRID_SIZE))
+        sprite.fill(cell_color)
+        pg.draw.rect(sprite, cell_boundary_color, sprite.get_rect(), 1)
+        cell_sprites[key] = sprite
+    return sprite
+
 
-CENTER_SCREEN_POINT = ((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))
+class Camera:
+    """Класс для представления камеры - видимой на экране части поля.
 
-screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
-clock = pg.time.Clock()
+    Игровое поле может быть больше окна. Камера показывает прямоугольник
+    ячеек размером не больше GRID_WIDTH x GRID_HEIGHT и следует за головой
+    змейки. Ячейки вне камеры не отрисовываются, поэтому стоимость
+    отрисовки не зависит от площади поля. Поле замкнуто, поэтому
+    видимая область может переходить через край поля.
+
+    Атрибуты:
+        board_width: Ширина игрового поля в ячейках.
+        board_height: Высота игрового поля в ячейках.
+        width: Ширина видимой области в ячейках.
+        height: Высота видимой области в ячейках.
+        x: Столбец поля, который отображается у левого края экрана.
+        y: Строка поля, которая отображается у верхнего края экрана.
+    """
+
+    def __init__(
+        self,
+        board_width: int = GRID_WIDTH,
+        board_height: int = GRID_HEIGHT
+    ) -> None:
+        self.board_width = board_width
+        self.board_height = board_height
+        self.width = min(GRID_WIDTH, board_width)
+        self.height = min(GRID_HEIGHT, board_height)
+        self.x = self.y = 0
+
+    @staticmethod
+    def follow_axis(
+        coordinate: int,
+        origin: int,
+        size: int,
+        board_size: int
+    ) -> int:
+        """Возвращает новое начало видимой области по одной оси.
+
+        Параметры:
+            coordinate: Координата ячейки, за которой следует камера.
+            origin: Текущее начало видимой области.
+            size: Размер видимой области.
+            board_size: Размер игрового поля.
+        """
+        if size == board_size:
+            return 0
+        offset = (coordinate - origin) % board_size
+        if CAMERA_MARGIN <= offset < size - CAMERA_MARGIN:
+            return origin
+        return (coordinate - size // 2) % board_size
+
+    def follow(self, position: int) -> bool:
+        """Центрирует камеру на ячейке, если та подошла к краю экрана.
+
+        Параметры:
+            position: Ячейка, за которой следует камера.
+
+        Возвращает True, если камера сдвинулась и экран нужно перерисовать.
+        """
+        cell_y, cell_x = divmod(position, self.board_width)
+        x = self.follow_axis(cell_x, self.x, self.width, self.board_width)
+        y = self.follow_axis(cell_y, self.y, self.height, self.board_height)
+        if (x, y) == (self.x, self.y):
+            return False
+        self.x, self.y = x, y
+        return True
+
+    def to_screen(self, position: int) -> Optional[tuple[int, int]]:
+        """Возвращает координаты ячейки на экране в пикселях или None,
+        если ячейка не видна.
+
+        Параметры:
+            position: Ячейка игрового поля.
+        """
+        cell_y, cell_x = divmod(position, self.board_width)
+        x = (cell_x - self.x) % self.board_width
+        y = (cell_y - self.y) % self.board_height
+        if x >= self.width or y >= self.height:
+            return None
+        return x * GRID_SIZE, y * GRID_SIZE
+
+    def cells(self) -> Iterator[int]:
+        """Перебирает видимые ячейки игрового поля."""
+        for dy in range(self.height):
+            row = (self.y + dy) % self.board_height * self.board_width
+            for dx in range(self.width):
+                yield row + (self.x + dx) % self.board_width
+
+
+# Камера текущей игры. Функция main заменяет её камерой для поля
+# выбранного размера.
+camera = Camera()
 
-# Флаг для корректировки необходимости обновления информации в заголовке.
-update_title_information = True
 
+class Background:
+    """Класс фона экрана со стенами видимой камере части поля.
 
-class GameObject:
-    """Базовый класс для игровых объектов.
+    Стены отрисовываются на поверхность размером с экран один раз для
+    карты стен и положения камеры, а при перерисовке поля фон копируется
+    на экран одной операцией. Поверхность отрисовывается заново, только
+    когда камера сдвинулась или сменился уровень. Стены читаются из карты
+    только для ячеек камеры, поэтому время отрисовки и память не зависят
+    от площади поля.
 
     Атрибуты:
-        position: Позиция объекта на игровом поле.
+        surface: Отрисованный фон или None, если фон ещё не отрисован.
+        key: Карта стен и положение камеры, для которых отрисован фон.
+    """
+
+    def __init__(self) -> None:
+        self.surface = None
+        self.key = None
+
+    def render(self, size: tuple[int, int]) -> pg.Surface:
+        """Отрисовывает фон со стенами видимой части поля.
+
+        Экран за пределами поля, если поле меньше окна, остаётся залитым
+        фоном.
+
+        Параметры:
+            size: Размер экрана в пикселях.
+        """
+        surface = pg.Surface(size)
+        surface.fill(BOARD_BACKGROUND_COLOR)
+        sprite = get_cell_sprite(WALL_COLOR, WALL_COLOR)
+        surface.blits(
+            [
+                (sprite, (index % camera.width * GRID_SIZE,
+                          index // camera.width * GRID_SIZE))
+                for index, cell in enumerate(camera.cells())
+                if level_walls[cell]
+            ],
+            False
+        )
+        return surface
+
+    def draw(self, screen: pg.Surface) -> None:
+        """Заливает экран фоном и отрисовывает стены видимой части поля.
+
+        Параметры:
+            screen: Поверхность экрана.
+        """
+        if level_walls is None:
+            screen.fill(BOARD_BACKGROUND_COLOR)
+            return
+        key = (
+            level_walls, camera.board_width, camera.x, camera.y,
+            camera.width, camera.height, screen.get_size()
+        )
+        if self.key != key:
+            self.surface = self.render(screen.get_size())
+            self.key = key
+        screen.blit(self.surface, (0, 0))
+
+
+# Фон текущей игры.
+background = Background()
+
+
+def redraw_board(*game_objects: 'GameObject') -> None:
+    """Заливает экран фоном и заново отрисовывает объекты.
+
+    Параметры:
+        game_objects: Игровые объекты для отрисовки.
+    """
+    screen = get_screen()
+    background.draw(screen)
+    dirty_rects.append(screen.get_rect())
+    for game_object in game_objects:
+        game_object.redraw()
+
+
+class Hud:
+    """Класс для отрисовки HUD - статистики игры в левом нижнем углу экрана.
+
+    Каждое поле HUD - отдельная строка со своим признаком изменения.
+    Строка перерисовывается, только если изменилось её значение или её
+    затёрла отрисовка поля. Отрисованный текст кэшируется по строке,
+    поэтому повторяющиеся значения не отрисовываются шрифтом заново.
+    Ширина строки только растёт, чтобы фон строки закрывал прежний текст.
+
+    Атрибуты:
+        fields: Шаблоны текста полей.
+        values: Текущие значения полей.
+        dirty: Имена полей, значения которых изменились.
+        widths: Ширина строки каждого поля в пикселях.
+        font: Шрифт HUD. Создаётся при первой отрисовке.
+        texts: Кэш отрисованного текста. Ключ - строка текста.
+    """
+
+    def __init__(self, fields: dict[str, str] = HUD_FIELDS) -> None:
+        self.fields = fields
+        self.values = {}
+        self.dirty = set(fields)
+        self.widths = dict.fromkeys(fields, 0)
+        self.font = None
+        self.texts = {}
+
+    def set(self, name: str, value: object) -> None:
+        """Меняет значение поля и отмечает поле для перерисовки.
+
+        Параметры:
+            name: Имя поля.
+            value: Новое значение поля.
+        """
+        if self.values.get(name) != value:
+            self.values[name] = value
+            self.dirty.add(name)
+
+    def update(self, snake: engine.Snake) -> None:
+        """Задаёт значения всех полей по объекту "Змейка".
+
+        Параметры:
+            snake: Объект "Змейка".
+        """
+        self.set('max_length', snake.max_length)
+        self.set('max_length_speed', snake.max_length_speed)
+        self.set('speed', snake.speed)
+
+    def render_text(self, text: str) -> pg.Surface:
+        """Возвращает отрисованный текст из кэша.
+
+        Параметры:
+            text: Строка текста.
+        """
+        surface = self.texts.get(text)
+        if surface is None:
+            if self.font is None:
+                pg.font.init()
+                self.font = pg.font.Font(None, HUD_FONT_SIZE)
+            if len(self.texts) >= HUD_TEXT_CACHE_SIZE:
+                self.texts.clear()
+            surface = self.font.render(text, True, HUD_COLOR)
+            self.texts[text] = surface
+        return surface
+
+    def draw(self) -> None:
+        """Отрисовывает изменившиеся и затёртые строки HUD."""
+        screen = get_screen()
+        line_height = HUD_FONT_SIZE
+        bottom = screen.get_height() - HUD_MARGIN
+        top = bottom - line_height * len(self.fields)
+        for index, (name, template) in enumerate(self.fields.items()):
+            rect = pg.Rect(
+                HUD_MARGIN, top + index * line_height,
+                self.widths[name], line_height
+            )
+            if name not in self.dirty and rect.collidelist(dirty_rects) < 0:
+                continue
+            text = self.render_text(template.format(self.values.get(name)))
+            rect.width = self.widths[name] = max(
+                rect.width, text.get_width() + 2 * HUD_PADDING
+            )
+            screen.fill(HUD_BACKGROUND_COLOR, rect)
+            screen.blit(text, (rect.x + HUD_PADDING, rect.y))
+            dirty_rects.append(rect)
+        self.dirty.clear()
+
+
+# HUD текущей игры.
+hud = Hud()
+
+
+class Activity:
+    """Класс для отслеживания паузы игры и загрузки процессора.
+
+    Игра активна, если игрок не поставил паузу, а окно в фокусе и не
+    свёрнуто. Для активного состояния и для паузы отдельно считается
+    процессорное время и настоящее время, проведённые в нём.
+
+    Атрибуты:
+        paused: Пауза, поставленная игроком.
+        focused: Признак фокуса окна.
+        visible: Признак того, что окно не свёрнуто и не скрыто.
+        state: Состояние, время которого сейчас считается: True -
+            игра активна, False - пауза.
+        cpu_times: Процессорное время в каждом состоянии в секундах.
+        wall_times: Настоящее время в каждом состоянии в секундах.
+        started: Настоящее и процессорное время начала текущего замера.
+    """
+
+    def __init__(self) -> None:
+        self.paused = False
+        self.focused = self.visible = self.state = True
+        self.cpu_times = {True: 0.0, False: 0.0}
+        self.wall_times = {True: 0.0, False: 0.0}
+        self.started = (perf_counter(), process_time())
+
+    @property
+    def active(self) -> bool:
+        """Возвращает признак того, что игра должна продвигаться."""
+        return not self.paused and self.focused and self.visible
+
+    def account(self) -> None:
+        """Добавляет время с начала замера к текущему состоянию и
+        начинает новый замер.
+        """
+        wall, cpu = perf_counter(), process_time()
+        self.wall_times[self.state] += wall - self.started[0]
+        self.cpu_times[self.state] += cpu - self.started[1]
+        self.started = (wall, cpu)
+
+    def set(self, name: str, value: bool) -> None:
+        """Меняет признак активности и обновляет заголовок окна.
+
+        Параметры:
+            name: Имя признака: paused, focused или visible.
+            value: Новое значение признака.
+        """
+        self.account()
+        setattr(self, name, value)
+        self.state = self.active
+        pg.display.set_caption(TITLE if self.active else PAUSED_TITLE)
+
+    def cpu_load(self, active: bool) -> Optional[float]:
+        """Возвращает процессорное время на секунду настоящего времени.
+
+        Параметры:
+            active: Состояние: True - игра активна, False - пауза.
+
+        Возвращает None, если в состоянии не было проведено времени.
+        """
+        self.account()
+        wall = self.wall_times[active]
+        return self.cpu_times[active] / wall if wall else None
+
+    def report(self) -> str:
+        """Возвращает строку с загрузкой процессора в обоих состояниях."""
+        return ', '.join(
+            f'{name}: —' if load is None else f'{name}: {load:.1%}'
+            for name, load in (
+                ('CPU активна', self.cpu_load(True)),
+                ('CPU пауза', self.cpu_load(False))
+            )
+        )
+
+
+# Состояние паузы текущей игры.
+activity = Activity()
+
+
+class GameObject(engine.GameObject):
+    """Базовый класс для отрисовки игровых объектов.
+
+    Игровая логика объектов находится в модуле `snake_engine`, классы этого
+    модуля добавляют к ней отрисовку на экране.
+
+    Атрибуты:
+        position: Ячейка объекта на игровом поле.
         body_color: Цвет объекта.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
-        body_color: tuple[int, ...] = BOARD_BACKGROUND_COLOR
+        body_color: tuple[int, ...] = BOARD_BACKGROUND_COLOR,
+        **kwargs
     ) -> None:
-        self.position = CENTER_SCREEN_POINT
-        self.body_color = body_color
+        super().__init__(body_color=body_color, **kwargs)
 
     def draw_cell(
         self,
-        position: tuple[int, ...],
+        position: int,
         cell_color: Optional[tuple[int, ...]] = None
     ) -> None:
-        """Отрисовывает ячейку объекта на экране.
+        """Отрисовывает ячейку объекта на экране, если она видна камере.
 
         Параметры:
-            position: Позиция объекта на игровом поле.
+            position: Ячейка игрового поля.
             cell_color: Цвет ячейки.
         """
+        screen_position = camera.to_screen(position)
+        if screen_position is None:
+            return
         cell_boundary_color = cell_color if cell_color else CELL_BOUNDARY_COLOR
         cell_color = cell_color if cell_color else self.body_color
-        rect = pg.Rect((position[0], position[1]), (GRID_SIZE, GRID_SIZE))
-        pg.draw.rect(screen, cell_color, rect)
-        pg.draw.rect(screen, cell_boundary_color, rect, 1)
+        dirty_rects.append(get_screen().blit(
+            get_cell_sprite(cell_color, cell_boundary_color), screen_position
+        ))
 
     def draw(self) -> None:
         """Отрисовывает объект на экране."""
@@ -131,138 +641,115 @@ class GameObject:
             f'не имеет реализации метода draw.'
         )
 
+    def redraw(self) -> None:
+        """Отрисовывает объект целиком на залитом фоном экране."""
+        self.draw()
 
-class Snake(GameObject):
-    """Класс для представления объекта "Змейка".
+
+class Snake(GameObject, engine.Snake):
+    """Класс для отрисовки объекта "Змейка".
 
     Атрибуты:
-        length: Длина объекта "Змейка".
-        positions: Список, содержащий позиции всех сегментов тела объекта
-            "Змейка".
-        direction: Направление движения объекта "Змейка".
-        speed: Скорость движения объекта "Змейка".
-        max_length: Максимальная величина объекта "Змейка" за игру.
-        max_length_speed: Скорость объекта "Змейка" на момент достижения
-            максимальной длины.
-        last: Позиция последнего сегмента объекта "Змейка".
-        reset_situation: Проверка сброса объекта "Змейка".
+        turns: Очередь нажатых клавиш поворота, ожидающих применения.
     """
 
-    MIN_SNAKE_SPEED = 5
-    MAX_SNAKE_SPEED = 30
+    __slots__ = ('turns',)
 
     def __init__(
         self,
-        body_color: tuple[int, ...] = SNAKE_COLOR
+        body_color: tuple[int, ...] = SNAKE_COLOR,
+        free_cells: Optional[FreeCells] = None,
+        rng: Optional[Random] = None
     ) -> None:
-        super().__init__(body_color)
-        self.reset()
-        self.speed = self.MIN_SNAKE_SPEED
-        self.max_length = self.length
-        self.max_length_speed = self.speed
-        self.last = None
-        self.reset_situation = False
-
-    def reset(self) -> None:
-        """Сбрасывает объект "Змейка" в начальное состояние."""
-        self.length = 1
-        self.positions = [self.position]
-        self.direction = choice((UP, DOWN, RIGHT, LEFT))
-
-    def get_head_position(self) -> tuple[int, ...]:
-        """Возвращает позицию головы объекта "Змейка"."""
-        return self.positions[0]
-
-    def move(self) -> None:
-        """Обновляет позицию объекта "Змейка"."""
-        current_head_position = self.get_head_position()
-        next_head_position = (
-            (current_head_position[0] + self.direction[0] * GRID_SIZE)
-            % SCREEN_WIDTH,
-            (current_head_position[1] + self.direction[1] * GRID_SIZE)
-            % SCREEN_HEIGHT
+        super().__init__(
+            body_color=body_color, free_cells=free_cells, rng=rng
         )
-        if next_head_position in self.positions:
-            self.reset_situation = True
-        else:
-            self.positions.insert(0, next_head_position)
-        if len(self.positions) > self.length:
-            self.last = self.positions.pop()
+        self.turns = deque()
 
-    def update_direction(self, new_direction: tuple[int, ...]) -> None:
-        """Обновляет направление движения объекта "Змейка".
+    def queue_turn(self, key: int) -> None:
+        """Добавляет клавишу поворота в очередь, если в ней есть место.
 
         Параметры:
-            next_direction: Новое направление движения объекта "Змейка".
+            key: Код нажатой клавиши.
+        """
+        if len(self.turns) < TURN_QUEUE_SIZE:
+            self.turns.append(key)
+
+    def next_turn(self) -> Optional[tuple[int, ...]]:
+        """Возвращает направление для следующего тика игры.
+
+        Клавиши извлекаются из очереди, пока не найдётся допустимый
+        поворот для текущего направления движения. Если такого поворота
+        нет, то возвращается None.
         """
-        self.direction = new_direction
+        while self.turns:
+            new_direction = NEW_DIRECTIONS.get(
+                (self.direction, self.turns.popleft())
+            )
+            if new_direction:
+                return new_direction
+        return None
 
-    def update_speed(self, acceleration: int) -> None:
+    def update_speed(self, acceleration: int) -> bool:
         """Обновляет скорость движения объекта "Змейка".
 
         Параметры:
             acceleration: Ускорение движения объекта "Змейка".
         """
-        if (
-            self.MIN_SNAKE_SPEED
-            <= self.speed + acceleration
-            <= self.MAX_SNAKE_SPEED
-        ):
-            self.speed = self.speed + acceleration
-            global update_title_information
-            update_title_information = True
+        if not super().update_speed(acceleration):
+            return False
+        hud.set('speed', self.speed)
+        return True
 
-    def increase_length(self):
+    def increase_length(self) -> bool:
         """Увеличивает длину объекта "Змейка."""
-        self.length += 1
-        if self.length > self.max_length:
-            self.max_length = self.length
-            self.max_length_speed = self.speed
-            global update_title_information
-            update_title_information = True
+        if not super().increase_length():
+            return False
+        hud.set('max_length', self.max_length)
+        hud.set('max_length_speed', self.max_length_speed)
+        return True
 
     def draw(self) -> None:
         """Отрисовывает объект "Змейка" на экране."""
         self.draw_cell(self.get_head_position())
         # Затирание старой позиции хвоста змейки.
-        if self.last:
+        if self.last is not None:
             self.draw_cell(
                 position=self.last,
                 cell_color=BOARD_BACKGROUND_COLOR
             )
 
+    def redraw(self) -> None:
+        """Отрисовывает видимые сегменты объекта "Змейка".
 
-class Apple(GameObject):
-    """Класс для представления объекта "Яблоко".
+        Если змейка длиннее, чем ячеек на экране, то перебираются видимые
+        ячейки, а не сегменты, поэтому время отрисовки ограничено
+        размером экрана.
+        """
+        if self.size <= camera.width * camera.height:
+            segments = self.positions
+        else:
+            segments = [
+                cell for cell in camera.cells() if cell in self.occupied
+            ]
+        for position in segments:
+            self.draw_cell(position)
 
-    Атрибуты:
-        hold_positions: Занятые ячейки.
-    """
 
-    def __init__(
-        self,
-        hold_positions: list[tuple[int, ...]] = [CENTER_SCREEN_POINT],
-        body_color: tuple[int, ...] = APPLE_COLOR
-    ) -> None:
-        super().__init__(body_color)
-        self.randomize_position(hold_positions)
+class Apple(GameObject, engine.Apple):
+    """Класс для отрисовки объекта "Яблоко"."""
 
-    def randomize_position(
+    __slots__ = ()
+
+    def __init__(
         self,
-        hold_positions: list[tuple[int, ...]]
+        free_cells: Optional[FreeCells] = None,
+        body_color: tuple[int, ...] = APPLE_COLOR,
+        rng: Optional[Random] = None
     ) -> None:
-        """Устанавливает случайное положение объекта-продукта на игровом поле.
-
-        Параметры:
-            hold_positions: Занятые ячейки.
-        """
-        while True:
-            self.position = (
-                randint(0, GRID_WIDTH - 1) * GRID_SIZE,
-                randint(0, GRID_HEIGHT - 1) * GRID_SIZE
-            )
-            if self.position not in hold_positions:
-                return
+        super().__init__(
+            body_color=body_color, free_cells=free_cells, rng=rng
+        )
 
     def draw(self) -> None:
         """Отрисовывает объект-продукт на экране."""
@@ -270,86 +757,599 @@ class Apple(GameObject):
 
 
 class WrongProduct(Apple):
-    """Класс для представления объекта "Неправильный продукт"."""
+    """Класс для отрисовки объекта "Неправильный продукт"."""
+
+    __slots__ = ()
 
     def __init__(
         self,
-        hold_positions: list[tuple[int, ...]] = [CENTER_SCREEN_POINT],
-        body_color: tuple[int, ...] = WRONG_PRODUCT_COLOR
+        free_cells: Optional[FreeCells] = None,
+        body_color: tuple[int, ...] = WRONG_PRODUCT_COLOR,
+        rng: Optional[Random] = None
     ) -> None:
-        super().__init__(hold_positions, body_color)
+        super().__init__(free_cells, body_color, rng)
+
+
+class ArenaView(GameObject):
+    """Класс для отрисовки арены, состояние которой присылает сервер.
+
+    Атрибуты:
+        board: Состояние арены на стороне клиента.
+    """
+
+    __slots__ = ('board',)
+
+    def __init__(self, board: 'ArenaBoard') -> None:
+        super().__init__(body_color=SNAKE_COLOR)
+        self.board = board
+
+    def draw_content(self, position: int, code: int) -> None:
+        """Отрисовывает содержимое ячейки арены.
+
+        Параметры:
+            position: Ячейка игрового поля.
+            code: Код содержимого ячейки.
+        """
+        if code == self.board.snake_code:
+            self.draw_cell(position)
+        elif code == FOOD:
+            self.draw_cell(position, APPLE_COLOR)
+        else:
+            self.draw_cell(
+                position, OTHER_SNAKE_COLOR if code else BOARD_BACKGROUND_COLOR
+            )
+
+    def draw_changes(self, changes: dict[int, int]) -> None:
+        """Отрисовывает изменившиеся ячейки арены.
+
+        Параметры:
+            changes: Коды нового содержимого ячеек.
+        """
+        for position, code in changes.items():
+            self.draw_content(position, code)
+
+    def redraw(self) -> None:
+        """Отрисовывает видимые непустые ячейки арены."""
+        cells = self.board.cells
+        for position in camera.cells():
+            if position in cells:
+                self.draw_content(position, cells[position])
+
+
+def handle_arena_keys() -> bytes:
+    """Обрабатывает нажатия клавиш в клиенте арены.
+
+    Возвращает коды направлений нажатых клавиш поворота.
+    """
+    from snake_protocol import DIRECTION_CODES
+    codes = bytearray()
+    for event in pg.event.get():
+        if event.type == pg.QUIT or (
+            event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE
+        ):
+            pg.quit()
+            sys.exit()
+        if event.type == pg.KEYDOWN and event.key in ARENA_DIRECTIONS:
+            codes.append(DIRECTION_CODES[ARENA_DIRECTIONS[event.key]])
+    return bytes(codes)
 
 
 def handle_keys(snake_object: Snake) -> None:
     """Обрабатывает нажатия клавиш пользователем.
 
+    Клавиши поворота добавляются в очередь змейки и применяются по одной
+    за тик игры.
+
     Параметры:
         game_object: Объект класса Snake.
     """
     for event in pg.event.get():
-        if event.type == pg.QUIT:
+        handle_event(event, snake_object)
+
+
+def handle_event(event: pg.event.Event, snake_object: Snake) -> None:
+    """Обрабатывает одно событие pygame.
+
+    Параметры:
+        event: Событие.
+        snake_object: Объект класса Snake.
+    """
+    if event.type == pg.QUIT:
+        pg.quit()
+        sys.exit()
+    if event.type in WINDOW_STATE_EVENTS:
+        activity.set(*WINDOW_STATE_EVENTS[event.type])
+    elif event.type == pg.KEYDOWN:
+        if event.key == pg.K_ESCAPE:
             pg.quit()
             sys.exit()
-        if event.type == pg.KEYDOWN:
-            if event.key == pg.K_ESCAPE:
-                pg.quit()
-                sys.exit()
-            if event.key in DIRECTION_CONTROL_BUTTONS:
-                snake_object.update_direction(
-                    NEW_DIRECTIONS.get(
-                        (snake_object.direction, event.key),
-                        snake_object.direction
-                    )
-                )
-            elif event.key in ACCELERATION_CONTROL_BUTTONS:
-                snake_object.update_speed(
-                    SPEED_ACCELERATIONS[event.key]
-                )
-
-
-def main():
-    """Запускает игру "Змейка"."""
-    global update_title_information
-    snake = Snake()
-    apple = Apple(hold_positions=snake.positions)
-    wrong_product = WrongProduct(
-        hold_positions=[*snake.positions, apple.position]
+        if event.key == PAUSE_BUTTON:
+            activity.set('paused', not activity.paused)
+        elif event.key in DIRECTION_CONTROL_BUTTONS:
+            snake_object.queue_turn(event.key)
+        elif event.key in ACCELERATION_CONTROL_BUTTONS:
+            snake_object.update_speed(SPEED_ACCELERATIONS[event.key])
+
+
+def wait_until_active(
+    snake_object: Snake,
+    profiler: Optional['FrameProfiler'] = None
+) -> None:
+    """Ждёт событий, пока игра на паузе.
+
+    На паузе игра не продвигается и не отрисовывается: поток блокируется в
+    pg.event.wait, поэтому процессор не загружается. Время паузы не
+    попадает в прогресс тика и в замеры кадра: иначе после паузы игра
+    догоняла бы пропущенные тики.
+
+    Параметры:
+        snake_object: Объект класса Snake.
+        profiler: Профилировщик кадров или None.
+    """
+    if activity.active:
+        return
+    while not activity.active:
+        handle_event(pg.event.wait(), snake_object)
+    get_clock().tick()
+    if profiler:
+        profiler.restart_frame()
+
+
+def draw_events(
+    events: list[str],
+    snake: Snake,
+    apple: Apple,
+    wrong_product: WrongProduct
+) -> None:
+    """Отрисовывает изменения игрового поля за один тик игры.
+
+    Если камера сдвинулась за головой змейки или змейка была сброшена, то
+    экран перерисовывается целиком.
+
+    Параметры:
+        events: События тика, которые вернул метод GameState.step.
+        snake: Объект класса Snake.
+        apple: Объект класса Apple.
+        wrong_product: Объект класса WrongProduct.
+    """
+    if (
+        camera.follow(snake.get_head_position())
+        or not LIFE_END_EVENTS.isdisjoint(events)
+    ):
+        redraw_board(snake, apple, wrong_product)
+        return
+    if APPLE_EATEN in events:
+        apple.draw()
+    snake.draw()
+
+
+class ProfilerOverlay:
+    """Класс для отрисовки оверлея с замерами профилировщика кадров.
+
+    Текст оверлея обновляется раз в PROFILE_OVERLAY_REFRESH кадров, а в
+    остальных кадрах на экран копируется уже отрисованная поверхность.
+
+    Атрибуты:
+        profiler: Профилировщик кадров.
+        font: Шрифт оверлея.
+        surface: Отрисованный оверлей.
+    """
+
+    def __init__(self, profiler: 'FrameProfiler') -> None:
+        self.profiler = profiler
+        pg.font.init()
+        self.font = pg.font.Font(None, 20)
+        self.surface = None
+
+    def render(self) -> pg.Surface:
+        """Отрисовывает текст оверлея по текущим замерам."""
+        frame_mean, frame_p99 = self.profiler.stats('frame')
+        lines = [
+            f'FPS: {get_clock().get_fps():.1f}',
+            f'frame: {frame_mean:.2f} ms (p99 {frame_p99:.2f})',
+            activity.report(),
+            *(
+                f'{phase}: {self.profiler.stats(phase)[0]:.3f} ms'
+                for phase in self.profiler.phases
+            )
+        ]
+        rendered = [
+            self.font.render(line, True, PROFILE_OVERLAY_COLOR)
+            for line in lines
+        ]
+        surface = pg.Surface((
+            max(line.get_width() for line in rendered) + 8,
+            sum(line.get_height() for line in rendered) + 8
+        ))
+        surface.fill(PROFILE_OVERLAY_BACKGROUND_COLOR)
+        top = 4
+        for line in rendered:
+            surface.blit(line, (4, top))
+            top += line.get_height()
+        return surface
+
+    def draw(self) -> None:
+        """Отрисовывает оверлей в левом верхнем углу экрана."""
+        if (
+            self.surface is None
+            or self.profiler.frames % PROFILE_OVERLAY_REFRESH == 0
+        ):
+            self.surface = self.render()
+        dirty_rects.append(get_screen().blit(self.surface, (0, 0)))
+
+
+def main(
+    profile: Optional[bool] = None,
+    profile_csv: Optional[str] = None,
+    record: Optional[str] = None,
+    seed: Optional[int] = None,
+    width: int = GRID_WIDTH,
+    height: int = GRID_HEIGHT,
+    autopilot: bool = False,
+    scores: Optional[str] = None,
+    capture: Optional[str] = None,
+    level: Optional[str] = None
+) -> None:
+    """Запускает игру "Змейка".
+
+    Клавиатура опрашивается и экран обновляется с частотой FPS, а игра
+    продвигается с фиксированным шагом, равным 1 / snake.speed секунды.
+    Прогресс до следующего тика хранится в долях тика, поэтому изменение
+    скорости сразу меняет темп игры и не вызывает рывков.
+
+    Параметры:
+        profile: Включает профилировщик кадров с оверлеем. По умолчанию
+            включается переменной окружения SNAKE_PROFILE.
+        profile_csv: Файл, в который при выходе сохраняются замеры кадров.
+            По умолчанию берётся из переменной окружения SNAKE_PROFILE_CSV.
+        record: Файл, в который при выходе сохраняется запись игры.
+        seed: Сид генератора случайных чисел игры. По умолчанию
+            выбирается случайно.
+        width: Ширина игрового поля в ячейках.
+        height: Высота игрового поля в ячейках.
+        autopilot: Передаёт управление змейкой автопилоту. Клавиши
+            скорости и выхода продолжают работать.
+        scores: Файл базы рекордов, в которую при выходе записывается
+            рекорд игры. По умолчанию берётся из переменной окружения
+            SNAKE_SCORES.
+        capture: Файл, в который записываются кадры игры для видео.
+        level: Файл уровня со стенами. Размер поля берётся из уровня.
+    """
+    global camera, level_walls
+    seed = seed if seed is not None else getrandbits(engine.SEED_BITS)
+    rng = engine.GameRandom(seed)
+    walls = None
+    if level:
+        loaded_level = load_level(level)
+        width, height = loaded_level.width, loaded_level.height
+        walls = loaded_level.walls
+    snake = Snake(
+        free_cells=FreeCells.for_board(width, height, walls), rng=rng
+    )
+    apple = Apple(free_cells=snake.free_cells, rng=rng)
+    wrong_product = WrongProduct(free_cells=snake.free_cells, rng=rng)
+    game = GameState(snake, apple, wrong_product, seed)
+    recorder = None
+    if record:
+        from snake_replay import ReplayRecorder
+        recorder = ReplayRecorder(seed, width, height)
+    get_screen()
+    pg.event.set_blocked(None)
+    pg.event.set_allowed(ALLOWED_EVENTS)
+    pg.display.set_caption(TITLE)
+    hud.update(snake)
+    level_walls = walls
+    camera = Camera(width, height)
+    camera.follow(snake.get_head_position())
+    redraw_board(snake, apple, wrong_product)
+    profile_csv = profile_csv or os.environ.get('SNAKE_PROFILE_CSV')
+    if profile is None:
+        profile = bool(os.environ.get('SNAKE_PROFILE'))
+    profiler = overlay = None
+    if profile or profile_csv:
+        from snake_profiler import FrameProfiler
+        profiler = FrameProfiler(PROFILE_PHASES)
+        overlay = ProfilerOverlay(profiler)
+    scores = scores or os.environ.get('SNAKE_SCORES')
+    score_writer = pilot = frame_capture = None
+    if scores:
+        from snake_scores import ScoreWriter
+        score_writer = ScoreWriter(scores)
+    if autopilot:
+        from snake_autopilot import Autopilot
+        pilot = Autopilot()
+    if capture:
+        from snake_capture import FrameCapture
+        frame_capture = FrameCapture(capture, get_screen())
+    try:
+        run_game_loop(
+            game, profiler, overlay, recorder, pilot, frame_capture
+        )
+    finally:
+        if frame_capture:
+            frame_capture.close()
+        if score_writer:
+            submit_record(score_writer, snake, pilot is not None)
+        if profiler:
+            print(activity.report())
+        if profiler and profile_csv:
+            profiler.dump_csv(profile_csv)
+        if recorder:
+            recorder.finish(game)
+            recorder.save(record)
+
+
+def submit_record(
+    score_writer: 'ScoreWriter',
+    snake: engine.Snake,
+    autopilot: bool
+) -> None:
+    """Записывает рекорд игры в базу рекордов и закрывает запись.
+
+    Рекорд - максимальная длина змейки за игру и скорость, на которой она
+    достигнута.
+
+    Параметры:
+        score_writer: Фоновая запись рекордов.
+        snake: Змейка игры.
+        autopilot: Признак игры автопилота.
+    """
+    score_writer.submit(
+        snake.max_length, snake.max_length_speed,
+        AUTOPILOT_NAME if autopilot else PLAYER_NAME
     )
-    screen.fill(BOARD_BACKGROUND_COLOR)
-    pg.display.flip()
-    apple.draw()
-    wrong_product.draw()
+    score_writer.close()
+
+
+def step_game(
+    game: GameState,
+    recorder: Optional['ReplayRecorder'] = None,
+    pilot: Optional['Autopilot'] = None
+) -> list[str]:
+    """Продвигает игру на один тик с очередным поворотом из очереди.
+
+    Параметры:
+        game: Состояние игры.
+        recorder: Запись игры или None, если игра не записывается.
+        pilot: Автопилот, выбирающий поворот вместо очереди нажатых
+            клавиш, или None.
+
+    Возвращает список произошедших за тик событий.
+    """
+    action = pilot(game) if pilot else game.snake.next_turn()
+    if recorder:
+        recorder.record(game, action)
+    events, _ = game.step(action)
+    return events
+
+
+def run_game_loop(
+    game: GameState,
+    profiler: Optional['FrameProfiler'] = None,
+    overlay: Optional[ProfilerOverlay] = None,
+    recorder: Optional['ReplayRecorder'] = None,
+    pilot: Optional['Autopilot'] = None,
+    frame_capture: Optional['FrameCapture'] = None
+) -> None:
+    """Выполняет игровой цикл.
+
+    Параметры:
+        game: Состояние игры с отрисовываемыми объектами.
+        profiler: Профилировщик кадров или None, если замеры не нужны.
+        overlay: Оверлей профилировщика или None.
+        recorder: Запись игры или None, если игра не записывается.
+        pilot: Автопилот или None, если змейкой управляет игрок.
+        frame_capture: Запись кадров или None, если кадры не записываются.
+    """
+    snake, apple, wrong_product = game.snake, game.apple, game.wrong_product
+    clock = get_clock()
+    step_progress = 0.0
     while True:
-        clock.tick(snake.speed)
-        if update_title_information:
-            pg.display.set_caption(TITLE.format(
-                max_length=snake.max_length,
-                max_length_speed=snake.max_length_speed,
-                speed=snake.speed
-            ))
-            update_title_information = False
+        wait_until_active(snake, profiler)
+        frame_time = clock.tick(FPS)
+        if profiler:
+            profiler.mark('wait')
         handle_keys(snake)
-        if snake.get_head_position() == apple.position:
-            snake.increase_length()
-            apple.randomize_position(
-                [*snake.positions, wrong_product.position]
-            )
-            apple.draw()
-        elif snake.get_head_position() == wrong_product.position:
-            snake.reset_situation = True
-            wrong_product.randomize_position(
-                [*snake.positions, apple.position]
-            )
-        if snake.reset_situation:
-            snake.reset()
-            screen.fill(BOARD_BACKGROUND_COLOR)
-            apple.draw()
-            wrong_product.draw()
-            snake.reset_situation = False
-        snake.move()
-        snake.draw()
-        pg.display.update()
+        if profiler:
+            profiler.mark('handle_keys')
+        step_progress = min(
+            step_progress + frame_time * snake.speed / 1000,
+            MAX_CATCH_UP_STEPS
+        )
+        while step_progress >= 1:
+            step_progress -= 1
+            events = step_game(game, recorder, pilot)
+            if profiler:
+                profiler.mark('step')
+            draw_events(events, snake, apple, wrong_product)
+            if profiler:
+                profiler.mark('draw')
+        hud.draw()
+        if overlay:
+            overlay.draw()
+        pg.display.update(dirty_rects)
+        if frame_capture:
+            frame_capture.capture(get_screen(), dirty_rects)
+        dirty_rects.clear()
+        if profiler:
+            profiler.mark('display_update')
+            profiler.end_frame()
+
+
+def tournament(argv: Optional[list[str]] = None) -> None:
+    """Запускает турнир ботов без графики и выводит таблицу статистики.
+
+    Параметры:
+        argv: Аргументы командной строки без имени подкоманды.
+    """
+    import snake_tournament
+    parser = argparse.ArgumentParser(
+        prog='the_snake.py tournament',
+        description='Турнир ботов для игры "Змейка".'
+    )
+    parser.add_argument(
+        'policies', nargs='+',
+        help='политики в виде "модуль:функция", например '
+        'snake_tournament:greedy_policy'
+    )
+    parser.add_argument(
+        '--games', type=int, default=1000,
+        help='количество игр для каждой политики'
+    )
+    parser.add_argument('--seed', type=int, default=0, help='сид первой игры')
+    parser.add_argument(
+        '--max-ticks', type=int, default=snake_tournament.DEFAULT_MAX_TICKS,
+        help='ограничение количества тиков в одной игре'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help='количество процессов (по умолчанию - количество ядер)'
+    )
+    parser.add_argument('--scores', help='записать итоги игр в базу рекордов')
+    args = parser.parse_args(argv)
+    results = snake_tournament.run_tournament(
+        args.policies,
+        games=args.games,
+        seed=args.seed,
+        max_ticks=args.max_ticks,
+        workers=args.workers
+    )
+    print(snake_tournament.format_table(results))
+    if args.scores:
+        from snake_scores import insert_scores, open_scores
+        connection = open_scores(args.scores)
+        try:
+            insert_scores(connection, (
+                (max_length, engine.Snake.MIN_SNAKE_SPEED, policy_path)
+                for policy_path, summaries in results.items()
+                for max_length in summaries[::snake_tournament.SUMMARY_SIZE]
+            ))
+        finally:
+            connection.close()
+
+
+def receive_arena(
+    connection: socket.socket,
+    reader: 'MessageReader',
+    view: ArenaView
+) -> bool:
+    """Принимает сообщения сервера арены и отрисовывает изменения.
+
+    Параметры:
+        connection: Неблокирующее соединение с сервером.
+        reader: Сборщик сообщений сервера.
+        view: Отрисовка арены.
+
+    Возвращает False, если сервер закрыл соединение.
+    """
+    global camera
+    from snake_protocol import SNAPSHOT
+    try:
+        data = connection.recv(ARENA_RECEIVE_SIZE)
+    except BlockingIOError:
+        return True
+    if not data:
+        return False
+    board = view.board
+    for message in reader.feed(data):
+        snapshot = message[0] == SNAPSHOT
+        changes = board.apply(message)
+        if snapshot:
+            camera = Camera(board.width, board.height)
+        if board.head is not None and camera.follow(board.head) or snapshot:
+            redraw_board(view)
+        else:
+            view.draw_changes(changes)
+    return True
+
+
+def connect(argv: Optional[list[str]] = None) -> None:
+    """Подключается к серверу арены и отрисовывает игру.
+
+    Параметры:
+        argv: Аргументы командной строки без имени подкоманды.
+    """
+    from snake_protocol import (
+        DEFAULT_HOST, DEFAULT_PORT, ArenaBoard, MessageReader
+    )
+    parser = argparse.ArgumentParser(
+        prog='the_snake.py connect',
+        description='Клиент арены игры "Змейка".'
+    )
+    parser.add_argument('host', nargs='?', default=DEFAULT_HOST)
+    parser.add_argument('port', nargs='?', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    connection = socket.create_connection((args.host, args.port))
+    connection.setblocking(False)
+    get_screen()
+    pg.event.set_blocked(None)
+    pg.event.set_allowed(ALLOWED_EVENTS)
+    pg.display.set_caption('Змейка. Арена (Выход: ESC)')
+    reader = MessageReader()
+    view = ArenaView(ArenaBoard())
+    clock = get_clock()
+    with connection:
+        while receive_arena(connection, reader, view):
+            clock.tick(FPS)
+            codes = handle_arena_keys()
+            if codes:
+                connection.sendall(codes)
+            pg.display.update(dirty_rects)
+            dirty_rects.clear()
+
+
+def parse_game_arguments(argv: Optional[list[str]] = None) -> dict:
+    """Разбирает аргументы командной строки игры.
+
+    Параметры:
+        argv: Аргументы командной строки.
+
+    Возвращает именованные аргументы для функции main.
+    """
+    parser = argparse.ArgumentParser(
+        prog='the_snake.py',
+        description='Игра "Змейка". Подкоманда tournament запускает турнир '
+        'ботов, подкоманда connect подключается к серверу арены.'
+    )
+    parser.add_argument(
+        '--profile', action='store_true', default=None,
+        help='показывать оверлей с замерами фаз кадра'
+    )
+    parser.add_argument(
+        '--profile-csv', help='сохранить замеры кадров в CSV-файл при выходе'
+    )
+    parser.add_argument('--record', help='сохранить запись игры при выходе')
+    parser.add_argument('--seed', type=int, help='сид игры')
+    parser.add_argument(
+        '--width', type=int, default=GRID_WIDTH,
+        help='ширина игрового поля в ячейках'
+    )
+    parser.add_argument(
+        '--height', type=int, default=GRID_HEIGHT,
+        help='высота игрового поля в ячейках'
+    )
+    parser.add_argument(
+        '--autopilot', action='store_true',
+        help='передать управление змейкой автопилоту'
+    )
+    parser.add_argument(
+        '--scores', help='записывать результаты в базу рекордов'
+    )
+    parser.add_argument('--capture', help='записывать кадры игры в файл')
+    parser.add_argument(
+        '--level', help='файл уровня со стенами: текст или картинка PNG'
+    )
+    args = parser.parse_args(argv)
+    if args.level and args.record:
+        parser.error('запись игры не сохраняет уровень: --record и --level '
+                     'нельзя использовать вместе')
+    return vars(args)
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ['tournament']:
+        tournament(sys.argv[2:])
+    elif sys.argv[1:2] == ['connect']:
+        connect(sys.argv[2:])
+    else:
+        main(**parse_game_arguments(sys.argv[1:]))